@@ -0,0 +1,275 @@
+"""
+견적 HTTP API (Quote API)
+
+Streamlit 화면(app.py)과 같은 견적 로직을 주문 시스템 등에서 호출할 수 있도록 JSON API로 제공합니다.
+  - POST /quote          견적 1건 (calculate_quote, 이벤트 루프에서 바로 계산)
+  - POST /quotes/batch   견적 여러 건 (항목별 검증 후 calculate_quotes로 한 번에 계산, 항목별 오류 반환)
+  - POST /analyze        multipart 파일 업로드(여러 개 가능) → analyze_files (추출은 프로세스 풀, GPT는 비동기)
+  - POST /parse-email    이메일 파싱 (parse_email, 스레드 풀)
+  - POST /quote/pdf      견적 PDF (generate_quote_pdf, 프로세스 풀)
+  - GET  /health
+  - GET  /metrics        단계별 지연/호출 수 (Prometheus text, ?format=json이면 JSON). METRICS_ENABLED=1일 때만 값이 쌓임
+
+입력 오류는 400 {"error": "..."}. 할증 검증은 calculate_quote와 같은 validate_surcharges를 사용합니다.
+
+실행:
+    uvicorn api:app --host 0.0.0.0 --port 8000 --workers 4
+부하 측정:
+    python benchmarks/load_api.py
+"""
+
+import asyncio
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from datetime import date
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+from starlette.routing import Route
+
+from modules import metrics
+from modules.quote_calculator import calculate_quote, calculate_quotes, get_pricing, validate_surcharges
+from modules.quote_number import next_quote_number
+
+MAX_BATCH_SIZE = int(os.environ.get("API_MAX_BATCH_SIZE", "10000"))
+MAX_UPLOAD_BYTES = int(os.environ.get("API_MAX_UPLOAD_BYTES", str(50 * 1024 * 1024)))
+# PDF 렌더링 프로세스 수. 0이면 스레드 풀에서 렌더링 (GIL 때문에 동시 렌더링은 직렬화됨)
+PDF_WORKERS = int(os.environ.get("API_PDF_WORKERS", str(os.cpu_count() or 1)))
+
+_pdf_pool: ProcessPoolExecutor | None = None
+
+
+# ── 입력 검증 ──
+
+async def _json_body(request: Request) -> dict:
+    try:
+        body = await request.json()
+    except ValueError:
+        raise ValueError("Request body must be valid JSON") from None
+    if not isinstance(body, dict):
+        raise ValueError("Request body must be a JSON object")
+    return body
+
+
+def _field(data: dict, name: str, kind: type | tuple[type, ...], default=None, required: bool = True):
+    value = data.get(name, default)
+    if value is None and not required:
+        return None
+    if value is None:
+        raise ValueError(f"Missing field: {name}")
+    if isinstance(value, bool) or not isinstance(value, kind):
+        raise ValueError(f"Invalid {name}: {value!r}")
+    return value
+
+
+def _quote_args(data: dict) -> dict:
+    """calculate_quote 인자. 언어쌍/분야/단위 검증은 calculate_quote가 한다."""
+    if not isinstance(data, dict):
+        raise ValueError("Quote must be a JSON object")
+    volume = _field(data, "volume", (int, float))
+    if not math.isfinite(volume) or volume <= 0:
+        raise ValueError(f"Invalid volume: {volume!r}")
+    surcharge_keys = _field(data, "surcharge_keys", list, default=[])
+    if not all(isinstance(key, str) for key in surcharge_keys):
+        raise ValueError(f"Invalid surcharge_keys: {surcharge_keys!r}")
+    return {
+        "language_pair": _field(data, "language_pair", str),
+        "domain": _field(data, "domain", str),
+        "volume": volume,
+        "volume_unit": _field(data, "volume_unit", str, default="chars"),
+        "surcharge_keys": validate_surcharges(surcharge_keys, get_pricing()),
+    }
+
+
+def _deadline(data: dict) -> date:
+    value = _field(data, "deadline", str)
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid deadline: {value!r} (use YYYY-MM-DD)") from None
+
+
+# ── 엔드포인트 ──
+
+async def health(request: Request) -> JSONResponse:
+    return JSONResponse({"status": "ok"})
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    if request.query_params.get("format") == "json":
+        return JSONResponse(metrics.snapshot())
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+async def quote(request: Request) -> JSONResponse:
+    # 견적 1건 계산은 수 µs → 스레드 풀로 넘기는 비용이 더 크다
+    result = calculate_quote(**_quote_args(await _json_body(request)))
+    return JSONResponse(asdict(result))
+
+
+async def quotes_batch(request: Request) -> JSONResponse:
+    items = (await _json_body(request)).get("quotes")
+    if not isinstance(items, list) or not items:
+        raise ValueError("quotes must be a non-empty list")
+    if len(items) > MAX_BATCH_SIZE:
+        raise ValueError(f"Too many quotes: {len(items)} (max {MAX_BATCH_SIZE})")
+
+    pricing = get_pricing()
+    valid, args, results = [], [], [None] * len(items)
+    for i, item in enumerate(items):
+        try:
+            kwargs = _quote_args(item)
+            if (kwargs["language_pair"], kwargs["domain"]) not in pricing.unit_prices:
+                # 언어쌍/분야 오류 메시지는 calculate_quote와 동일하게
+                calculate_quote(**kwargs)
+            if kwargs["volume_unit"] not in pricing.volume_conversion:
+                raise ValueError(
+                    f"Unknown volume unit: {kwargs['volume_unit']}. Use: {list(pricing.volume_conversion)}"
+                )
+        except ValueError as e:
+            results[i] = {"error": str(e)}
+            continue
+        valid.append(i)
+        args.append(kwargs)
+
+    if args:
+        batch = calculate_quotes(
+            [a["language_pair"] for a in args],
+            [a["domain"] for a in args],
+            [a["volume"] for a in args],
+            [a["volume_unit"] for a in args],
+            [pricing.surcharge_mask(a["surcharge_keys"]) for a in args],
+        )
+        for i, kwargs, result in zip(valid, args, batch):
+            # 비트마스크에는 순서가 없다 → /quote처럼 요청한 순서로 나열
+            keys = kwargs["surcharge_keys"]
+            results[i] = asdict(result)
+            results[i]["surcharges"].sort(key=lambda s: keys.index(s["key"]))
+    return JSONResponse({"count": len(items), "errors": len(items) - len(valid), "quotes": results})
+
+
+async def analyze(request: Request) -> JSONResponse:
+    from modules.file_analyzer import analyze_files
+
+    form = await request.form()
+    uploads = [f for f in form.getlist("file") if not isinstance(f, str)]
+    if not uploads:
+        raise ValueError("Upload one or more files in the 'file' field")
+    files = []
+    for upload in uploads:
+        data = await upload.read()
+        if len(data) > MAX_UPLOAD_BYTES:
+            raise ValueError(f"File too large: {upload.filename}")
+        files.append((upload.filename or "upload", data))
+    await form.close()
+
+    # 같은 파일명이 여러 번 올라올 수 있으므로 입력 순서(index)로 맞춘다
+    results, summary = [None] * len(files), None
+    async for event in analyze_files(files):
+        if event["type"] == "file":
+            results[event["index"]] = event["result"]
+        else:
+            summary = event["summary"]
+    return JSONResponse({
+        "files": [{"filename": name, "result": result} for (name, _), result in zip(files, results)],
+        "summary": summary,
+    })
+
+
+async def parse_email_endpoint(request: Request) -> JSONResponse:
+    from modules.email_parser import parse_email
+
+    data = await _json_body(request)
+    parsed = await run_in_threadpool(
+        parse_email,
+        _field(data, "sender", str, default=""),
+        _field(data, "subject", str, default=""),
+        _field(data, "body", str),
+    )
+    return JSONResponse(parsed)
+
+
+def _init_pdf_worker() -> None:
+    from templates.quote_template import warm_up
+
+    get_pricing()
+    warm_up()
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    global _pdf_pool
+    if _pdf_pool is None:
+        _pdf_pool = ProcessPoolExecutor(
+            max_workers=PDF_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_pdf_worker,
+        )
+    return _pdf_pool
+
+
+def render_pdf(quote_args: dict, client: dict) -> bytes:
+    from modules.pdf_generator import generate_quote_pdf
+
+    return generate_quote_pdf(calculate_quote(**quote_args), **client)
+
+
+async def quote_pdf(request: Request) -> Response:
+    data = await _json_body(request)
+    quote_args = _quote_args(data)
+    client = {
+        "client_name": _field(data, "client_name", str),
+        "client_email": _field(data, "client_email", str, default=""),
+        "deadline": _deadline(data),
+        "notes": _field(data, "notes", str, default=""),
+        # 번호는 이 프로세스에서 발급해 응답 헤더로도 돌려준다
+        "quote_number": _field(data, "quote_number", str, required=False) or next_quote_number(),
+    }
+    calculate_quote(**quote_args)  # 잘못된 언어쌍/분야는 워커로 보내기 전에 400
+
+    if PDF_WORKERS > 0:
+        pdf = await asyncio.get_running_loop().run_in_executor(_get_pdf_pool(), render_pdf, quote_args, client)
+    else:
+        pdf = await run_in_threadpool(render_pdf, quote_args, client)
+    return Response(
+        pdf,
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": f'attachment; filename="{client["quote_number"]}.pdf"',
+            "X-Quote-Number": client["quote_number"],
+        },
+    )
+
+
+async def bad_request(request: Request, exc: ValueError) -> JSONResponse:
+    return JSONResponse({"error": str(exc)}, status_code=400)
+
+
+@asynccontextmanager
+async def lifespan(app: Starlette):
+    global _pdf_pool
+    metrics.start_dump()  # METRICS_DUMP_PATH가 있을 때만
+    yield
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown(cancel_futures=True)
+        _pdf_pool = None
+
+
+app = Starlette(
+    routes=[
+        Route("/health", health, methods=["GET"]),
+        Route("/metrics", metrics_endpoint, methods=["GET"]),
+        Route("/quote", quote, methods=["POST"]),
+        Route("/quotes/batch", quotes_batch, methods=["POST"]),
+        Route("/analyze", analyze, methods=["POST"]),
+        Route("/parse-email", parse_email_endpoint, methods=["POST"]),
+        Route("/quote/pdf", quote_pdf, methods=["POST"]),
+    ],
+    exception_handlers={ValueError: bad_request},
+    lifespan=lifespan,
+)
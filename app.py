@@ -1,21 +1,20 @@
-import streamlit as st
+import uuid
 from datetime import date, timedelta
-from modules.quote_calculator import calculate_quote, load_pricing
-from modules.pdf_generator import generate_quote_pdf
 
-pricing = load_pricing()
+import streamlit as st
 
-LANG_PAIRS = pricing["language_pairs"]
-DOMAINS = pricing["domains"]
-SURCHARGES = pricing["surcharges"]
-VOLUME_UNITS = {"chars": "글자 수", "words": "단어 수", "pages": "페이지 수"}
-LANG_PAIR_KEYS = list(LANG_PAIRS.keys())
-DOMAIN_KEYS = list(DOMAINS.keys())
+from modules import metrics, warmup
+from modules.jobs import DONE, FAILED, JobLimitError, get_job_manager
+from modules.quote_calculator import calculate_quote, get_pricing
+from modules.quote_number import next_quote_number
 
-st.set_page_config(page_title="번역 견적 시스템", page_icon="📝", layout="centered")
+# 백그라운드 작업 상태 폴링 주기(초)
+JOB_POLL_SECONDS = 1.0
+JOB_STATUS_LABELS = {"queued": "대기 중", "running": "분석 중…", "done": "완료", "failed": "실패", "cancelled": "취소됨"}
+
+VOLUME_UNITS = {"chars": "글자 수", "words": "단어 수", "pages": "페이지 수"}
 
-# ── Custom CSS ──
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     .main .block-container { max-width: 720px; padding-top: 2rem; }
     div[data-testid="stMetric"] {
@@ -26,7 +25,21 @@ st.markdown("""
         text-align: center; padding: 16px 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+st.set_page_config(page_title="번역 견적 시스템", page_icon="📝", layout="centered")
+
+# 화면 라벨/선택지: 단가표가 바뀔 때만 다시 만들어지는 PricingTable의 읽기 전용 매핑을 그대로 쓴다.
+# (st.cache_resource 함수는 rerun마다 데코레이터가 다시 적용되며 소스를 해시하므로 쓰지 않음)
+pricing = get_pricing()
+LANG_PAIRS = pricing.language_pair_labels
+DOMAINS = pricing.domain_labels
+SURCHARGES = pricing.raw["surcharges"]
+LANG_PAIR_KEYS = tuple(LANG_PAIRS)
+DOMAIN_KEYS = tuple(DOMAINS)
+
+# ── Custom CSS ── (Streamlit은 rerun마다 화면을 새로 그리므로 매번 내보내야 한다)
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 st.title("📝 번역 자동 견적 시스템")
 st.caption("번역 요건을 입력하면 즉시 견적을 확인할 수 있습니다.")
@@ -38,86 +51,185 @@ for key in ["prefill_volume", "prefill_unit", "prefill_domain", "prefill_lang",
             "prefill_email", "prefill_urgency", "prefill_dtp", "prefill_notes"]:
     if key not in st.session_state:
         st.session_state[key] = None
+if "job_owner" not in st.session_state:
+    st.session_state.job_owner = uuid.uuid4().hex  # 동시 작업 수 제한 단위 (세션)
+    st.session_state.job_ids = []       # 이 세션이 제출한 작업 (제출 순)
+    st.session_state.applied_jobs = set()
+
+
+# ── AI 분석 결과 → 폼 pre-fill ──
+def apply_file_summary(summary: dict) -> None:
+    """함께 올린 파일들의 요약(summarize_analyses)으로 채운다: 분량은 전체 합계, 분야/언어는 최다.
+
+    분석하지 못한 파일이 하나라도 있으면 합계가 실제보다 작으므로 채우지 않는다 (호출 측이 오류 표시).
+    """
+    if summary["failed"] or summary["total_volume"] is None:
+        return
+    st.session_state.prefill_volume = summary["total_volume"]["value"]
+    st.session_state.prefill_unit = summary["total_volume"]["unit"]
+    st.session_state.prefill_domain = summary["domain"] or "general"
+    st.session_state.prefill_lang = summary["language"] or "ko"
+
+
+def apply_parsed_email(parsed: dict, sender: str) -> None:
+    if parsed.get("client_name"):
+        st.session_state.prefill_name = parsed["client_name"]
+    if sender:
+        st.session_state.prefill_email = sender
+    if parsed.get("language_pair") and parsed["language_pair"] in LANG_PAIR_KEYS:
+        st.session_state.prefill_lang_pair = parsed["language_pair"]
+    if parsed.get("domain") and parsed["domain"] in DOMAIN_KEYS:
+        st.session_state.prefill_domain = parsed["domain"]
+    if parsed.get("volume"):
+        st.session_state.prefill_volume = parsed["volume"]["value"]
+        st.session_state.prefill_unit = parsed["volume"]["unit"]
+    if parsed.get("urgency") == "urgent":
+        st.session_state.prefill_urgency = "urgent"
+    elif parsed.get("urgency") == "semi_urgent":
+        st.session_state.prefill_urgency = "semi_urgent"
+    if parsed.get("dtp_required"):
+        st.session_state.prefill_dtp = True
+    if parsed.get("notes"):
+        st.session_state.prefill_notes = parsed["notes"]
+
+
+def submit_job(kind: str, label: str, fn, *args, meta: dict | None = None) -> bool:
+    try:
+        job_id = get_job_manager().submit(st.session_state.job_owner, kind, fn, *args, label=label, meta=meta)
+    except JobLimitError as e:
+        st.session_state.job_notice = f"{label}: {e}"
+        return False
+    st.session_state.job_ids.append(job_id)
+    return True
+
+
+# ── 사이드바: 보조 기능 (파일 분석 / 이메일 파싱) ──
+# fragment: 사이드바 위젯 조작은 사이드바만 다시 실행한다.
+# 분석은 백그라운드 작업으로 제출하고, 결과는 job_status_panel이 폴링해 폼에 반영한다.
+@st.fragment
+def ai_prefill_panel():
+    st.header("🤖 AI 자동 입력")
+
+    tab_file, tab_email = st.tabs(["📎 파일 분석", "📧 이메일 파싱"])
+
+    with tab_file:
+        st.caption("파일을 업로드하면 분량/분야를 AI가 자동 분석합니다.")
+        uploaded_files = st.file_uploader(
+            "원문 파일 업로드",
+            type=["txt", "docx", "pdf"],
+            accept_multiple_files=True,
+            key="file_upload",
+        )
+        if uploaded_files and st.button("🔍 파일 분석", key="btn_analyze"):
+            from modules.file_analyzer import analyze_batch
+
+            # 한 번에 올린 파일들은 작업 하나 (동시 작업 수 제한에 한 번만 셈). 제한에 걸리면 전체를 거절한다.
+            files = [(f.name, f.getvalue()) for f in uploaded_files]
+            label = files[0][0] if len(files) == 1 else f"{files[0][0]} 외 {len(files) - 1}개"
+            if submit_job("file", label, analyze_batch, files):
+                st.rerun()  # 전체 실행 → 작업 상태 폴링 시작
+            st.warning(st.session_state.pop("job_notice"))
+
+    with tab_email:
+        st.caption("고객 이메일을 붙여넣으면 자동으로 폼을 채워줍니다.")
+        email_sender = st.text_input("발신자", placeholder="lee@lawfirm.co.kr", key="email_sender")
+        email_subject = st.text_input("제목", placeholder="급한 번역 부탁드립니다", key="email_subject")
+        email_body = st.text_area("본문", height=150, key="email_body",
+                                  placeholder="이메일 본문을 붙여넣으세요...")
+        if email_body and st.button("🔍 이메일 파싱", key="btn_parse"):
+            from modules.email_parser import parse_email
+
+            submit_job("email", email_subject or email_sender or email_body[:20], parse_email,
+                       email_sender, email_subject, email_body, meta={"sender": email_sender})
+            st.rerun()
+
+
+def job_status_panel():
+    """제출한 작업 목록. 끝난 작업 결과를 폼에 반영하고, 실행 중인 작업이 없으면 폴링을 멈춘다."""
+    manager = get_job_manager()
+    notice = st.session_state.pop("job_notice", None)
+    if notice:
+        st.warning(notice)
+
+    applied = False
+    finished = []
+    for job_id in list(st.session_state.job_ids):
+        job = manager.get(job_id)
+        if job is None:  # 보관 기간(JOB_TTL)이 지나 정리됨
+            st.session_state.job_ids.remove(job_id)
+            continue
+
+        icon = "📎" if job.kind == "file" else "📧"
+        col1, col2 = st.columns([4, 1])
+        with col1:
+            st.markdown(f"{icon} **{job.label}** · {JOB_STATUS_LABELS[job.status]}")
+        if job.active:
+            with col2:
+                st.button("취소", key=f"cancel_{job_id}", on_click=manager.cancel, args=(job_id,))
+            continue
+        finished.append(job_id)
+        if job.status == FAILED:
+            st.error(job.error)
+            continue
+        if job.status != DONE:
+            continue
+
+        result = job.result
+        if job.kind == "file" and result["summary"]["failed"]:
+            errors = [f'{item["filename"]}: {item["result"]["error"]}'
+                      for item in result["files"] if item["result"].get("error")]
+            st.error("분석하지 못한 파일이 있어 분량을 채우지 않았습니다. " + ", ".join(errors))
+        elif job.kind == "email" and result.get("error"):
+            st.error(f"파싱 실패: {result['error']}")
+        elif job_id not in st.session_state.applied_jobs:
+            if job.kind == "file":
+                apply_file_summary(result["summary"])
+            else:
+                apply_parsed_email(result, job.meta.get("sender", ""))
+            st.session_state.applied_jobs.add(job_id)
+            applied = True
+        with st.expander("결과 보기"):
+            st.json(result)
+
+    if finished:
+        st.button("완료 항목 지우기", key="btn_clear_jobs", on_click=clear_finished_jobs, args=(finished,))
+
+    # 결과가 들어왔거나 모두 끝났으면 전체 실행: 폼에 반영하고 폴링(run_every)을 끈다
+    if applied or (st.session_state.get("job_polling") and not has_active_jobs()):
+        st.rerun()
+
+
+def clear_finished_jobs(job_ids: list[str]) -> None:
+    for job_id in job_ids:
+        get_job_manager().forget(job_id)
+        st.session_state.job_ids.remove(job_id)
+        st.session_state.applied_jobs.discard(job_id)
+
+
+def has_active_jobs() -> bool:
+    manager = get_job_manager()
+    return any((job := manager.get(job_id)) is not None and job.active for job_id in st.session_state.job_ids)
+
+
+# 작업 상태 패널: 실행 중인 작업이 있으면 JOB_POLL_SECONDS마다 패널만 다시 실행, 없으면 폴링하지 않음
+polling_job_status_panel = st.fragment(run_every=JOB_POLL_SECONDS)(job_status_panel)
+static_job_status_panel = st.fragment(job_status_panel)
+
 
 # ============================
 # Step 1: 정보 입력
 # ============================
 if st.session_state.step == 1:
 
-    # ── 사이드바: 보조 기능 (파일 분석 / 이메일 파싱) ──
     with st.sidebar:
-        st.header("🤖 AI 자동 입력")
-
-        tab_file, tab_email = st.tabs(["📎 파일 분석", "📧 이메일 파싱"])
-
-        with tab_file:
-            st.caption("파일을 업로드하면 분량/분야를 AI가 자동 분석합니다.")
-            uploaded_file = st.file_uploader(
-                "원문 파일 업로드",
-                type=["txt", "docx", "pdf"],
-                key="file_upload",
-            )
-            if uploaded_file and st.button("🔍 파일 분석", key="btn_analyze"):
-                with st.spinner("GPT-4o-mini로 분석 중..."):
-                    from modules.file_analyzer import analyze_file
-                    result = analyze_file(uploaded_file.getvalue(), uploaded_file.name)
-
-                if result.get("error"):
-                    st.error(result["error"])
-                else:
-                    vol = result["volume"]
-                    dom = result["domain_analysis"]
-                    st.session_state.prefill_volume = vol["value"]
-                    st.session_state.prefill_unit = vol["unit"]
-                    st.session_state.prefill_domain = dom.get("domain", "general")
-                    st.session_state.prefill_lang = result.get("detected_lang", "ko")
-
-                    st.success("분석 완료!")
-                    st.json({
-                        "분량": f'{vol["value"]:,} {vol["unit"]}',
-                        "분야": dom.get("domain"),
-                        "신뢰도": dom.get("confidence"),
-                        "판단근거": dom.get("reasoning"),
-                    })
-                    st.rerun()
-
-        with tab_email:
-            st.caption("고객 이메일을 붙여넣으면 자동으로 폼을 채워줍니다.")
-            email_sender = st.text_input("발신자", placeholder="lee@lawfirm.co.kr", key="email_sender")
-            email_subject = st.text_input("제목", placeholder="급한 번역 부탁드립니다", key="email_subject")
-            email_body = st.text_area("본문", height=150, key="email_body",
-                                      placeholder="이메일 본문을 붙여넣으세요...")
-            if email_body and st.button("🔍 이메일 파싱", key="btn_parse"):
-                with st.spinner("GPT-4o-mini로 파싱 중..."):
-                    from modules.email_parser import parse_email
-                    parsed = parse_email(email_sender, email_subject, email_body)
-
-                if parsed.get("error"):
-                    st.error(f"파싱 실패: {parsed['error']}")
-                else:
-                    if parsed.get("client_name"):
-                        st.session_state.prefill_name = parsed["client_name"]
-                    if email_sender:
-                        st.session_state.prefill_email = email_sender
-                    if parsed.get("language_pair") and parsed["language_pair"] in LANG_PAIR_KEYS:
-                        st.session_state.prefill_lang_pair = parsed["language_pair"]
-                    if parsed.get("domain") and parsed["domain"] in DOMAIN_KEYS:
-                        st.session_state.prefill_domain = parsed["domain"]
-                    if parsed.get("volume"):
-                        st.session_state.prefill_volume = parsed["volume"]["value"]
-                        st.session_state.prefill_unit = parsed["volume"]["unit"]
-                    if parsed.get("urgency") == "urgent":
-                        st.session_state.prefill_urgency = "urgent"
-                    elif parsed.get("urgency") == "semi_urgent":
-                        st.session_state.prefill_urgency = "semi_urgent"
-                    if parsed.get("dtp_required"):
-                        st.session_state.prefill_dtp = True
-                    if parsed.get("notes"):
-                        st.session_state.prefill_notes = parsed["notes"]
-
-                    st.success("파싱 완료! 폼에 자동 입력되었습니다.")
-                    st.json(parsed)
-                    st.rerun()
+        ai_prefill_panel()
+        if st.session_state.job_ids:
+            st.divider()
+            st.session_state.job_polling = has_active_jobs()
+            if st.session_state.job_polling:
+                polling_job_status_panel()
+            else:
+                static_job_status_panel()
 
     # ── 메인: 고객 정보 ──
     st.subheader("👤 고객 정보")
@@ -175,7 +287,7 @@ if st.session_state.step == 1:
 
     # Pre-fill: 분량/단위
     default_volume = st.session_state.prefill_volume or 1000
-    volume_unit_keys = list(VOLUME_UNITS.keys())
+    volume_unit_keys = tuple(VOLUME_UNITS)
     default_unit_idx = 0
     if st.session_state.prefill_unit and st.session_state.prefill_unit in volume_unit_keys:
         default_unit_idx = volume_unit_keys.index(st.session_state.prefill_unit)
@@ -257,8 +369,9 @@ if st.session_state.step == 1:
             st.session_state.client_email = client_email
             st.session_state.deadline = deadline
             st.session_state.notes = notes
+            st.session_state.quote_number = next_quote_number()
 
-            # Google Sheets 자동 기록 (백그라운드)
+            # Google Sheets 자동 기록 (로컬 아웃박스에 저장 → 백그라운드 전송)
             try:
                 from modules.sheets_connector import save_quote_to_sheets
                 save_quote_to_sheets(
@@ -267,6 +380,7 @@ if st.session_state.step == 1:
                     client_email=client_email,
                     deadline=deadline,
                     notes=notes,
+                    quote_number=st.session_state.quote_number,
                 )
             except Exception:
                 pass  # Sheets 실패해도 견적 플로우는 계속 진행
@@ -279,8 +393,11 @@ if st.session_state.step == 1:
 # Step 2: 견적 결과
 # ============================
 elif st.session_state.step == 2:
+    # PDF 모듈(reportlab)은 결과 화면에서만 필요 → 첫 화면 import 경로에서 제외 (modules/warmup이 미리 로드)
+    from modules.pdf_generator import get_quote_pdf, quote_pdf_key
+
     result = st.session_state.result
-    quote_number = f"Q-{date.today().strftime('%Y%m%d')}-001"
+    quote_number = st.session_state.quote_number
 
     # 헤더
     st.markdown(f"**견적서 번호:** `{quote_number}`")
@@ -339,7 +456,8 @@ elif st.session_state.step == 2:
     # 하단 버튼
     col1, col2 = st.columns(2)
     with col1:
-        pdf_bytes = generate_quote_pdf(
+        # rerun마다 PDF를 다시 만들지 않는다: 세션에 (키, 바이트) 보관, 없으면 프로세스 LRU 캐시 조회
+        pdf_args = dict(
             result=result,
             client_name=st.session_state.client_name,
             client_email=st.session_state.client_email,
@@ -347,6 +465,12 @@ elif st.session_state.step == 2:
             notes=st.session_state.notes,
             quote_number=quote_number,
         )
+        cached_pdf = st.session_state.get("quote_pdf")
+        if cached_pdf is not None and cached_pdf[0] == quote_pdf_key(**pdf_args):
+            pdf_bytes = cached_pdf[1]
+        else:
+            pdf_key, pdf_bytes = get_quote_pdf(**pdf_args)
+            st.session_state.quote_pdf = (pdf_key, pdf_bytes)
         st.download_button(
             "📄 PDF 견적서 다운로드",
             data=pdf_bytes,
@@ -358,3 +482,7 @@ elif st.session_state.step == 2:
         if st.button("🔄 새 견적 작성", use_container_width=True):
             st.session_state.step = 1
             st.rerun()
+
+# 화면을 다 보낸 뒤 시작해야 첫 화면 렌더링과 CPU를 다투지 않는다 (프로세스당 한 번, 이후 rerun은 플래그 확인만)
+warmup.start()
+metrics.start_dump()  # Streamlit 서버에는 /metrics가 없으므로 METRICS_DUMP_PATH 파일로 주기 기록
@@ -0,0 +1,132 @@
+"""
+Streamlit 화면 지연 측정 (App Latency)
+
+streamlit.testing의 AppTest로 app.py를 새 프로세스에서 실행해 다음을 측정합니다.
+  - cold_run_ms: 첫 화면 렌더링 (모듈 import 포함)
+  - rerun_ms: 위젯 조작 없는 rerun의 중앙값/p95 (--think 대기 후, 정상 상태의 rerun 비용)
+  - first_parse_ms: 첫 "이메일 파싱" 클릭 (규칙 경로로 해석되는 메일 → GPT 호출 없음, import 비용이 드러남)
+  - first_quote_ms / first_pdf_ms: 첫 "견적 산출하기" 클릭과 결과 화면(PDF 생성 포함)
+
+--think 초만큼 첫 화면 뒤에 기다렸다가 조작한다 (사용자가 입력하는 시간 동안 백그라운드 준비가 끝나는 효과 확인).
+--runs N이면 새 프로세스 측정을 N번 반복해 각 결과와 항목별 중앙값을 출력한다 (1 CPU에서는 rerun 값의 편차가 크다).
+AppTest는 실행마다 ScriptCache를 새로 만들어 app.py를 다시 컴파일하지만 서버는 바이트코드를 재사용하므로,
+서버와 같도록 ScriptCache 하나를 공유해서 잰다 (rerun_ms에 스크립트 길이에 비례하는 컴파일 비용이 섞이지 않게).
+
+사용법:
+    python benchmarks/app_latency.py
+    python benchmarks/app_latency.py --think 0 --reruns 50
+    python benchmarks/app_latency.py --runs 6 --reruns 60
+"""
+
+import argparse
+import json
+import statistics
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+EMAIL_BODY = "안녕하세요. 계약서 한영 번역 부탁드립니다. 분량은 약 5,000자이고 급하게 필요합니다."
+
+
+def measure(think: float, reruns: int) -> dict:
+    """현재 프로세스에서 측정한다 (새 프로세스에서 호출해야 cold 값이 의미 있음)."""
+    # streamlit run처럼 앱 디렉터리를 sys.path에 둔다 (AppTest는 스크립트 실행 중에만 추가 → 백그라운드 준비 스레드가 import 실패)
+    sys.path.insert(0, str(ROOT))
+    started = time.perf_counter()
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import AppTest, local_script_runner
+
+    script_cache = ScriptCache()
+    local_script_runner.ScriptCache = lambda: script_cache
+
+    at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=60)
+    at.run()
+    cold = time.perf_counter() - started
+    assert not at.exception, at.exception
+
+    time.sleep(think)
+    samples = []
+    for _ in range(reruns):
+        t = time.perf_counter()
+        at.run()
+        samples.append(time.perf_counter() - t)
+    samples.sort()
+
+    at.text_area(key="email_body").input(EMAIL_BODY).run()  # 본문이 있어야 파싱 버튼이 나타남
+    t = time.perf_counter()
+    at.button(key="btn_parse").click().run()
+    first_parse = time.perf_counter() - t
+    assert not at.exception, at.exception
+
+    at.text_input[0].input("홍길동")
+    at.text_input[1].input("a@b.c")
+    at.run()
+    t = time.perf_counter()
+    next(b for b in at.button if "견적 산출" in b.label).click().run()
+    first_quote = time.perf_counter() - t
+    assert not at.exception, at.exception
+
+    return {
+        "cold_run_ms": round(cold * 1000, 1),
+        "rerun_ms": {
+            "p50": round(statistics.median(samples) * 1000, 2),
+            "p95": round(samples[int(len(samples) * 0.95) - 1] * 1000, 2),
+        },
+        "first_parse_ms": round(first_parse * 1000, 1),
+        "first_quote_and_pdf_ms": round(first_quote * 1000, 1),
+        "think_seconds": think,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Streamlit 화면 지연 측정")
+    parser.add_argument("--think", type=float, default=2.0, help="첫 화면 후 조작까지 기다리는 시간(초)")
+    parser.add_argument("--reruns", type=int, default=30)
+    parser.add_argument("--runs", type=int, default=1, help="새 프로세스 측정 반복 횟수")
+    parser.add_argument("--inline", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.inline:
+        print(json.dumps(measure(args.think, args.reruns), ensure_ascii=False))
+        return
+    results = []
+    for _ in range(args.runs):
+        results.append(_measure_fresh(args.think, args.reruns))
+        print(json.dumps(results[-1], ensure_ascii=False))
+    if len(results) > 1:
+        print(json.dumps({"median": _median(results)}, ensure_ascii=False))
+
+
+def _measure_fresh(think: float, reruns: int) -> dict:
+    # 측정마다 새 인터프리터 (import 캐시가 없는 cold 상태). 견적번호/outbox는 임시 디렉터리에
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "QUOTE_NUMBER_DB": os.path.join(tmp, "quote_numbers.sqlite3"),
+            "SHEETS_OUTBOX_PATH": os.path.join(tmp, "sheets.sqlite3"),
+        }
+        out = subprocess.run(
+            [sys.executable, __file__, "--inline", "--think", str(think), "--reruns", str(reruns)],
+            cwd=ROOT, env=env, check=True, capture_output=True, text=True,
+        )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _median(results: list[dict]) -> dict:
+    """항목별 중앙값 (중첩된 rerun_ms도 항목별)."""
+    merged = {}
+    for key, value in results[0].items():
+        if isinstance(value, dict):
+            merged[key] = _median([r[key] for r in results])
+        else:
+            merged[key] = round(statistics.median(r[key] for r in results), 2)
+    return merged
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+벤치마크 입력 생성 (Benchmark Fixtures)
+
+고정 시드로 항상 같은 문서/이메일을 만들어 디렉터리에 저장합니다. 이미 있으면 다시 만들지 않습니다
+(FIXTURE_VERSION이 바뀌면 새로 만듦).
+  - 문서: txt / docx / pdf × 1, 50, 500쪽 × ko(한국어), en(영어), mixed(영문 용어가 섞인 한국어)
+    한 쪽 = 문단 PARAGRAPHS_PER_PAGE개. docx는 쪽마다 페이지 나누기, pdf는 실제 한 페이지
+    PDF는 ReportLab 내장 CID 폰트(HYSMyeongJo)를 써서 한글 폰트 파일이 없는 환경에서도 추출 가능
+  - 이메일: 규칙만으로 해석되는 정형 메일과 LLM이 필요한 자유 서술 메일(인용/서명 포함)을 섞은 JSONL
+
+사용법:
+    python benchmarks/fixtures.py                 # .cache/bench_fixtures 에 생성
+    python benchmarks/fixtures.py --dir /tmp/fx
+"""
+
+import argparse
+import io
+import json
+import random
+import textwrap
+import zipfile
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURE_DIR = ROOT / ".cache" / "bench_fixtures"
+FIXTURE_VERSION = "1"
+
+FORMATS = ("txt", "docx", "pdf")
+PAGE_COUNTS = (1, 50, 500)
+LANGS = ("ko", "en", "mixed")
+PARAGRAPHS_PER_PAGE = 6
+EMAIL_COUNT = 200
+
+PDF_FONT = "HYSMyeongJo-Medium"
+
+_KO_WORDS = (
+    "본", "계약은", "당사자", "간의", "권리와", "의무를", "정하며", "갑은", "을에게", "제품의", "공급", "조건",
+    "및", "대금", "지급", "방법을", "따른다", "상기", "조항에", "의거하여", "서면으로", "통지하여야", "한다",
+    "품질", "보증", "기간", "동안", "발생한", "하자에", "대하여", "무상으로", "수리", "또는", "교환한다",
+    "환자의", "임상", "시험", "결과", "투여", "용량", "부작용", "보고서", "장비의", "설치", "사용자",
+    "설명서", "안전", "주의", "사항", "재무제표", "감사", "의견", "연결", "매출", "영업이익", "전년",
+)
+_EN_WORDS = (
+    "the", "agreement", "shall", "be", "governed", "by", "laws", "of", "party", "and", "supplier", "will",
+    "deliver", "products", "within", "days", "after", "receipt", "written", "notice", "any", "dispute",
+    "arising", "from", "this", "contract", "patient", "clinical", "trial", "dose", "adverse", "event",
+    "report", "device", "installation", "user", "manual", "safety", "warning", "financial", "statements",
+    "audit", "opinion", "revenue", "operating", "income", "to", "in", "for", "with", "is", "a", "that",
+)
+_TERMS = ("API", "SLA", "GMP", "IFRS", "EBITDA", "firmware", "compliance", "warranty", "invoice", "KPI")
+
+# 정형 메일의 문서 종류는 모두 email_rules의 분야 키워드에 걸리도록 고른다
+_DOCUMENTS = ("계약서", "특허 명세서", "임상시험 보고서", "제품 매뉴얼", "사용설명서", "홍보 브로슈어")
+_PAIRS = (("한글본을 영문으로", "ko-en"), ("영문을 한국어로", "en-ko"), ("한글본을 일본어로", "ko-ja"))
+
+
+def _sentence(rng: random.Random, lang: str) -> str:
+    if lang == "en":
+        words = rng.choices(_EN_WORDS, k=rng.randint(8, 16))
+        return " ".join(words).capitalize() + "."
+    words = rng.choices(_KO_WORDS, k=rng.randint(6, 12))
+    if lang == "mixed":
+        for _ in range(rng.randint(1, 2)):
+            words.insert(rng.randrange(len(words)), rng.choice(_TERMS))
+    return " ".join(words) + "다."
+
+
+def _paragraph(rng: random.Random, lang: str) -> str:
+    return " ".join(_sentence(rng, lang) for _ in range(rng.randint(3, 6)))
+
+
+def make_pages(lang: str, pages: int) -> list[list[str]]:
+    """쪽별 문단 목록. 같은 (언어, 쪽수)면 항상 같은 내용."""
+    rng = random.Random(f"{lang}:{pages}")
+    return [[_paragraph(rng, lang) for _ in range(PARAGRAPHS_PER_PAGE)] for _ in range(pages)]
+
+
+def render_txt(pages: list[list[str]]) -> bytes:
+    return "\n\n".join("\n".join(page) for page in pages).encode("utf-8")
+
+
+def render_docx(pages: list[list[str]]) -> bytes:
+    from docx import Document
+
+    doc = Document()
+    # 저장 시각이 core.xml에 들어가지 않도록 고정 (같은 입력 → 같은 바이트, PDF의 invariant와 같은 목적)
+    doc.core_properties.created = doc.core_properties.modified = datetime(2026, 1, 1)
+    for i, page in enumerate(pages):
+        if i:
+            doc.add_page_break()
+        for paragraph in page:
+            doc.add_paragraph(paragraph)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    # zip 항목 시각도 고정해 다시 묶는다
+    out = io.BytesIO()
+    with zipfile.ZipFile(buffer) as src, zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as dst:
+        for info in src.infolist():
+            dst.writestr(zipfile.ZipInfo(info.filename, (2026, 1, 1, 0, 0, 0)), src.read(info), zipfile.ZIP_DEFLATED)
+    return out.getvalue()
+
+
+def render_pdf(pages: list[list[str]]) -> bytes:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+    from reportlab.pdfgen import canvas
+
+    if PDF_FONT not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(UnicodeCIDFont(PDF_FONT))
+    buffer = io.BytesIO()
+    canv = canvas.Canvas(buffer, pagesize=A4, invariant=1)  # invariant: 생성 시각이 들어가지 않아 바이트가 같음
+    width, height = A4
+    for page in pages:
+        text = canv.beginText(40, height - 50)
+        text.setFont(PDF_FONT, 9, leading=12)
+        for paragraph in page:
+            # 한글 1자 ≈ 라틴 2자 폭
+            wrap = 55 if any("가" <= ch <= "힣" for ch in paragraph[:20]) else 105
+            for line in textwrap.wrap(paragraph, wrap):
+                text.textLine(line)
+            text.textLine("")
+        canv.drawText(text)
+        canv.showPage()
+    canv.save()
+    return buffer.getvalue()
+
+
+_RENDER = {"txt": render_txt, "docx": render_docx, "pdf": render_pdf}
+
+
+def document_name(fmt: str, pages: int, lang: str) -> str:
+    return f"{lang}_{pages}p.{fmt}"
+
+
+def make_emails(count: int = EMAIL_COUNT) -> list[dict]:
+    """정형 메일(규칙 경로)과 자유 서술 메일(LLM 경로)을 번갈아 섞은 목록."""
+    rng = random.Random("emails")
+    emails = []
+    for i in range(count):
+        doc = rng.choice(_DOCUMENTS)
+        pair, _ = rng.choice(_PAIRS)
+        volume = rng.randrange(1, 40) * 500
+        if i % 2 == 0:
+            urgency = rng.choice((" 일정은 여유 있습니다.", " 급하게 필요합니다.", " 다음 주까지 부탁드립니다."))
+            body = f"안녕하세요. 당사 {doc} {pair} 번역 부탁드립니다. 분량은 약 {volume:,}자입니다.{urgency}"
+        else:
+            body = "\n".join([
+                "안녕하세요, 지난번 문의드렸던 건 관련해서 다시 연락드립니다.",
+                _paragraph(rng, "mixed"),
+                f"첨부한 자료는 대략 {rng.randrange(2, 60)}페이지 정도 되는데 일정 확인 부탁드립니다.",
+                "",
+                "감사합니다.",
+                "김민수 드림 | ABC무역 | 010-1234-5678",
+                "",
+                "-----Original Message-----",
+                "> " + _paragraph(rng, "ko"),
+            ])
+        emails.append({
+            "id": f"bench-{i}",
+            "sender": f"client{i}@example.com",
+            "subject": f"{doc} 번역 견적 문의",
+            "body": body,
+        })
+    return emails
+
+
+def ensure_fixtures(directory: Path = FIXTURE_DIR, page_counts=PAGE_COUNTS) -> Path:
+    """필요한 입력을 만들어 두고 디렉터리를 돌려준다 (이미 있는 파일은 건너뜀)."""
+    directory = Path(directory) / f"v{FIXTURE_VERSION}"
+    directory.mkdir(parents=True, exist_ok=True)
+    for lang in LANGS:
+        for pages in page_counts:
+            content = None
+            for fmt in FORMATS:
+                path = directory / document_name(fmt, pages, lang)
+                if path.exists():
+                    continue
+                content = content or make_pages(lang, pages)
+                tmp = path.with_name(path.name + ".tmp")
+                tmp.write_bytes(_RENDER[fmt](content))
+                tmp.replace(path)
+    emails = directory / "emails.jsonl"
+    if not emails.exists():
+        with open(emails, "w", encoding="utf-8") as f:
+            for email in make_emails():
+                f.write(json.dumps(email, ensure_ascii=False) + "\n")
+    return directory
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="벤치마크 입력 생성")
+    parser.add_argument("--dir", type=Path, default=FIXTURE_DIR)
+    args = parser.parse_args(argv)
+    directory = ensure_fixtures(args.dir)
+    for path in sorted(directory.iterdir()):
+        print(f"{path.stat().st_size:>12,}  {path.name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+견적 API 부하 측정 (Load Test)
+
+로컬에 uvicorn으로 api:app을 띄우고(또는 --url의 인스턴스에) keep-alive 연결 여러 개로
+요청을 계속 보내 초당 처리량과 지연 분포를 출력합니다. 외부 의존성 없이 asyncio 소켓만 사용합니다.
+
+사용법:
+    python benchmarks/load_api.py                                  # /quote, 10초, 연결 64개, 워커 1개
+    python benchmarks/load_api.py --workers 4 --concurrency 256
+    python benchmarks/load_api.py --endpoint batch --batch-size 100
+    python benchmarks/load_api.py --endpoint pdf --duration 5
+    python benchmarks/load_api.py --url http://127.0.0.1:8000      # 이미 떠 있는 인스턴스
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+ROOT = Path(__file__).resolve().parent.parent
+
+QUOTE = {"language_pair": "ko-en", "domain": "legal", "volume": 5000, "surcharge_keys": ["urgent"]}
+
+
+def _payload(endpoint: str, batch_size: int) -> tuple[str, bytes]:
+    if endpoint == "quote":
+        return "/quote", json.dumps(QUOTE).encode()
+    if endpoint == "batch":
+        quotes = [{**QUOTE, "volume": 1000 + i} for i in range(batch_size)]
+        return "/quotes/batch", json.dumps({"quotes": quotes}).encode()
+    if endpoint == "pdf":
+        body = {**QUOTE, "client_name": "홍길동", "client_email": "a@b.c", "deadline": "2026-12-31",
+                "quote_number": "Q-20261231-001"}
+        return "/quote/pdf", json.dumps(body, ensure_ascii=False).encode()
+    raise ValueError(endpoint)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(workers: int) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        cwd=ROOT,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return proc, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError("server did not start")
+
+
+async def _read_response(reader: asyncio.StreamReader) -> int:
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = 0
+    for line in head.split(b"\r\n")[1:]:
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def _client(host, port, request, stop_at, latencies, errors) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < stop_at:
+            started = time.perf_counter()
+            writer.write(request)
+            status = await _read_response(reader)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run_load(url: str, endpoint: str, concurrency: int, duration: float, batch_size: int) -> dict:
+    parts = urlsplit(url)
+    path, body = _payload(endpoint, batch_size)
+    request = (
+        f"POST {path} HTTP/1.1\r\nHost: {parts.netloc}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    ).encode() + body
+
+    # 워밍업 (워커 프로세스/폰트/단가표 준비)
+    await _client(parts.hostname, parts.port, request, time.perf_counter() + 1, [], [])
+
+    latencies, errors = [], []
+    started = time.perf_counter()
+    stop_at = started + duration
+    await asyncio.gather(*(
+        _client(parts.hostname, parts.port, request, stop_at, latencies, errors) for _ in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+
+    def pct(p: float) -> float:
+        return round(latencies[min(int(len(latencies) * p), len(latencies) - 1)] * 1000, 2)
+
+    per_request = batch_size if endpoint == "batch" else 1
+    return {
+        "endpoint": path,
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 2),
+        "requests": len(latencies),
+        "errors": len(errors),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "quotes_per_second": round(len(latencies) * per_request / elapsed, 1),
+        "latency_ms": {"p50": pct(0.5), "p95": pct(0.95), "p99": pct(0.99), "max": pct(1.0)},
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="견적 API 부하 측정")
+    parser.add_argument("--url", help="측정할 인스턴스 (생략하면 로컬에 uvicorn을 띄움)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn 워커 프로세스 수")
+    parser.add_argument("--endpoint", choices=["quote", "batch", "pdf"], default="quote")
+    parser.add_argument("--concurrency", type=int, default=64, help="동시 keep-alive 연결 수")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    proc = None
+    url = args.url
+    if url is None:
+        proc, url = start_server(args.workers)
+    try:
+        stats = asyncio.run(run_load(url, args.endpoint, args.concurrency, args.duration, args.batch_size))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(10)
+    stats["workers"] = args.workers if proc is not None else None
+    stats["cpus"] = os.cpu_count()
+    print(json.dumps(stats, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
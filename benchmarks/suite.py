@@ -0,0 +1,427 @@
+"""
+핫 패스 벤치마크 모음 (Benchmark Suite)
+
+고정 입력(benchmarks/fixtures.py)으로 견적 파이프라인의 각 단계를 측정해 JSON으로 기록하고,
+저장해 둔 기준(baseline) 결과보다 --threshold 이상 느려진 항목이 있으면 종료 코드 1로 실패합니다.
+  - quote/*        calculate_quote(단건), calculate_quotes(10,000건 일괄)
+  - extract_text/* txt·docx·pdf × ko·en·mixed × 1·50·500쪽
+  - count_volume/* 추출한 텍스트의 분량 계산 (langdetect 포함)
+  - pdf/*          generate_quote_pdf (고속 경로 / Platypus 경로)
+  - llm/*          parse_email(규칙 경로 / LLM 경로), analyze_file — 로컬 목 서버(tests/mock_openai.py)
+  - sheets/*       save_quote_to_sheets(아웃박스 기록), 행 500개 전송 — 가짜 gspread 워크시트
+
+각 항목은 한 번 실행이 10ms 이상이 되도록 반복 횟수를 맞춘 뒤, 예산 시간(--budget) 동안 표본을 모아
+1회(op)당 시간의 중앙값을 추적 지표로 씁니다. 캐시/견적번호/아웃박스 파일은 임시 디렉터리를 씁니다.
+
+사용법:
+    python benchmarks/suite.py                                   # 전체 (500쪽 PDF 추출 때문에 1코어에서 10분 이상)
+    python benchmarks/suite.py --quick                           # 500쪽 제외, 예산 축소
+    python benchmarks/suite.py -k extract_text/pdf -k quote/     # 이름에 포함된 항목만
+    python benchmarks/suite.py --quick --save-baseline benchmarks/baseline.json
+    python benchmarks/suite.py --quick --baseline benchmarks/baseline.json --threshold 0.25
+
+기준 결과는 측정한 머신에서만 의미가 있으므로 같은 머신(또는 같은 CI 러너)에서 저장·비교하세요.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from datetime import date
+from importlib import metadata
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.fixtures import FIXTURE_DIR, FORMATS, LANGS, PAGE_COUNTS, document_name, ensure_fixtures  # noqa: E402
+
+DEFAULT_OUTPUT = ROOT / ".cache" / "bench" / "results.json"
+DEFAULT_THRESHOLD = 0.2
+MIN_SAMPLE_SECONDS = 0.01
+MIN_SAMPLES = 3
+MAX_SAMPLES = 50
+
+MOCK_REPLY = {
+    # 분야 분석(analyze_domain)과 이메일 파싱 응답을 한 JSON에 담아 두 프롬프트 모두에 답한다
+    "domain": "legal",
+    "source_lang": "ko",
+    "target_lang": "en",
+    "confidence": 0.9,
+    "reasoning": "계약 조항",
+    "client_name": "김민수",
+    "volume": {"value": 20, "unit": "pages"},
+    "urgency": "normal",
+    "deadline": None,
+    "dtp_required": None,
+    "notes": None,
+}
+
+
+@dataclass
+class Context:
+    fixtures: Path
+    work: Path
+    pages: tuple[int, ...]
+    llm_latency: float
+    sheets_latency: float
+    closers: list[Callable] = field(default_factory=list)
+    _llm_url: str | None = None
+
+    def read(self, fmt: str, pages: int, lang: str) -> tuple[str, bytes]:
+        name = document_name(fmt, pages, lang)
+        return name, (self.fixtures / name).read_bytes()
+
+    def emails(self) -> list[dict]:
+        with open(self.fixtures / "emails.jsonl", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def llm_url(self) -> str:
+        """목 OpenAI 서버를 한 번 띄우고 공유 클라이언트가 그쪽을 보게 한다."""
+        if self._llm_url is None:
+            from modules import llm_client
+            from tests.mock_openai import MockOpenAIServer
+
+            server = MockOpenAIServer(reply=lambda body: json.dumps(MOCK_REPLY), delay=self.llm_latency)
+            server.__enter__()
+            self.closers.append(lambda: server.__exit__(None, None, None))
+            self._llm_url = llm_client.LLM_BASE_URL = server.base_url
+            llm_client.reset_clients()
+        return self._llm_url
+
+
+@dataclass
+class Bench:
+    name: str
+    setup: Callable[[Context], Callable[[], object]]  # 준비 후 1회 실행 함수를 돌려줌
+    ops: int = 1  # 1회 실행에 처리하는 건수 (초당 처리량 계산용)
+    unit: str = "call"
+
+
+# ── 측정 대상 ──
+
+def _quote_benches() -> Iterator[Bench]:
+    def scalar(ctx: Context):
+        from modules.quote_calculator import calculate_quote
+
+        return lambda: calculate_quote("ko-en", "legal", 5000, surcharge_keys=["urgent"])
+
+    def bulk(ctx: Context):
+        import numpy as np
+
+        from modules.quote_calculator import calculate_quotes, get_pricing
+
+        pricing = get_pricing()
+        rng = np.random.default_rng(0)
+        pairs = [pair for pair, _ in pricing.unit_prices]
+        domains = [domain for _, domain in pricing.unit_prices]
+        picks = rng.integers(0, len(pairs), 10_000)
+        lang_pairs = [pairs[i] for i in picks]
+        line_domains = [domains[i] for i in picks]
+        volumes = rng.integers(100, 100_000, 10_000).astype(float)
+        masks = [pricing.surcharge_mask(["urgent"] if i % 3 == 0 else []) for i in range(10_000)]
+        return lambda: calculate_quotes(lang_pairs, line_domains, volumes, "chars", masks)
+
+    yield Bench("quote/calculate_quote", scalar)
+    yield Bench("quote/calculate_quotes_10k", bulk, ops=10_000, unit="quote")
+
+
+def _document_benches(pages: tuple[int, ...]) -> Iterator[Bench]:
+    for fmt in FORMATS:
+        for lang in LANGS:
+            for n in pages:
+                def extract(ctx: Context, fmt=fmt, lang=lang, n=n):
+                    from modules.file_analyzer import extract_text
+
+                    name, data = ctx.read(fmt, n, lang)
+                    return lambda: extract_text(data, name)
+
+                yield Bench(f"extract_text/{fmt}/{lang}/{n}p", extract, ops=n, unit="page")
+
+    for lang in LANGS:
+        for n in pages:
+            def count(ctx: Context, lang=lang, n=n):
+                from modules.file_analyzer import count_volume
+
+                _, data = ctx.read("txt", n, lang)
+                text = data.decode("utf-8")
+                return lambda: count_volume(text)
+
+            yield Bench(f"count_volume/{lang}/{n}p", count, ops=n, unit="page")
+
+
+def _pdf_benches() -> Iterator[Bench]:
+    def generate(ctx: Context, fast: bool):
+        from modules.pdf_generator import generate_quote_pdf
+        from modules.quote_calculator import calculate_quote
+
+        result = calculate_quote("ko-en", "legal", 5000, surcharge_keys=["urgent", "dtp"])
+        deadline = date(2026, 12, 31)
+        return lambda: generate_quote_pdf(
+            result, "ABC무역 김민수", "kim@abc.co.kr", deadline, "납품 전 용어집 확인", "Q-20261231-001", fast=fast,
+        )
+
+    yield Bench("pdf/generate_quote_pdf", lambda ctx: generate(ctx, True))
+    yield Bench("pdf/generate_quote_pdf_platypus", lambda ctx: generate(ctx, False))
+
+
+def _llm_benches() -> Iterator[Bench]:
+    def parse(ctx: Context, formulaic: bool):
+        from modules.email_parser import parse_email
+
+        ctx.llm_url()
+        # 짝수 번째는 규칙만으로 해석되는 정형 메일 (benchmarks/fixtures.make_emails)
+        emails = [e for i, e in enumerate(ctx.emails()) if (i % 2 == 0) == formulaic]
+
+        def run():
+            for e in emails:
+                parse_email(e["sender"], e["subject"], e["body"], use_cache=False)
+        return run
+
+    def analyze(ctx: Context, fmt: str):
+        from modules.file_analyzer import analyze_file
+
+        ctx.llm_url()
+        name, data = ctx.read(fmt, 1, "mixed")
+        return lambda: analyze_file(data, name, use_cache=False)
+
+    yield Bench("llm/parse_email_rules", lambda ctx: parse(ctx, True), ops=100, unit="email")
+    yield Bench("llm/parse_email_llm", lambda ctx: parse(ctx, False), ops=100, unit="email")
+    for fmt in FORMATS:
+        yield Bench(f"llm/analyze_file/{fmt}", lambda ctx, fmt=fmt: analyze(ctx, fmt))
+
+
+class FakeWorksheet:
+    """gspread.Worksheet 대용: append_rows/col_values만 흉내 내고 호출마다 latency초 기다린다."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.rows = 0
+        self.keys: list[str] = []
+
+    def append_rows(self, rows, value_input_option="RAW"):
+        if self.latency:
+            time.sleep(self.latency)
+        self.rows += len(rows)
+        self.keys.extend(row[-1] for row in rows)
+
+    def col_values(self, col):
+        if self.latency:
+            time.sleep(self.latency)
+        return ["기록ID", *self.keys]
+
+
+def _sheets_benches() -> Iterator[Bench]:
+    def writer(ctx: Context, name: str):
+        from modules.outbox import Outbox
+        from modules.sheets_connector import SheetWriter
+
+        sheet = FakeWorksheet(ctx.sheets_latency)
+        outbox = Outbox(ctx.work / f"{name}.sqlite3")
+        w = SheetWriter(lambda: sheet, outbox=outbox, flush_interval=60, retry_delay=0)
+        ctx.closers.append(lambda: (w.close(5), outbox.close()))
+        return w
+
+    def save(ctx: Context):
+        from modules import sheets_connector
+        from modules.quote_calculator import calculate_quote
+
+        # 전송 스레드 없이 아웃박스 기록(행 구성 + 견적번호 발급 + SQLite commit)만 잰다
+        sheets_connector._writer = writer(ctx, "save")
+        result = calculate_quote("ko-en", "legal", 5000)
+        deadline = date(2026, 12, 31)
+        return lambda: sheets_connector.save_quote_to_sheets(result, "홍길동", "a@b.c", deadline)
+
+    def drain(ctx: Context):
+        w = writer(ctx, "drain")
+        w.start()
+        row = ["Q-20261231-001", "2026-12-31", "홍길동", "a@b.c", "ko-en", "legal", 5000, "chars", 5000]
+
+        def run():
+            for _ in range(500):
+                w.enqueue(row)
+            assert w.flush(timeout=60)
+        return run
+
+    yield Bench("sheets/save_quote", save)
+    yield Bench("sheets/drain_500_rows", drain, ops=500, unit="row")
+
+
+def collect(pages: tuple[int, ...]) -> list[Bench]:
+    return [
+        *_quote_benches(),
+        *_document_benches(pages),
+        *_pdf_benches(),
+        *_llm_benches(),
+        *_sheets_benches(),
+    ]
+
+
+# ── 측정/기록/비교 ──
+
+def measure(run: Callable[[], object], budget: float) -> dict:
+    started = time.perf_counter()
+    run()  # 준비 실행 (import, 폰트, 풀 생성)
+    first = time.perf_counter() - started
+    number = max(1, math.ceil(MIN_SAMPLE_SECONDS / first)) if first > 0 else 1000
+
+    samples = []
+    deadline = time.perf_counter() + budget
+    while len(samples) < MAX_SAMPLES and (len(samples) < MIN_SAMPLES or time.perf_counter() < deadline):
+        t = time.perf_counter()
+        for _ in range(number):
+            run()
+        samples.append((time.perf_counter() - t) / number)
+    samples.sort()
+    return {
+        "median_s": statistics.median(samples),
+        "min_s": samples[0],
+        "max_s": samples[-1],
+        "samples": len(samples),
+        "number": number,
+    }
+
+
+def _git_revision() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def _versions() -> dict:
+    versions = {}
+    for name in ("numpy", "pdfplumber", "python-docx", "reportlab", "openai", "gspread"):
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def run_suite(benches: list[Bench], ctx: Context, budget: float) -> dict:
+    results = {}
+    for bench in benches:
+        run = bench.setup(ctx)
+        stats = measure(run, budget)
+        stats["ops"] = bench.ops
+        stats["unit"] = bench.unit
+        stats["ops_per_s"] = bench.ops / stats["median_s"]
+        results[bench.name] = stats
+        print(f"{bench.name:<42} {stats['median_s'] * 1000:>11.3f} ms  {stats['ops_per_s']:>12,.1f} {bench.unit}/s",
+              flush=True)
+    return results
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[dict]:
+    """기준보다 중앙값이 (1 + threshold)배 넘게 느려진 항목 목록. 양쪽에 다 있는 항목만 비교한다."""
+    regressions = []
+    for name, base in baseline["results"].items():
+        cur = current["results"].get(name)
+        if cur is None:
+            continue
+        ratio = cur["median_s"] / base["median_s"]
+        if ratio > 1 + threshold:
+            regressions.append({
+                "name": name, "baseline_s": base["median_s"], "current_s": cur["median_s"], "ratio": ratio,
+            })
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="견적 파이프라인 벤치마크")
+    parser.add_argument("-k", "--filter", action="append", default=[], help="이름에 이 문자열이 있는 항목만")
+    parser.add_argument("--quick", action="store_true", help="500쪽 문서 제외, 항목당 예산 0.3초")
+    parser.add_argument("--budget", type=float, default=None, help="항목당 측정 시간(초, 기본 2)")
+    parser.add_argument("--pages", help="문서 쪽수 (쉼표 구분, 기본 1,50,500)")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="목 LLM 서버 응답 지연(초)")
+    parser.add_argument("--sheets-latency", type=float, default=0.0, help="가짜 Sheets 호출 지연(초)")
+    parser.add_argument("--fixtures", type=Path, default=None, help="입력 파일 디렉터리")
+    parser.add_argument("-o", "--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", type=Path, help="비교할 기준 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="허용 느려짐 비율 (0.2 = 20%%)")
+    parser.add_argument("--save-baseline", type=Path, help="이번 결과를 기준으로 저장")
+    parser.add_argument("--list", action="store_true", help="항목 이름만 출력")
+    args = parser.parse_args(argv)
+
+    if args.pages:
+        pages = tuple(int(p) for p in args.pages.split(","))
+    else:
+        pages = tuple(p for p in PAGE_COUNTS if not (args.quick and p >= 500))
+    budget = args.budget if args.budget is not None else (0.3 if args.quick else 2.0)
+
+    benches = [b for b in collect(pages) if not args.filter or any(f in b.name for f in args.filter)]
+    if args.list:
+        print("\n".join(b.name for b in benches))
+        return 0
+
+    with tempfile.TemporaryDirectory(prefix="quote-bench-") as work:
+        # 모듈이 import 시 읽는 경로를 임시 디렉터리로 (저장소에 캐시/상태 파일을 남기지 않음)
+        os.environ["QUOTE_CACHE_DIR"] = os.path.join(work, "cache")
+        os.environ["QUOTE_NUMBER_DB"] = os.path.join(work, "quote_numbers.sqlite3")
+        os.environ["SHEETS_OUTBOX_PATH"] = os.path.join(work, "outbox.sqlite3")
+        fixtures = ensure_fixtures(args.fixtures or FIXTURE_DIR, pages)
+        ctx = Context(fixtures, Path(work), pages, args.llm_latency, args.sheets_latency)
+        try:
+            results = run_suite(benches, ctx, budget)
+            if any(b.name.startswith("llm/parse_email") for b in benches):
+                from modules.email_parser import call_stats
+                parsed_by = call_stats()["parsed_by"]
+            else:
+                parsed_by = None
+        finally:
+            for close in reversed(ctx.closers):
+                close()
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "versions": _versions(),
+            "budget_s": budget,
+            "pages": list(pages),
+            "llm_latency_s": args.llm_latency,
+            "sheets_latency_s": args.sheets_latency,
+            "parsed_by": parsed_by,
+        },
+        "results": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n결과: {args.output}")
+    if args.save_baseline:
+        args.save_baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.save_baseline.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"기준 저장: {args.save_baseline}")
+
+    if args.baseline is None:
+        return 0
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    base_meta = baseline.get("meta", {})
+    if (base_meta.get("cpu_count"), base_meta.get("platform")) != (os.cpu_count(), platform.platform()):
+        print("주의: 기준 결과와 측정 환경(CPU 수/플랫폼)이 다릅니다.")
+    regressions = compare(report, baseline, args.threshold)
+    compared = len(set(baseline["results"]) & set(results))
+    if not regressions:
+        print(f"기준 대비 {compared}개 항목 모두 허용 범위(+{args.threshold:.0%}) 안")
+        return 0
+    print(f"기준 대비 느려진 항목 {len(regressions)}개 / {compared}개 (허용 +{args.threshold:.0%}):")
+    for r in regressions:
+        print(f"  {r['name']:<42} {r['baseline_s'] * 1000:.3f} ms → {r['current_s'] * 1000:.3f} ms  (x{r['ratio']:.2f})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -46,13 +46,16 @@ Extraction rules:
 - urgency "urgent": mentions within 24h, "급하게", "내일", "ASAP", "긴급"
 - urgency "semi_urgent": mentions within 48h, "이틀", "모레"
 - urgency "normal": no urgency mentioned or deadline > 48h
-- For deadline, infer from context. Today is {today}.
+- For deadline, infer from context relative to the "Today" date given with the email.
 - If a field cannot be determined, use null.
 - client_name: extract from email signature, greeting, or sender info.
 """
 
+# 오늘 날짜는 system 프롬프트가 아닌 user 메시지에 넣는다.
+# → system + few-shot 접두부가 매 호출 바이트 단위로 동일해 제공자 측 프롬프트 캐싱이 적용된다.
 EMAIL_PARSING_USER = """Parse this customer email and extract translation request details:
 
+Today: {today}
 From: {sender}
 Subject: {subject}
 
@@ -64,6 +67,7 @@ EMAIL_FEW_SHOT_EXAMPLES = [
         "role": "user",
         "content": """Parse this customer email and extract translation request details:
 
+Today: 2025-03-05
 From: kim@abctrade.co.kr
 Subject: 영문 카탈로그 번역 요청
 
@@ -81,7 +85,7 @@ Subject: 영문 카탈로그 번역 요청
   "volume": {"value": 5000, "unit": "chars"},
   "domain": "technical",
   "urgency": "normal",
-  "deadline": null,
+  "deadline": "2025-03-14",
   "dtp_required": null,
   "notes": "제품 기술 용어 다수 포함"
 }""",
@@ -90,6 +94,7 @@ Subject: 영문 카탈로그 번역 요청
         "role": "user",
         "content": """Parse this customer email and extract translation request details:
 
+Today: 2025-03-05
 From: lee@lawfirm.co.kr
 Subject: 급한 번역 부탁드립니다
 
@@ -106,7 +111,7 @@ Subject: 급한 번역 부탁드립니다
   "volume": {"value": 8, "unit": "pages"},
   "domain": "legal",
   "urgency": "urgent",
-  "deadline": null,
+  "deadline": "2025-03-06",
   "dtp_required": null,
   "notes": "법률 용어 정확도 요구"
 }""",
@@ -0,0 +1,305 @@
+"""
+이메일 일괄 수집 모듈 (Email Ingest)
+
+받은편지함 내보내기(mbox 파일, .eml 디렉터리, JSONL)를 스트리밍으로 읽어
+parse_email → (필드가 충분하면) calculate_quote 결과를 JSONL로 기록합니다.
+  - 동시 파싱 수 제한 + 분당 요청 수 제한, 429 응답 시 전체 속도를 늦춰 재시도
+  - 결과는 입력 순서대로 한 줄씩 기록하므로 메모리는 동시 처리 창 크기만큼만 사용
+  - 체크포인트(처리 건수, 출력 파일 오프셋)로 중단 지점부터 재개
+
+사용법:
+    python -m modules.email_ingest inbox.mbox -o parsed.jsonl
+    python -m modules.email_ingest requests.jsonl -o parsed.jsonl --concurrency 16 --rpm 300
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import time
+from collections import deque
+from collections.abc import Iterator
+from dataclasses import asdict
+from email import message_from_bytes, policy
+from email.message import EmailMessage
+from email.utils import parseaddr
+from pathlib import Path
+
+from modules.email_parser import parse_email
+from modules.quote_calculator import calculate_quote
+
+MAX_CONCURRENCY = 8
+MAX_ATTEMPTS = 3
+CHECKPOINT_EVERY = 20
+
+_TAG = re.compile(r"<[^>]+>")
+# mbox 구분선: "From <발신자> <asctime 형식 날짜>" (본문의 "From ..." 문장과 구분하기 위해 연도까지 확인)
+_MBOX_SEPARATOR = re.compile(rb"From \S+ .*\d{1,2}:\d{2}(:\d{2})? .*\d{4}\s*$")
+
+
+# ── 입력 읽기 (모두 제너레이터: 한 번에 한 통씩) ──
+
+def _message_record(msg: EmailMessage, fallback_id: str) -> dict:
+    part = msg.get_body(preferencelist=("plain", "html"))
+    body = ""
+    if part is not None:
+        try:
+            body = part.get_content()
+        except (LookupError, UnicodeDecodeError):
+            # 알 수 없는 charset 등: 이 메일만 UTF-8로 최대한 읽고 계속 진행한다
+            body = (part.get_payload(decode=True) or b"").decode("utf-8", errors="replace")
+        if part.get_content_type() == "text/html":
+            body = _TAG.sub(" ", body)
+    return {
+        "id": str(msg.get("Message-ID") or fallback_id).strip(),
+        "sender": parseaddr(str(msg.get("From", "")))[1],
+        "subject": str(msg.get("Subject", "")),
+        "body": body,
+    }
+
+
+def iter_mbox(path: str | Path) -> Iterator[dict]:
+    # mailbox.mbox는 전체 목차를 먼저 만들기 때문에 "From " 구분선을 직접 따라가며 읽는다.
+    def parse(lines: list[bytes], index: int) -> dict:
+        msg = message_from_bytes(b"".join(lines), policy=policy.default)
+        return _message_record(msg, f"{Path(path).name}#{index}")
+
+    index = 0
+    lines: list[bytes] = []
+    prev_blank = True
+    with open(path, "rb") as f:
+        for line in f:
+            if prev_blank and _MBOX_SEPARATOR.match(line):
+                if lines:
+                    yield parse(lines, index)
+                    index += 1
+                lines = []
+            else:
+                lines.append(line)
+            prev_blank = line.strip() == b""
+    if lines:
+        yield parse(lines, index)
+
+
+def iter_eml_dir(path: str | Path) -> Iterator[dict]:
+    for eml in sorted(Path(path).glob("*.eml")):
+        msg = message_from_bytes(eml.read_bytes(), policy=policy.default)
+        yield _message_record(msg, eml.name)
+
+
+def iter_jsonl(path: str | Path) -> Iterator[dict]:
+    with open(path, encoding="utf-8") as f:
+        for index, line in enumerate(f):
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            yield {
+                "id": str(row.get("id") or row.get("message_id") or row.get("request_id") or index),
+                "sender": row.get("sender") or row.get("from") or "",
+                "subject": row.get("subject") or row.get("title") or "",
+                "body": row.get("body") or "",
+            }
+
+
+def iter_messages(source: str | Path) -> Iterator[dict]:
+    source = Path(source)
+    if source.is_dir():
+        return iter_eml_dir(source)
+    if source.suffix.lower() in (".jsonl", ".json"):
+        return iter_jsonl(source)
+    return iter_mbox(source)
+
+
+# ── 견적 연결 ──
+
+def _volume(parsed: dict) -> tuple[float, str] | None:
+    """LLM 응답의 volume이 {"value": 양수, "unit": 문자열} 형태일 때만 (값, 단위)."""
+    volume = parsed.get("volume")
+    if not isinstance(volume, dict):
+        return None
+    value, unit = volume.get("value"), volume.get("unit")
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        return None
+    if not isinstance(unit, str) or not unit:
+        return None
+    return value, unit
+
+
+def quote_from_parsed(parsed: dict) -> dict | None:
+    """파싱 결과에 언어쌍/분야/분량이 모두 있으면 견적을 산출한다 (불완전하거나 형식이 다르면 None)."""
+    volume = _volume(parsed)
+    language_pair, domain = parsed.get("language_pair"), parsed.get("domain")
+    if not (isinstance(language_pair, str) and language_pair and isinstance(domain, str) and domain and volume):
+        return None
+
+    surcharge_keys = []
+    if parsed.get("urgency") in ("urgent", "semi_urgent"):
+        surcharge_keys.append(parsed["urgency"])
+    if parsed.get("dtp_required"):
+        surcharge_keys.append("dtp")
+
+    result = calculate_quote(
+        language_pair=language_pair,
+        domain=domain,
+        volume=volume[0],
+        volume_unit=volume[1],
+        surcharge_keys=surcharge_keys,
+    )
+    return asdict(result)
+
+
+# ── 속도 제한 ──
+
+class RateLimiter:
+    """분당 요청 수 제한. 429를 받으면 backoff()로 모든 요청을 잠시 멈춘다."""
+
+    def __init__(self, requests_per_minute: float | None = None):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._next_at = 0.0
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_at, self._paused_until)
+            self._next_at = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    def backoff(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+def _is_rate_limited(parsed: dict) -> bool:
+    error = str(parsed.get("error", "")).lower()
+    return "429" in error or "rate limit" in error
+
+
+async def _process(message: dict, semaphore: asyncio.Semaphore, limiter: RateLimiter) -> dict:
+    parsed = {}
+    for attempt in range(MAX_ATTEMPTS):
+        await limiter.acquire()
+        async with semaphore:
+            parsed = await asyncio.to_thread(
+                parse_email, message["sender"], message["subject"], message["body"],
+            )
+        if not _is_rate_limited(parsed):
+            break
+        limiter.backoff(2 ** attempt)
+
+    record = {
+        "id": message["id"],
+        "sender": message["sender"],
+        "subject": message["subject"],
+        "parsed": parsed,
+        "quote": None,
+    }
+    if not parsed.get("error"):
+        try:
+            record["quote"] = quote_from_parsed(parsed)
+        except (TypeError, ValueError) as e:
+            record["quote_error"] = str(e)
+    return record
+
+
+# ── 체크포인트 ──
+
+def _load_checkpoint(path: Path) -> dict:
+    if path.exists():
+        return json.loads(path.read_text(encoding="utf-8"))
+    return {"done": 0, "output_offset": 0}
+
+
+def _save_checkpoint(path: Path, done: int, output_offset: int) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps({"done": done, "output_offset": output_offset}), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+async def ingest(
+    source: str | Path,
+    output: str | Path,
+    checkpoint: str | Path | None = None,
+    max_concurrency: int = MAX_CONCURRENCY,
+    requests_per_minute: float | None = None,
+) -> dict:
+    """source의 메시지를 모두 처리해 output(JSONL)에 기록하고 처리 통계를 반환한다.
+
+    checkpoint 파일이 있으면 기록된 건수만큼 입력을 건너뛰고,
+    출력 파일을 마지막 체크포인트 오프셋으로 잘라 중복 없이 이어서 쓴다.
+    """
+    output = Path(output)
+    checkpoint = Path(checkpoint) if checkpoint else output.with_suffix(output.suffix + ".ckpt")
+    state = _load_checkpoint(checkpoint)
+    skip = state["done"] if output.exists() else 0
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    limiter = RateLimiter(requests_per_minute)
+    window = 2 * max_concurrency
+    stats = {"resumed_from": skip, "processed": 0, "quoted": 0, "errors": 0}
+    started = time.perf_counter()
+
+    mode = "r+b" if output.exists() and skip else "wb"
+    with open(output, mode) as out:
+        out.seek(state["output_offset"] if skip else 0)
+        out.truncate()
+        done = skip
+
+        pending: deque[asyncio.Task] = deque()
+        messages = iter_messages(source)
+
+        async def write_next() -> None:
+            nonlocal done
+            record = await pending.popleft()
+            out.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+            done += 1
+            stats["processed"] += 1
+            stats["quoted"] += record["quote"] is not None
+            stats["errors"] += bool(record["parsed"].get("error"))
+            if done % CHECKPOINT_EVERY == 0:
+                out.flush()
+                _save_checkpoint(checkpoint, done, out.tell())
+
+        try:
+            for index, message in enumerate(messages):
+                if index < skip:
+                    continue
+                pending.append(asyncio.create_task(_process(message, semaphore, limiter)))
+                if len(pending) >= window:
+                    await write_next()
+            while pending:
+                await write_next()
+        finally:
+            for task in pending:
+                task.cancel()
+            out.flush()
+            _save_checkpoint(checkpoint, done, out.tell())
+
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    stats["per_second"] = round(stats["processed"] / stats["seconds"], 2) if stats["seconds"] else None
+    return stats
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="이메일 일괄 파싱/견적")
+    parser.add_argument("source", help="mbox 파일, .eml 디렉터리 또는 JSONL")
+    parser.add_argument("-o", "--output", required=True, help="결과 JSONL 경로")
+    parser.add_argument("--checkpoint", help="체크포인트 경로 (기본: <output>.ckpt)")
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENCY)
+    parser.add_argument("--rpm", type=float, default=None, help="분당 최대 요청 수")
+    args = parser.parse_args(argv)
+
+    stats = asyncio.run(ingest(
+        args.source,
+        args.output,
+        checkpoint=args.checkpoint,
+        max_concurrency=args.concurrency,
+        requests_per_minute=args.rpm,
+    ))
+    print(json.dumps(stats, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,22 @@
 """
 이메일 파싱 모듈 (Email Parser)
 
-고객 이메일에서 번역 요청 정보를 GPT-4o-mini로 구조화 추출합니다.
+고객 이메일에서 번역 요청 정보를 구조화 추출합니다.
 파싱 결과는 웹 폼에 자동 사전입력(Pre-fill)됩니다.
+  - 먼저 규칙 기반 추출(modules/email_rules)로 해석하고, 견적 필수 필드가 모두 해석되면 API 호출 없이 반환
+  - 해석하지 못한 필드가 있을 때만 GPT-4o-mini를 호출해 그 필드를 채움
 
 이메일 파싱은 '요청 메타데이터'만 처리하므로 외부 API 사용 가능.
 단, 이메일 본문에 번역 원문이 직접 포함된 경우:
   → 프로덕션에서는 원문 부분 마스킹 처리 후 API 전송
 """
 
+import hashlib
 import json
+import re
+import threading
+import time
+from collections import deque
 from datetime import date
 
 from openai import OpenAI
@@ -19,52 +26,241 @@ from config.prompts import (
     EMAIL_PARSING_USER,
     EMAIL_FEW_SHOT_EXAMPLES,
 )
+from modules.cache import CACHE_DIR, DiskCache
+from modules.email_preprocess import estimate_tokens, preprocess_body
+from modules.email_rules import (
+    FIELDS,
+    RESOLVED_CONFIDENCE,
+    RULES_VERSION,
+    extract_fields,
+    unresolved_fields,
+)
+from modules.llm_client import get_client, llm_slot, record_call
 
-# TODO [프로덕션]: base_url="http://localhost:11434/v1"
+# TODO [프로덕션]: LLM_BASE_URL="http://localhost:11434/v1" (modules/llm_client 참고)
 MODEL = "gpt-4o-mini"
 
+# 응답 캐시: Streamlit rerun/전달된 중복 메일은 API를 다시 호출하지 않는다.
+# 키에 프롬프트·few-shot 해시, 모델, 규칙 버전, 오늘 날짜(user 메시지의 Today)를 포함한다.
+PROMPT_HASH = hashlib.sha256(
+    (EMAIL_PARSING_SYSTEM + EMAIL_PARSING_USER).encode("utf-8")
+).hexdigest()[:12]
+FEW_SHOT_HASH = hashlib.sha256(
+    json.dumps(EMAIL_FEW_SHOT_EXAMPLES, ensure_ascii=False, sort_keys=True).encode("utf-8")
+).hexdigest()[:12]
+CACHE_MAX_ENTRIES = 5000
+CACHE_TTL = 2 * 24 * 3600
+
+_WHITESPACE = re.compile(r"\s+")
+
+# 매 호출 동일한 접두부(system + few-shot). 메시지 객체도 한 번만 만든다.
+_PREFIX_MESSAGES = (
+    {"role": "system", "content": EMAIL_PARSING_SYSTEM},
+    *EMAIL_FEW_SHOT_EXAMPLES,
+)
+PREFIX_TOKENS = sum(estimate_tokens(m["content"]) for m in _PREFIX_MESSAGES)
+
+# 호출별 토큰/지연 기록 (최근 RECENT_CALLS건 + 누적 합계)
+RECENT_CALLS = 200
+_stats_lock = threading.Lock()
+_recent_calls: deque[dict] = deque(maxlen=RECENT_CALLS)
+_totals = {
+    "calls": 0,
+    "prompt_tokens": 0,
+    "cached_tokens": 0,
+    "completion_tokens": 0,
+    "latency_ms": 0.0,
+}
+_parsed_by = {"rules": 0, "rules+llm": 0, "llm": 0}
+
+_cache: DiskCache | None = None
+
 
 def _get_client() -> OpenAI:
     # Lazy init: OPENAI_API_KEY 없이도 모듈 import 가능하도록
-    # 실제 이메일 파싱 호출 시점에 OpenAI 클라이언트 생성
-    return OpenAI()
+    # 실제 이메일 파싱 호출 시점에 공유 클라이언트 생성(이후 재사용)
+    return get_client()
+
+
+def _get_cache() -> DiskCache:
+    global _cache
+    if _cache is None:
+        _cache = DiskCache(
+            CACHE_DIR / "email_parse.sqlite3",
+            max_entries=CACHE_MAX_ENTRIES,
+            ttl=CACHE_TTL,
+        )
+    return _cache
+
+
+def cache_key(sender: str, subject: str, body: str, today: str, rules: str | None = RULES_VERSION) -> str:
+    normalized = {
+        "sender": (sender or "").strip().lower(),
+        "subject": _WHITESPACE.sub(" ", subject or "").strip(),
+        "body": _WHITESPACE.sub(" ", body or "").strip(),
+        "prompt": PROMPT_HASH,
+        "few_shot": FEW_SHOT_HASH,
+        "model": MODEL,
+        "rules": rules,
+        "today": today,
+    }
+    return hashlib.sha256(
+        json.dumps(normalized, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+def cache_stats() -> dict:
+    """응답 캐시 현황 (hits/misses는 현재 프로세스 기준)."""
+    return _get_cache().stats()
+
+
+def _record_call(record: dict) -> None:
+    with _stats_lock:
+        _recent_calls.append(record)
+        _totals["calls"] += 1
+        for key in ("prompt_tokens", "cached_tokens", "completion_tokens", "latency_ms"):
+            _totals[key] += record.get(key) or 0
+
+
+def call_stats() -> dict:
+    """API 호출 토큰 수/지연 통계 (현재 프로세스 기준)."""
+    with _stats_lock:
+        totals = dict(_totals)
+        recent = list(_recent_calls)
+        totals["parsed_by"] = dict(_parsed_by)
+    calls = totals["calls"]
+    totals["avg_latency_ms"] = round(totals["latency_ms"] / calls, 1) if calls else None
+    totals["avg_prompt_tokens"] = round(totals["prompt_tokens"] / calls, 1) if calls else None
+    totals["recent"] = recent
+    return totals
+
+
+def _merge(rule_result: dict, rule_confidence: dict, llm_result: dict) -> tuple[dict, dict]:
+    """규칙으로 해석한 필드는 유지하고, 나머지만 LLM 결과로 채운다. LLM이 채운 필드의 신뢰도는 None.
+
+    규칙이 근거 없이 기본값만 둔 필드(긴급도 "normal" 등, 신뢰도가 기준 미만)는 LLM 값이 있으면 LLM 값을 쓴다.
+    """
+    merged = dict(llm_result)
+    confidence = {}
+    for field in FIELDS:
+        if rule_confidence[field] >= RESOLVED_CONFIDENCE or (
+            llm_result.get(field) is None and rule_result[field] is not None
+        ):
+            merged[field] = rule_result[field]
+            confidence[field] = rule_confidence[field]
+        else:
+            confidence[field] = None
+    return merged, confidence
+
+
+# 마감까지 남은 일수 → 그 마감이 요구하는 최소 긴급도 (EMAIL_PARSING_SYSTEM 규칙: 24시간/48시간)
+_URGENCY_RANK = {"normal": 0, "semi_urgent": 1, "urgent": 2}
+
+
+def _reconcile_urgency(result: dict, confidence: dict | None, today: date) -> None:
+    """마감일이 24/48시간 안인데 긴급도가 그보다 낮으면 마감일에 맞춰 올린다 (할증 누락 방지)."""
+    deadline = result.get("deadline")
+    if not isinstance(deadline, str):
+        return
+    try:
+        days = (date.fromisoformat(deadline[:10]) - today).days
+    except ValueError:
+        return
+    implied = "urgent" if days <= 1 else "semi_urgent" if days <= 2 else None
+    if implied is None or _URGENCY_RANK.get(result.get("urgency"), 0) >= _URGENCY_RANK[implied]:
+        return
+    result["urgency"] = implied
+    if confidence is not None:
+        confidence["urgency"] = None
+
+
+def _finish(result: dict, confidence: dict | None, parsed_by: str) -> dict:
+    # 언어쌍 매핑
+    src = result.get("source_lang")
+    tgt = result.get("target_lang")
+    if src and tgt:
+        result["language_pair"] = f"{src}-{tgt}"
+    else:
+        result["language_pair"] = None
+    result["confidence"] = confidence
+    result["parsed_by"] = parsed_by
+    with _stats_lock:
+        _parsed_by[parsed_by] += 1
+    return result
 
 
 def parse_email(
     sender: str,
     subject: str,
     body: str,
+    use_cache: bool = True,
+    use_rules: bool = True,
 ) -> dict:
-    system_prompt = EMAIL_PARSING_SYSTEM.format(today=date.today().isoformat())
+    today_date = date.today()
+    today = today_date.isoformat()
+    # 인용/서명/고지문 제거 후 토큰 예산 안으로 자름
+    cleaned = preprocess_body(body)
+
+    rule_result = rule_confidence = None
+    if use_rules:
+        rule_result, rule_confidence = extract_fields(subject, cleaned, today_date)
+        if not unresolved_fields(rule_confidence):
+            return _finish(rule_result, rule_confidence, "rules")
+
+    key = cache_key(sender, subject, body, today, RULES_VERSION if use_rules else None) if use_cache else None
+    if key is not None:
+        cached = _get_cache().get(key)
+        if cached is not None:
+            return cached
+
     user_prompt = EMAIL_PARSING_USER.format(
+        today=today,
         sender=sender,
         subject=subject,
-        body=body,
+        body=cleaned,
     )
 
     messages = [
-        {"role": "system", "content": system_prompt},
-        *EMAIL_FEW_SHOT_EXAMPLES,
+        *_PREFIX_MESSAGES,
         {"role": "user", "content": user_prompt},
     ]
 
     try:
-        response = _get_client().chat.completions.create(
-            model=MODEL,
-            messages=messages,
-            response_format={"type": "json_object"},
-            temperature=0.1,
-        )
+        started = time.perf_counter()
+        try:
+            with llm_slot():
+                response = _get_client().chat.completions.create(
+                    model=MODEL,
+                    messages=messages,
+                    response_format={"type": "json_object"},
+                    temperature=0.1,
+                )
+        except Exception:
+            record_call("parse_email", time.perf_counter() - started)
+            raise
+        elapsed = time.perf_counter() - started
+        record_call("parse_email", elapsed, response)
+        usage = getattr(response, "usage", None)
+        details = getattr(usage, "prompt_tokens_details", None)
+        _record_call({
+            "latency_ms": round(elapsed * 1000, 1),
+            "estimated_prompt_tokens": PREFIX_TOKENS + estimate_tokens(user_prompt),
+            "prompt_tokens": getattr(usage, "prompt_tokens", None),
+            "cached_tokens": getattr(details, "cached_tokens", None),
+            "completion_tokens": getattr(usage, "completion_tokens", None),
+            "body_chars": len(body or ""),
+            "sent_body_chars": len(cleaned),
+        })
         result = json.loads(response.choices[0].message.content)
 
-        # 언어쌍 매핑
-        src = result.get("source_lang")
-        tgt = result.get("target_lang")
-        if src and tgt:
-            result["language_pair"] = f"{src}-{tgt}"
-        else:
-            result["language_pair"] = None
+        confidence = None
+        if use_rules:
+            result, confidence = _merge(rule_result, rule_confidence, result)
+        _reconcile_urgency(result, confidence, today_date)
+        result = _finish(result, confidence, "rules+llm" if use_rules else "llm")
 
+        if key is not None:
+            _get_cache().set(key, result)
         return result
     except Exception as e:
         return {"error": str(e)}
@@ -0,0 +1,115 @@
+"""
+이메일 전처리 모듈 (Email Preprocess)
+
+GPT로 보내기 전에 이메일 본문에서 요청과 무관한 부분을 걷어냅니다.
+  - 인용된 이전 메일(">" 인용, "-----Original Message-----", "On ... wrote:", "...님이 작성:")
+  - 서명 구분선("-- ") 이후, 모바일 서명("Sent from my iPhone")
+  - 본문 끝의 법적 고지(disclaimer) 문단
+  전달(forward)된 메일은 요청 내용이 전달 부분에 있으므로 지우지 않습니다.
+  - 남은 본문을 토큰 예산(로컬 추정치) 안으로 자르기
+
+고객명은 인사말/맺음말에서 추출하므로 "감사합니다. OOO 드림" 같은 맺음말은 지우지 않습니다.
+"""
+
+import re
+
+MAX_BODY_TOKENS = 1500
+TRUNCATION_MARK = "\n[...]"
+
+# 이 줄부터 아래는 모두 이전 메일 인용으로 보고 잘라낸다.
+_REPLY_HEADER = re.compile(
+    r"^\s*("
+    r"-{2,}\s*(Original Message|원본 메시지)\s*-{2,}"
+    r"|On .+ wrote:"
+    r"|.+님이 작성:"
+    r"|(From|보낸 사람)\s*:.*"
+    r")\s*$",
+    re.IGNORECASE,
+)
+_OUTLOOK_FIELDS = re.compile(r"^\s*(Sent|Date|To|보낸 날짜|받는 사람)\s*:", re.IGNORECASE)
+# 전달(forward)된 메일은 견적 요청 본문이 전달 부분에 있으므로 자르지 않는다.
+_FORWARD_HEADER = re.compile(
+    r"^\s*-{2,}\s*(Forwarded message|전달된 메시지)\s*-{2,}\s*$", re.IGNORECASE,
+)
+_FORWARD_SUBJECT = re.compile(r"^\s*(Subject|제목)\s*:\s*(FW|Fwd|전달)\s*:", re.IGNORECASE)
+_SIGNATURE = re.compile(r"^(-- |--)$|^Sent from my \w+", re.IGNORECASE)
+_DISCLAIMER = re.compile(
+    r"(confidential|privileged).{0,200}(intended|recipient)"
+    r"|본 (메일|이메일|전자우편)은?.{0,100}(기밀|비밀|무단)",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# 토큰 추정: 한중일 문자는 대략 1자당 1토큰, 그 외는 4자당 1토큰
+_CJK = re.compile(r"[\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7a3]")
+
+
+def estimate_tokens(text: str) -> int:
+    cjk = len(_CJK.findall(text))
+    other = len(text) - cjk - text.count(" ")
+    return cjk + (other + 3) // 4
+
+
+def _cut_quoted(lines: list[str]) -> list[str]:
+    kept = []
+    in_signature = False
+    forward_at = None
+    for i, line in enumerate(lines):
+        if _FORWARD_HEADER.match(line):
+            # 전달 구분선 이후는 다시 읽는다 (앞 메일의 서명 건너뛰기도 여기서 끝)
+            in_signature, forward_at = False, i
+            kept.append(line)
+            continue
+        if in_signature:
+            continue
+        if _SIGNATURE.match(line.rstrip("\r")):
+            in_signature = True
+            continue
+        if _REPLY_HEADER.match(line):
+            # "From:"/"보낸 사람:" 단독 줄은 Outlook 인용 헤더(다음 줄들에 Sent/To 등)일 때만 인용으로 본다.
+            # 전달 구분선 바로 아래 헤더나 제목이 FW:/전달:인 Outlook 헤더는 전달된 메일이므로 남긴다.
+            if re.match(r"^\s*(From|보낸 사람)\s*:", line, re.IGNORECASE):
+                header = lines[i + 1:i + 6]
+                if not any(_OUTLOOK_FIELDS.match(nxt) for nxt in header[:3]):
+                    kept.append(line)
+                    continue
+                after_forward = forward_at is not None and i - forward_at <= 2
+                if after_forward or any(_FORWARD_SUBJECT.match(nxt) for nxt in header):
+                    forward_at = i
+                    kept.append(line)
+                    continue
+            return kept
+        kept.append(line)
+    return kept
+
+
+def strip_quoted_and_signature(body: str) -> str:
+    lines = [line for line in body.splitlines() if not line.lstrip().startswith(">")]
+    text = "\n".join(_cut_quoted(lines))
+
+    # 법적 고지는 본문 끝에 붙는 문단만 지운다 (중간 문단은 실제 요청일 수 있음)
+    paragraphs = re.split(r"\n\s*\n", text)
+    while paragraphs and _DISCLAIMER.search(paragraphs[-1]):
+        paragraphs.pop()
+    return "\n\n".join(paragraphs).strip()
+
+
+def truncate_to_tokens(text: str, budget: int = MAX_BODY_TOKENS) -> str:
+    if estimate_tokens(text) <= budget:
+        return text
+
+    kept = []
+    used = estimate_tokens(TRUNCATION_MARK)
+    for line in text.splitlines(keepends=True):
+        cost = estimate_tokens(line)
+        if used + cost > budget:
+            if not kept:
+                # 첫 줄부터 예산 초과: 글자 단위로 자름
+                kept.append(line[:max(budget - used, 0)])
+            break
+        kept.append(line)
+        used += cost
+    return "".join(kept).rstrip() + TRUNCATION_MARK
+
+
+def preprocess_body(body: str, budget: int = MAX_BODY_TOKENS) -> str:
+    return truncate_to_tokens(strip_quoted_and_signature(body or ""), budget)
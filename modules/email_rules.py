@@ -0,0 +1,265 @@
+"""
+이메일 규칙 추출 모듈 (Email Rules)
+
+정형화된 견적 요청 메일("분량은 약 5,000자", "8페이지", "내일 오전까지", "급하게")을
+정규식/키워드로 먼저 해석합니다. 결과 스키마는 LLM 응답(EMAIL_PARSING_SYSTEM)과 같고,
+필드별 신뢰도를 함께 반환합니다.
+  - 분량/단위, 긴급도(+마감일), 언어 방향, 분야, DTP 여부, 고객명
+  - 언어 방향이 단가표에 없는 쌍(en→ja, ko→ko 등)이면 신뢰도를 낮춰 LLM에 넘김
+  - 일정 표현이 전혀 없으면 긴급도는 "normal"로 두되 해석한 것으로 보지 않고 LLM에 넘김
+    ("by end of day"처럼 규칙이 모르는 마감 표현을 일반으로 견적 내지 않도록)
+  - 견적에 필요한 필드(REQUIRED_FIELDS)가 모두 RESOLVED_CONFIDENCE 이상이면 LLM 호출 생략
+  - 해석하지 못한 필드만 email_parser가 LLM 결과로 채움
+"""
+
+import re
+from datetime import date, timedelta
+
+from modules.pricing import get_pricing
+
+RULES_VERSION = "3"
+
+RESOLVED_CONFIDENCE = 0.7
+UNPRICED_PAIR_CONFIDENCE = 0.3
+DEFAULT_URGENCY_CONFIDENCE = 0.5
+REQUIRED_FIELDS = ("source_lang", "target_lang", "volume", "domain", "urgency")
+FIELDS = (
+    "client_name", "source_lang", "target_lang", "volume", "domain",
+    "urgency", "deadline", "dtp_required", "notes",
+)
+
+# ── 분량 ──
+# "5,000자", "약 5천 자", "1.5만자", "8페이지", "3000 words", "A4 3장"
+# "제3자", "제2장" 같은 법률 용어와 "6자리" 같은 표현은 제외한다.
+_VOLUME = re.compile(
+    r"(?<![\d제.,])(\d{1,3}(?:,\d{3})+|\d+(?:\.\d+)?)\s*(만|천)?\s*"
+    r"(글자|자(?!리)|단어|words?|페이지|pages?|쪽|매|장|p(?![a-z]))",
+    re.IGNORECASE,
+)
+_KOREAN_MULTIPLIER = {"만": 10000, "천": 1000}
+_UNITS = {
+    "글자": "chars", "자": "chars",
+    "단어": "words", "word": "words", "words": "words",
+    "페이지": "pages", "page": "pages", "pages": "pages", "쪽": "pages", "매": "pages", "장": "pages", "p": "pages",
+}
+
+# ── 언어 방향 ──
+_LANG_WORDS = {
+    "ko": r"한국어|한글|국문|한국말|korean",
+    "en": r"영어|영문|english",
+    "ja": r"일본어|일어|일문|japanese",
+    "zh": r"중국어|중문|chinese",
+}
+# "영문으로", "영문 번역", "into English" → 도착 언어
+_TARGET = {
+    lang: re.compile(
+        rf"(?:{words})\s*(?:(?:으로|로)(?!\s*(?:된|작성))|번역|버전)|(?:into|to)\s+(?:{words})",
+        re.IGNORECASE,
+    )
+    for lang, words in _LANG_WORDS.items()
+}
+# "영문을", "한글본을", "한글로 된", "from Korean" → 출발 언어
+_SOURCE = {
+    lang: re.compile(
+        rf"(?:{words})\s*(?:본|원문|문서|파일)?\s*(?:을|를|에서)"
+        rf"|(?:{words})\s*(?:으로|로)\s*(?:된|작성)|from\s+(?:{words})",
+        re.IGNORECASE,
+    )
+    for lang, words in _LANG_WORDS.items()
+}
+# "한영", "영한", "ko-en", "Korean to English" 같은 약칭
+_PAIR_SHORTHAND = re.compile(
+    r"(?<![\uac00-\ud7a3])(한영|영한|한일|한중)(?![\uac00-\ud7a3])"
+    r"|\b(ko|en)\s*[-→>]\s*(ko|en|ja|zh)\b",
+    re.IGNORECASE,
+)
+_SHORTHAND_PAIRS = {"한영": ("ko", "en"), "영한": ("en", "ko"), "한일": ("ko", "ja"), "한중": ("ko", "zh")}
+
+# ── 분야 ──
+_DOMAIN_KEYWORDS = {
+    "legal": re.compile(
+        r"계약|법률|법무|소송|판결|특허|약관|변호사|법원|정관|contract|agreement|legal|patent|court|terms of service",
+        re.IGNORECASE,
+    ),
+    "medical": re.compile(
+        r"의료|의학|임상|병원|진단|의약|제약사|제약회사|환자|clinical|medical|pharma|patient",
+        re.IGNORECASE,
+    ),
+    "technical": re.compile(
+        r"기술|매뉴얼|사양서|사용설명서|소프트웨어|엔지니어|\bAPI\b|specification|manual|software|technical",
+        re.IGNORECASE,
+    ),
+    "general": re.compile(
+        r"마케팅|홍보|브로슈어|웹사이트|보도자료|marketing|brochure|website|press release",
+        re.IGNORECASE,
+    ),
+}
+
+# ── 긴급도/마감 (EMAIL_PARSING_SYSTEM의 키워드 규칙과 동일) ──
+_URGENT = re.compile(r"급하게|급히|급한|긴급|내일|오늘|당일|24\s*시간|ASAP|urgent|today|tomorrow", re.IGNORECASE)
+_SEMI_URGENT = re.compile(r"이틀|모레|48\s*시간|2일\s*(?:이내|안에)", re.IGNORECASE)
+_MONTH_DAY = re.compile(r"(\d{1,2})\s*월\s*(\d{1,2})\s*일")
+_ISO_DATE = re.compile(r"\b(20\d{2})-(\d{2})-(\d{2})\b")
+# "12시간 안에", "within 12 hours" → 시간 수로 판단 (24시간 이하 긴급, 48시간 이하 준긴급)
+_WITHIN_HOURS = re.compile(
+    r"(?:within|in|under)\s+(\d{1,3})\s*(?:hours?|hrs?|h)\b"
+    r"|(\d{1,3})\s*시간\s*(?:안에|안으로|이내|내에|내로|내|까지)",
+    re.IGNORECASE,
+)
+_END_OF_DAY = re.compile(
+    r"\bend\s+of\s+(?:the\s+)?(?:business\s+)?day\b|\bEOD\b|\bCOB\b|close\s+of\s+business|금일|퇴근\s*전",
+    re.IGNORECASE,
+)
+# 서두르지 않는다는 명시적 표현 → 일반
+_NOT_URGENT = re.compile(
+    r"다음\s*주|다음\s*달|급하지\s*않|여유|천천히|next\s+(?:week|month)|no\s+rush|not\s+urgent",
+    re.IGNORECASE,
+)
+_RELATIVE_DAYS = {"오늘": 0, "당일": 0, "내일": 1, "모레": 2}
+_RELATIVE_DAY = re.compile("|".join(_RELATIVE_DAYS))
+
+_DTP = re.compile(r"DTP|편집|서식\s*유지|레이아웃|인디자인|InDesign|layout", re.IGNORECASE)
+
+# "안녕하세요, ABC무역 김민수입니다." / "이 변호사입니다." / "김민수 드림"
+_NAME = r"[^\d\s.,!?]+(?: [^\d\s.,!?]+){0,2}?"
+_GREETING_NAME = re.compile(rf"^(?:안녕하세요[.,!]?\s*)?({_NAME})\s*입니다")
+_CLOSING_NAME = re.compile(rf"({_NAME})\s*(?:드림|올림)\s*$", re.MULTILINE)
+
+
+def _extract_volume(text: str) -> tuple[dict | None, float]:
+    found = set()
+    for m in _VOLUME.finditer(text):
+        value = float(m.group(1).replace(",", ""))
+        if m.group(2):
+            value *= _KOREAN_MULTIPLIER[m.group(2)]
+        found.add((int(value) if value.is_integer() else value, _UNITS[m.group(3).lower()]))
+    if not found:
+        return None, 0.0
+    if len(found) > 1:
+        # 서로 다른 분량이 여러 번 나오면(파일별 분량 등) 합산 여부를 판단할 수 없다.
+        value, unit = max(found, key=lambda v: v[0])
+        return {"value": value, "unit": unit}, 0.4
+    value, unit = found.pop()
+    return {"value": value, "unit": unit}, 0.95
+
+
+def _extract_languages(text: str) -> tuple[str | None, str | None, float]:
+    m = _PAIR_SHORTHAND.search(text)
+    if m:
+        if m.group(1):
+            source, target = _SHORTHAND_PAIRS[m.group(1)]
+        else:
+            source, target = m.group(2).lower(), m.group(3).lower()
+        return source, target, 0.95
+
+    targets = [lang for lang, pattern in _TARGET.items() if pattern.search(text)]
+    sources = [lang for lang, pattern in _SOURCE.items() if pattern.search(text)]
+    if len(targets) != 1:
+        return (sources[0] if len(sources) == 1 else None), None, 0.0
+    target = targets[0]
+    sources = [lang for lang in sources if lang != target]
+    if len(sources) == 1:
+        return sources[0], target, 0.9
+    if sources:
+        return None, target, 0.0
+    # 취급 언어쌍은 모두 한국어가 한쪽에 있으므로 도착 언어만으로 출발 언어를 정할 수 있다.
+    # 한국어 도착이면 출발 언어는 영어(en-ko)로 본다.
+    return ("en" if target == "ko" else "ko"), target, 0.8
+
+
+def _extract_domain(text: str) -> tuple[str | None, float]:
+    hits = {domain: len(pattern.findall(text)) for domain, pattern in _DOMAIN_KEYWORDS.items()}
+    ranked = sorted(hits.items(), key=lambda item: item[1], reverse=True)
+    (top, top_hits), (_, second_hits) = ranked[0], ranked[1]
+    if top_hits == 0:
+        return None, 0.0
+    if top_hits == second_hits:
+        return top, 0.4
+    return top, round(0.9 * (top_hits - second_hits) / top_hits + 0.05, 4)
+
+
+def _extract_urgency(text: str, today: date) -> tuple[str, str | None, float]:
+    deadline = None
+    m = _ISO_DATE.search(text)
+    if m:
+        try:
+            deadline = date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+        except ValueError:
+            deadline = None
+        if deadline is not None and deadline < today:
+            deadline = None  # 인용된 이전 메일 날짜 등
+    else:
+        m = _MONTH_DAY.search(text)
+        if m:
+            try:
+                deadline = date(today.year, int(m.group(1)), int(m.group(2)))
+            except ValueError:
+                deadline = None
+            if deadline is not None and deadline < today:
+                deadline = deadline.replace(year=today.year + 1)
+        else:
+            m = _RELATIVE_DAY.search(text)
+            if m:
+                deadline = today + timedelta(days=_RELATIVE_DAYS[m.group(0)])
+
+    if deadline is not None:
+        days = (deadline - today).days
+        urgency = "urgent" if days <= 1 else "semi_urgent" if days <= 2 else "normal"
+        return urgency, deadline.isoformat(), 0.9
+
+    m = _WITHIN_HOURS.search(text)
+    if m:
+        hours = int(m.group(1) or m.group(2))
+        urgency = "urgent" if hours <= 24 else "semi_urgent" if hours <= 48 else "normal"
+        return urgency, None, 0.9
+    if _END_OF_DAY.search(text):
+        return "urgent", today.isoformat(), 0.9
+    if _URGENT.search(text):
+        return "urgent", None, 0.9
+    if _SEMI_URGENT.search(text):
+        return "semi_urgent", None, 0.85
+    if _NOT_URGENT.search(text):
+        return "normal", None, 0.85
+    # 일정 표현이 없으면 일반이 기본값이지만 근거가 없으므로 확정하지 않는다 (LLM이 다시 판단).
+    return "normal", None, DEFAULT_URGENCY_CONFIDENCE
+
+
+def _extract_client_name(body: str) -> tuple[str | None, float]:
+    head = body.lstrip().split("\n", 2)[:2]
+    for line in head:
+        m = _GREETING_NAME.match(line.strip())
+        if m:
+            return m.group(1).strip(), 0.6
+    m = _CLOSING_NAME.search(body)
+    if m:
+        return m.group(1).strip(), 0.8
+    return None, 0.0
+
+
+def extract_fields(subject: str, body: str, today: date | None = None) -> tuple[dict, dict]:
+    """(LLM 스키마와 같은 결과, 필드별 신뢰도)를 반환한다. 해석하지 못한 필드는 None / 0.0."""
+    today = today or date.today()
+    text = f"{subject or ''}\n{body or ''}"
+
+    result = dict.fromkeys(FIELDS)
+    confidence = dict.fromkeys(FIELDS, 0.0)
+
+    result["volume"], confidence["volume"] = _extract_volume(text)
+    source, target, lang_confidence = _extract_languages(text)
+    if source and target and f"{source}-{target}" not in get_pricing().language_pairs:
+        # 견적을 낼 수 없는 쌍: 오인식일 수 있으므로 규칙으로 확정하지 않는다
+        lang_confidence = min(lang_confidence, UNPRICED_PAIR_CONFIDENCE)
+    result["source_lang"], result["target_lang"] = source, target
+    confidence["source_lang"] = lang_confidence if source else 0.0
+    confidence["target_lang"] = lang_confidence if target else 0.0
+    result["domain"], confidence["domain"] = _extract_domain(text)
+    result["urgency"], result["deadline"], confidence["urgency"] = _extract_urgency(text, today)
+    confidence["deadline"] = confidence["urgency"] if result["deadline"] else 0.0
+    if _DTP.search(text):
+        result["dtp_required"], confidence["dtp_required"] = True, 0.9
+    result["client_name"], confidence["client_name"] = _extract_client_name(body or "")
+    return result, confidence
+
+
+def unresolved_fields(confidence: dict) -> list[str]:
+    return [field for field in REQUIRED_FIELDS if confidence[field] < RESOLVED_CONFIDENCE]
@@ -10,110 +10,492 @@ TODO [프로덕션 전환 시]
   - OpenAI-compatible API이므로 base_url만 변경하면 됨
 """
 
+import asyncio
+import hashlib
+import io
 import json
+import multiprocessing
 import os
+import tempfile
+import time
+from collections import Counter, deque
+from collections.abc import AsyncIterator, Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
-from openai import OpenAI
-from langdetect import detect
+from openai import AsyncOpenAI, OpenAI
 
 from config.prompts import FILE_ANALYSIS_SYSTEM, FILE_ANALYSIS_USER
+from modules.cache import CACHE_DIR, DiskCache
+from modules.lang_detector import detect_language, normalize_lang
+from modules import metrics
+from modules.llm_client import async_llm_slot, get_async_client, get_client, llm_slot, record_call
+from modules.quote_calculator import convert_volume
+from modules.volume_counter import VolumeCounter
 
-# TODO [프로덕션]: base_url="http://localhost:11434/v1"
+# TODO [프로덕션]: LLM_BASE_URL="http://localhost:11434/v1" (modules/llm_client 참고)
 MODEL = "gpt-4o-mini"
 
+# 프롬프트가 바뀌면 캐시 키도 바뀌도록 프롬프트 본문 해시를 버전으로 사용
+PROMPT_VERSION = hashlib.sha256(
+    (FILE_ANALYSIS_SYSTEM + FILE_ANALYSIS_USER).encode("utf-8")
+).hexdigest()[:12]
+
+# 분석 결과 스키마/값이 바뀌면 올린다 (이전 버전으로 만든 캐시 항목을 재사용하지 않도록 캐시 키에 포함)
+#   2: script_ratios 추가
+#   3: detected_lang을 단가표 언어 코드로 정규화 (zh-cn → zh 등)
+ANALYZER_VERSION = "3"
+
+# 분석 결과 캐시: 같은 파일 재업로드/Streamlit rerun 시 추출·langdetect·GPT 호출 생략
+CACHE_MAX_ENTRIES = 2000
+CACHE_MAX_BYTES = 20 * 1024 * 1024
+CACHE_TTL = 30 * 24 * 3600
+
+_cache: DiskCache | None = None
+
+# PDF 페이지 병렬 추출: 이 페이지 수 이상이면 페이지 구간을 프로세스 풀로 분산
+PARALLEL_MIN_PAGES = 32
+PAGES_PER_TASK = 16
+# analyze_domain에 넘기는 샘플 길이 / 언어 감지 샘플 길이
+DOMAIN_SAMPLE_CHARS = 500
+DETECT_SAMPLE_CHARS = 1000
+
+# 여러 파일 동시 분석 시 GPT 동시 호출 수 상한
+MAX_CONCURRENT_REQUESTS = 8
+
+_process_pool: ProcessPoolExecutor | None = None
+_thread_pool: ThreadPoolExecutor | None = None
+
 
 def _get_client() -> OpenAI:
-    # Lazy init: OpenAI()를 모듈 import 시점이 아닌 실제 API 호출 시점에 생성.
+    # Lazy init: 클라이언트는 모듈 import 시점이 아닌 첫 API 호출 시점에 생성된다.
     # 이렇게 하면 OPENAI_API_KEY가 없어도 모듈 import가 실패하지 않고,
     # 파일 분석 기능을 사용하지 않는 경우(직접 입력 등) 정상 동작한다.
-    return OpenAI()
+    # 생성된 클라이언트는 llm_client에서 프로세스 전체가 공유(연결 풀 재사용).
+    return get_client()
 
 
-def extract_text(file_bytes: bytes, filename: str) -> str:
+def _get_async_client() -> AsyncOpenAI:
+    return get_async_client()
+
+
+def _get_cache() -> DiskCache:
+    # 클라이언트와 같은 이유로 지연 생성: import만으로 디스크에 파일을 만들지 않는다.
+    global _cache
+    if _cache is None:
+        _cache = DiskCache(
+            CACHE_DIR / "file_analysis.sqlite3",
+            max_entries=CACHE_MAX_ENTRIES,
+            max_bytes=CACHE_MAX_BYTES,
+            ttl=CACHE_TTL,
+        )
+    return _cache
+
+
+def cache_key(file_bytes: bytes, filename: str) -> str:
+    digest = hashlib.sha256(file_bytes).hexdigest()
     suffix = Path(filename).suffix.lower()
+    return f"{digest}:{suffix}:{MODEL}:{PROMPT_VERSION}:{ANALYZER_VERSION}"
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        # Streamlit 서버는 멀티스레드이므로 fork 대신 spawn으로 워커 생성
+        _process_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count() or 1,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _process_pool
+
+
+def _get_thread_pool() -> ThreadPoolExecutor:
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="file-analyzer")
+    return _thread_pool
+
+
+def _pdf_page_texts(pdf_path: str, start: int, stop: int) -> list[str]:
+    # 프로세스 풀 작업 단위: [start, stop) 페이지의 텍스트 (빈 페이지는 "")
+    import pdfplumber
+    with pdfplumber.open(pdf_path, pages=list(range(start + 1, stop + 1))) as pdf:
+        texts = []
+        for page in pdf.pages:
+            texts.append(page.extract_text() or "")
+            page.close()
+        return texts
+
+
+def _iter_pdf_pages(file_bytes: bytes, parallel: bool = True) -> Iterator[str]:
+    import pdfplumber
+    with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
+        n_pages = len(pdf.pages)
+        if not parallel or n_pages < PARALLEL_MIN_PAGES:
+            for page in pdf.pages:
+                yield page.extract_text() or ""
+                page.close()
+            return
+
+    # 작업마다 PDF 바이트를 직렬화하지 않도록 임시 파일 경로만 워커에 전달
+    with tempfile.NamedTemporaryFile(suffix=".pdf") as tmp:
+        tmp.write(file_bytes)
+        tmp.flush()
+        pool = _get_process_pool()
+        ranges = iter(range(0, n_pages, PAGES_PER_TASK))
+        in_flight = 2 * (os.cpu_count() or 1)
+        pending = deque()
+
+        def submit_next() -> None:
+            start = next(ranges, None)
+            if start is not None:
+                stop = min(start + PAGES_PER_TASK, n_pages)
+                pending.append(pool.submit(_pdf_page_texts, tmp.name, start, stop))
 
-    if suffix == ".txt":
-        return file_bytes.decode("utf-8", errors="replace")
+        for _ in range(in_flight):
+            submit_next()
+        try:
+            while pending:
+                texts = pending.popleft().result()
+                submit_next()
+                yield from texts
+        finally:
+            for future in pending:
+                future.cancel()
 
+
+def iter_text(file_bytes: bytes, filename: str, parallel: bool = True) -> Iterator[str]:
+    """텍스트를 조각(페이지/문단 묶음) 단위로 내보낸다. "".join(...)은 extract_text()와 같다."""
+    suffix = Path(filename).suffix.lower()
+    # 추출에 쓴 시간만 기록 (조각을 받아 분량을 세는 시간은 제외)
+    return metrics.timed_iter(
+        _iter_text(file_bytes, suffix, parallel), metrics.STAGE_SECONDS, stage="extract_text", format=_format(suffix)
+    )
+
+
+def _format(suffix: str) -> str:
+    # 지표 라벨: 알 수 없는 확장자는 텍스트로 읽으므로 txt
+    return suffix[1:] if suffix in (".docx", ".pdf") else "txt"
+
+
+def _iter_text(file_bytes: bytes, suffix: str, parallel: bool) -> Iterator[str]:
     if suffix == ".docx":
-        import io
         from docx import Document
         doc = Document(io.BytesIO(file_bytes))
-        return "\n".join(p.text for p in doc.paragraphs)
+        first = True
+        for p in doc.paragraphs:
+            yield p.text if first else "\n" + p.text
+            first = False
+        return
 
     if suffix == ".pdf":
-        import io
-        import pdfplumber
-        text_parts = []
-        with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_parts.append(page_text)
-        return "\n".join(text_parts)
+        first = True
+        for page_text in _iter_pdf_pages(file_bytes, parallel):
+            if page_text:
+                yield page_text if first else "\n" + page_text
+                first = False
+        return
+
+    yield file_bytes.decode("utf-8", errors="replace")
+
 
-    return file_bytes.decode("utf-8", errors="replace")
+def extract_text(file_bytes: bytes, filename: str) -> str:
+    return "".join(iter_text(file_bytes, filename))
 
 
+@metrics.timed(metrics.STAGE_SECONDS, stage="count_volume")
 def count_volume(text: str) -> dict:
-    char_count = len(text.replace(" ", "").replace("\n", ""))
-    word_count = len(text.split())
+    counter = VolumeCounter(sample_chars=DETECT_SAMPLE_CHARS)
+    counter.feed(text)
+    return _volume_from_counter(counter)
+
+
+def _volume_from_counter(counter: VolumeCounter) -> dict:
+    # 한중일 문자 체계면 글자수 기준, 아니면 단어수 기준
+    lang, _ = detect_language(counter=counter)
 
-    # 한국어 비중이 높으면 글자수 기준, 아니면 단어수 기준
+    if lang in ("ko", "ja", "zh"):
+        return {"value": counter.char_count, "unit": "chars", "detected_lang": lang}
+    else:
+        return {"value": counter.word_count, "unit": "words", "detected_lang": lang}
+
+
+def _domain_messages(text: str) -> list[dict]:
+    sample = text[:DOMAIN_SAMPLE_CHARS]
+    return [
+        {"role": "system", "content": FILE_ANALYSIS_SYSTEM},
+        {"role": "user", "content": FILE_ANALYSIS_USER.format(text_sample=sample)},
+    ]
+
+
+def _request_domain(text: str) -> dict:
+    started = time.perf_counter()
     try:
-        lang = detect(text[:1000]) if len(text) > 0 else "ko"
+        with llm_slot():
+            response = _get_client().chat.completions.create(
+                model=MODEL,
+                messages=_domain_messages(text),
+                response_format={"type": "json_object"},
+                temperature=0.1,
+            )
     except Exception:
-        lang = "ko"
+        record_call("analyze_domain", time.perf_counter() - started)
+        raise
+    record_call("analyze_domain", time.perf_counter() - started, response)
+    return json.loads(response.choices[0].message.content)
 
-    if lang in ("ko", "ja", "zh-cn", "zh-tw"):
-        return {"value": char_count, "unit": "chars", "detected_lang": lang}
-    else:
-        return {"value": word_count, "unit": "words", "detected_lang": lang}
+
+async def _request_domain_async(text: str) -> dict:
+    started = time.perf_counter()
+    try:
+        async with async_llm_slot():
+            response = await _get_async_client().chat.completions.create(
+                model=MODEL,
+                messages=_domain_messages(text),
+                response_format={"type": "json_object"},
+                temperature=0.1,
+            )
+    except Exception:
+        record_call("analyze_domain", time.perf_counter() - started)
+        raise
+    record_call("analyze_domain", time.perf_counter() - started, response)
+    return json.loads(response.choices[0].message.content)
+
+
+def _fallback_domain(error: Exception) -> dict:
+    return {
+        "domain": "general",
+        "source_lang": "ko",
+        "confidence": 0.0,
+        "reasoning": f"API error, defaulting to general: {error}",
+    }
 
 
 def analyze_domain(text: str) -> dict:
-    sample = text[:500]
     try:
-        response = _get_client().chat.completions.create(
-            model=MODEL,
-            messages=[
-                {"role": "system", "content": FILE_ANALYSIS_SYSTEM},
-                {"role": "user", "content": FILE_ANALYSIS_USER.format(text_sample=sample)},
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.1,
-        )
-        return json.loads(response.choices[0].message.content)
+        return _request_domain(text)
+    except Exception as e:
+        return _fallback_domain(e)
+
+
+def analyze_file(file_bytes: bytes, filename: str, use_cache: bool = True) -> dict:
+    key = cache_key(file_bytes, filename) if use_cache else None
+    if key is not None:
+        cached = _get_cache().get(key)
+        if cached is not None:
+            return cached
+
+    # 텍스트를 조각 단위로 VolumeCounter에 흘려보내 한 번의 순회로 분량을 센다(전체 문자열 미생성).
+    # 앞부분 샘플이 모이면 추출이 끝나기 전에 분야 분석(GPT)을 먼저 시작한다.
+    counter = VolumeCounter(sample_chars=DETECT_SAMPLE_CHARS)
+    counting = metrics.Stopwatch(metrics.STAGE_SECONDS, stage="count_volume")
+    domain_future = None
+    for chunk in iter_text(file_bytes, filename):
+        with counting:
+            counter.feed(chunk)
+        if domain_future is None and len(counter.sample) >= DOMAIN_SAMPLE_CHARS:
+            domain_future = _get_thread_pool().submit(_request_domain, counter.sample)
+
+    if not counter.has_text:
+        return _empty_result()
+
+    if domain_future is None:
+        domain_future = _get_thread_pool().submit(_request_domain, counter.sample)
+    with counting:
+        stats = _counter_stats(counter)
+    counting.record()
+    try:
+        domain_analysis = domain_future.result()
+        cacheable = True
     except Exception as e:
-        return {
-            "domain": "general",
-            "source_lang": "ko",
-            "confidence": 0.0,
-            "reasoning": f"API error, defaulting to general: {e}",
-        }
-
-
-def analyze_file(file_bytes: bytes, filename: str) -> dict:
-    text = extract_text(file_bytes, filename)
-    if not text.strip():
-        return {
-            "error": "텍스트를 추출할 수 없습니다.",
-            "volume": None,
-            "domain_analysis": None,
-        }
-
-    volume = count_volume(text)
-    domain_analysis = analyze_domain(text)
-
-    # 언어 코드 정규화
-    lang_map = {"ko": "ko", "en": "en", "ja": "ja", "zh-cn": "zh", "zh-tw": "zh"}
-    detected_lang = lang_map.get(volume["detected_lang"], "ko")
+        # API 실패 시 기본값으로 진행하되, 기본값은 캐시하지 않아 다음 업로드에서 재시도
+        domain_analysis = _fallback_domain(e)
+        cacheable = False
+
+    result = _compose_result(stats, domain_analysis)
+    if key is not None and cacheable:
+        _get_cache().set(key, result)
+    return result
+
+
+def _empty_result() -> dict:
+    return {
+        "error": "텍스트를 추출할 수 없습니다.",
+        "volume": None,
+        "domain_analysis": None,
+    }
+
+
+def _counter_stats(counter: VolumeCounter) -> dict:
+    return {
+        "volume": _volume_from_counter(counter),
+        "char_count": counter.char_count,
+        "word_count": counter.word_count,
+        "script_ratios": counter.script_ratios,
+        "sample": counter.sample,
+    }
 
+
+def _compose_result(stats: dict, domain_analysis: dict) -> dict:
+    volume = stats["volume"]
     return {
         "volume": volume,
         "domain_analysis": domain_analysis,
-        "detected_lang": detected_lang,
-        "char_count": len(text.replace(" ", "").replace("\n", "")),
-        "word_count": len(text.split()),
+        "detected_lang": normalize_lang(volume["detected_lang"]),
+        "char_count": stats["char_count"],
+        "word_count": stats["word_count"],
+        "script_ratios": stats["script_ratios"],
+    }
+
+
+# ── 여러 파일 동시 분석 (asyncio) ──
+# 텍스트 추출(CPU)은 프로세스 풀에서, 분야 분석(GPT I/O)은 AsyncOpenAI로 동시에 진행한다.
+# 폴더 전체 소요 시간이 파일별 시간의 합이 아니라 가장 느린 파일 하나에 가까워진다.
+
+def _extract_stats(file_bytes: bytes, filename: str) -> dict | None:
+    # 프로세스 풀 작업 단위. 워커 안에서 다시 풀을 만들지 않도록 parallel=False.
+    # 단계별 시간은 워커에서 기록하면 사라지므로 Stopwatch째 돌려보내 부모가 기록한다.
+    suffix = Path(filename).suffix.lower()
+    extracting = metrics.Stopwatch(metrics.STAGE_SECONDS, stage="extract_text", format=_format(suffix))
+    counting = metrics.Stopwatch(metrics.STAGE_SECONDS, stage="count_volume")
+    counter = VolumeCounter(sample_chars=DETECT_SAMPLE_CHARS)
+    for chunk in extracting.iterate(_iter_text(file_bytes, suffix, parallel=False)):
+        with counting:
+            counter.feed(chunk)
+    if not counter.has_text:
+        return None
+    with counting:
+        stats = _counter_stats(counter)
+    stats["stopwatches"] = [extracting, counting]
+    return stats
+
+
+async def _analyze_one(
+    filename: str,
+    file_bytes: bytes,
+    executor: Executor,
+    semaphore: asyncio.Semaphore,
+    use_cache: bool,
+) -> dict:
+    key = cache_key(file_bytes, filename) if use_cache else None
+    if key is not None:
+        cached = _get_cache().get(key)
+        if cached is not None:
+            return cached
+
+    loop = asyncio.get_running_loop()
+    stats = await loop.run_in_executor(executor, _extract_stats, file_bytes, filename)
+    if stats is None:
+        return _empty_result()
+    for stopwatch in stats.pop("stopwatches"):
+        stopwatch.record()
+
+    try:
+        async with semaphore:
+            domain_analysis = await _request_domain_async(stats["sample"])
+        cacheable = True
+    except Exception as e:
+        domain_analysis = _fallback_domain(e)
+        cacheable = False
+
+    result = _compose_result(stats, domain_analysis)
+    if key is not None and cacheable:
+        _get_cache().set(key, result)
+    return result
+
+
+async def analyze_files(
+    files: Iterable[tuple[str, bytes]],
+    max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+    use_cache: bool = True,
+    executor: Executor | None = None,
+) -> AsyncIterator[dict]:
+    """(파일명, 바이트) 목록을 동시에 분석한다.
+
+    끝나는 순서대로 {"type": "file", "index", "filename", "result"}를 내보내고 (index는 입력 순서,
+    같은 파일명이 여러 번 올 수 있으므로 결과를 맞출 때는 index를 쓴다),
+    마지막에 {"type": "summary", "summary"}로 프로젝트 전체 분량/분야 요약을 내보낸다.
+    """
+    executor = executor or _get_process_pool()
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(index: int, filename: str, file_bytes: bytes) -> tuple[int, str, dict]:
+        try:
+            result = await _analyze_one(filename, file_bytes, executor, semaphore, use_cache)
+        except Exception as e:
+            result = {"error": f"분석 실패: {e}", "volume": None, "domain_analysis": None}
+        return index, filename, result
+
+    tasks = [asyncio.create_task(run(i, name, data)) for i, (name, data) in enumerate(files)]
+    results = []
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            index, filename, result = await next_done
+            results.append((filename, result))
+            yield {"type": "file", "index": index, "filename": filename, "result": result}
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    yield {"type": "summary", "summary": summarize_analyses(results)}
+
+
+def analyze_batch(
+    files: list[tuple[str, bytes]],
+    use_cache: bool = True,
+    executor: Executor | None = None,
+) -> dict:
+    """함께 올린 파일들을 analyze_files로 한 번에 분석한다 (동기 호출, 백그라운드 작업 하나 단위).
+
+    {"files": 입력 순서의 [{"filename", "result"}], "summary": summarize_analyses 결과}.
+    """
+    async def collect() -> dict:
+        results = [None] * len(files)
+        summary = None
+        async for event in analyze_files(files, use_cache=use_cache, executor=executor):
+            if event["type"] == "file":
+                results[event["index"]] = {"filename": event["filename"], "result": event["result"]}
+            else:
+                summary = event["summary"]
+        return {"files": results, "summary": summary}
+
+    return asyncio.run(collect())
+
+
+def summarize_analyses(results: list[tuple[str, dict]]) -> dict:
+    volume_by_unit = Counter()
+    domain_chars = Counter()
+    languages = Counter()
+    failed = []
+    for filename, result in results:
+        if result.get("error"):
+            failed.append(filename)
+            continue
+        volume = result["volume"]
+        volume_by_unit[volume["unit"]] += volume["value"]
+        domain_chars[result["domain_analysis"].get("domain", "general")] += result["char_count"]
+        languages[result["detected_lang"]] += 1
+
+    # 견적 폼에 넣을 전체 분량: 단위가 하나면 그대로 합계, 섞여 있으면 글자 수로 환산해 합산
+    if len(volume_by_unit) == 1:
+        [(unit, value)] = volume_by_unit.items()
+        total_volume = {"value": value, "unit": unit}
+    elif volume_by_unit:
+        total_volume = {"value": sum(convert_volume(v, u) for u, v in volume_by_unit.items()), "unit": "chars"}
+    else:
+        total_volume = None
+
+    return {
+        "file_count": len(results),
+        "analyzed_count": len(results) - len(failed),
+        "failed": failed,
+        "volume_by_unit": dict(volume_by_unit),
+        "total_volume": total_volume,
+        "char_count": sum(r.get("char_count", 0) for _, r in results),
+        "word_count": sum(r.get("word_count", 0) for _, r in results),
+        # 글자 수 가중 최다 분야
+        "domain": domain_chars.most_common(1)[0][0] if domain_chars else None,
+        "domain_char_counts": dict(domain_chars),
+        "languages": dict(languages),
+        "language": languages.most_common(1)[0][0] if languages else None,
     }
@@ -0,0 +1,163 @@
+"""
+백그라운드 작업 모듈 (Background Jobs)
+
+파일 분석·이메일 파싱처럼 GPT 왕복이 있는 작업을 스레드 풀에서 실행하고 작업 ID로 상태를 조회합니다.
+  - Streamlit 스크립트 스레드는 제출만 하고 바로 반환 → 화면은 st.fragment(run_every)로 완료를 폴링
+  - 사용자(세션)별 동시 작업 수 제한: JOB_LIMIT_PER_OWNER개가 실행/대기 중이면 JobLimitError
+  - 취소: 대기 중이면 실행하지 않고, 실행 중이면 끝난 뒤 결과를 버림 (진행 중인 API 호출은 끊을 수 없음)
+  - 끝난 작업은 JOB_TTL초 동안 보관 후 다음 제출 때 정리
+
+작업 자체는 대부분 API 응답 대기(I/O)라 스레드 풀로 충분합니다.
+큰 PDF 추출은 analyze_file이 내부적으로 프로세스 풀에 나눠 맡깁니다.
+"""
+
+import atexit
+import os
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "8"))
+JOB_LIMIT_PER_OWNER = int(os.environ.get("JOB_LIMIT_PER_OWNER", "3"))
+JOB_TTL = 3600
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = frozenset({DONE, FAILED, CANCELLED})
+
+
+class JobLimitError(RuntimeError):
+    """사용자별 동시 작업 수 초과."""
+
+
+@dataclass
+class Job:
+    id: str
+    owner: str
+    kind: str
+    label: str = ""
+    meta: dict = field(default_factory=dict)
+    status: str = QUEUED
+    result: Any = None
+    error: str | None = None
+    created: float = field(default_factory=time.time)
+    started: float | None = None
+    finished: float | None = None
+    future: Future | None = field(default=None, repr=False)
+
+    @property
+    def active(self) -> bool:
+        return self.status not in FINISHED
+
+
+class JobManager:
+    def __init__(
+        self,
+        max_workers: int = JOB_WORKERS,
+        limit_per_owner: int = JOB_LIMIT_PER_OWNER,
+        ttl: float = JOB_TTL,
+    ):
+        if limit_per_owner < 1:
+            raise ValueError("limit_per_owner must be at least 1")
+        self.limit_per_owner = limit_per_owner
+        self.ttl = ttl
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs: dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.ttl
+        for job_id in [j.id for j in self._jobs.values() if j.finished is not None and j.finished < cutoff]:
+            del self._jobs[job_id]
+
+    def _busy(self, owner: str) -> int:
+        # 취소됐어도 아직 실행 중인 작업은 스레드를 쓰고 있으므로 센다
+        return sum(1 for j in self._jobs.values() if j.owner == owner and not j.future.done())
+
+    def submit(
+        self,
+        owner: str,
+        kind: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        label: str = "",
+        meta: dict | None = None,
+    ) -> str:
+        """fn(*args)를 풀에 넣고 작업 ID를 돌려준다."""
+        with self._lock:
+            self._prune()
+            if self._busy(owner) >= self.limit_per_owner:
+                raise JobLimitError(f"동시에 실행할 수 있는 작업은 {self.limit_per_owner}개까지입니다.")
+            job = Job(uuid.uuid4().hex, owner, kind, label, meta or {})
+            self._jobs[job.id] = job
+            job.future = self._pool.submit(self._run, job, fn, args)
+        return job.id
+
+    def _run(self, job: Job, fn: Callable[..., Any], args: tuple) -> None:
+        with self._lock:
+            if job.status == CANCELLED:
+                return
+            job.status = RUNNING
+            job.started = time.time()
+        try:
+            result, error = fn(*args), None
+        except Exception as e:
+            result, error = None, str(e) or type(e).__name__
+        with self._lock:
+            if job.status == CANCELLED:
+                return  # 실행 중 취소됨 → 결과 버림
+            job.result = result
+            job.error = error
+            job.status = FAILED if error is not None else DONE
+            job.finished = time.time()
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self, owner: str) -> list[Job]:
+        with self._lock:
+            return sorted((j for j in self._jobs.values() if j.owner == owner), key=lambda j: j.created)
+
+    def cancel(self, job_id: str) -> bool:
+        """끝나지 않은 작업을 취소한다. 이미 끝났거나 없는 작업이면 False."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or not job.active:
+                return False
+            job.status = CANCELLED
+            job.finished = time.time()
+            job.future.cancel()  # 대기 중일 때만 효과 있음
+            return True
+
+    def forget(self, job_id: str) -> None:
+        """끝난 작업 기록을 지운다 (실행/대기 중이면 그대로 둠)."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and not job.active:
+                del self._jobs[job_id]
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+_manager: JobManager | None = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """프로세스 전체가 공유하는 작업 관리자 (모든 Streamlit 세션이 같은 풀 사용)."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = JobManager()
+                atexit.register(_manager.shutdown)
+    return _manager
@@ -0,0 +1,104 @@
+"""
+언어 감지 모듈 (Language Detector)
+
+과금 단위(글자/단어)를 정하는 데 필요한 것은 문자 체계이므로,
+langdetect 대신 유니코드 범위 히스토그램으로 ko / ja / zh / en을 구분합니다.
+  - 한글 → ko, 가나(+한자) → ja, 가나 없는 한자 → zh
+  - 라틴 문자 → 영어 고빈도 단어 표 적중률로 en 여부 판단
+  - 판단 신뢰도가 낮을 때만 langdetect로 폴백 (지연 import, seed 고정으로 결정적 결과)
+"""
+
+import re
+
+from modules import metrics
+from modules.volume_counter import SCRIPTS, VolumeCounter
+
+CONFIDENCE_THRESHOLD = 0.6
+
+# 라틴 문자 1자의 가중치. 한중일 문자 1자가 담는 정보량이 라틴 2자 정도이므로
+# 한국어 문서에 섞인 영문 용어가 비중을 과대 차지하지 않도록 보정한다.
+LATIN_WEIGHT = 0.5
+
+# 가나가 CJK 문자 중 이 비율 이상이면 일본어(한자 포함)로 판단
+KANA_SHARE_FOR_JA = 0.2
+
+# 영어 고빈도 단어(unigram) 표. 라틴 단어 중 이 표에 속하는 비율로 영어 여부를 판단한다.
+# 영어 일반/법률 문서는 보통 30~50%, 프랑스어·독일어·스페인어는 10% 미만.
+_EN_COMMON_WORDS = frozenset("""
+a about after all also an and any are as at be been before but by can could do each for from
+had has have he her his if in into is it its may more must no not of on or other our shall
+should such than that the their them then there these they this those to under upon was we
+were when which while who will with within would you your
+""".split())
+EN_WORD_SHARE_FULL = 0.2
+
+_LATIN_WORD = re.compile(r"[A-Za-z]+")
+
+_LANG_MAP = {"ko": "ko", "en": "en", "ja": "ja", "zh": "zh", "zh-cn": "zh", "zh-tw": "zh"}
+
+_langdetect_ready = False
+
+
+def normalize_lang(code: str | None) -> str:
+    """감지 코드 → 언어쌍에 쓰는 코드(ko/en/ja/zh). 그 외는 ko."""
+    return _LANG_MAP.get(code, "ko")
+
+
+def _english_share(sample: str) -> float:
+    words = _LATIN_WORD.findall(sample)
+    if not words:
+        return 0.0
+    hits = sum(1 for w in words if w.lower() in _EN_COMMON_WORDS)
+    return hits / len(words)
+
+
+def score_scripts(script_counts: list[int], sample: str) -> tuple[str, float]:
+    """문자 체계별 글자 수와 샘플로 (언어, 신뢰도)를 계산한다."""
+    counts = dict(zip(SCRIPTS, script_counts))
+    hangul, kana, han = counts["hangul"], counts["kana"], counts["han"]
+    latin = counts["latin"] * LATIN_WEIGHT
+    letters = hangul + kana + han + latin
+    if letters == 0:
+        return "ko", 0.0
+
+    if kana and kana / (kana + han) >= KANA_SHARE_FOR_JA:
+        scores = {"ko": hangul, "ja": kana + han, "en": latin}
+    else:
+        scores = {"ko": hangul, "zh": han, "ja": kana, "en": latin}
+
+    lang = max(scores, key=scores.get)
+    confidence = scores[lang] / letters
+    if lang == "en":
+        confidence *= min(_english_share(sample) / EN_WORD_SHARE_FULL, 1.0)
+    return lang, round(confidence, 4)
+
+
+@metrics.timed(metrics.STAGE_SECONDS, stage="langdetect")
+def _langdetect(sample: str) -> str:
+    global _langdetect_ready
+    from langdetect import DetectorFactory, detect
+
+    if not _langdetect_ready:
+        DetectorFactory.seed = 0
+        _langdetect_ready = True
+    return detect(sample)
+
+
+@metrics.timed(metrics.STAGE_SECONDS, stage="detect_language")
+def detect_language(text: str = "", counter: VolumeCounter | None = None) -> tuple[str, float]:
+    """(언어 코드, 신뢰도)를 반환한다. counter가 있으면 누적된 문자 체계 통계와 샘플을 사용한다."""
+    if counter is None:
+        counter = VolumeCounter()
+        counter.feed(text)
+
+    lang, confidence = score_scripts(counter.script_counts, counter.sample)
+    if confidence >= CONFIDENCE_THRESHOLD:
+        return lang, confidence
+
+    if not counter.sample:
+        return "ko", 0.0
+    try:
+        fallback = _langdetect(counter.sample)
+    except Exception:
+        return lang if confidence > 0 else "ko", confidence
+    return _LANG_MAP.get(fallback, fallback), confidence
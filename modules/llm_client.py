@@ -0,0 +1,120 @@
+"""
+LLM 클라이언트 모듈 (LLM Client)
+
+file_analyzer / email_parser가 공유하는 OpenAI 호환 클라이언트를 제공합니다.
+  - base_url별로 프로세스당 클라이언트 1개를 지연 생성 → HTTP keep-alive 연결 풀 재사용
+  - 타임아웃, 재시도 횟수(SDK의 지수 백오프, Retry-After 준수)를 환경 변수로 설정
+  - 동시 호출 수 상한: llm_slot() / async_llm_slot()
+  - 호출 지연/결과/토큰 수 지표: record_call() (modules/metrics)
+
+TODO [프로덕션]: LLM_BASE_URL=http://localhost:11434/v1 (Ollama, OpenAI-compatible API)
+
+환경 변수는 import 시 한 번만 읽고, 클라이언트는 첫 API 호출 시점에 생성하므로
+OPENAI_API_KEY 없이도 모듈 import는 항상 성공합니다 (README Issue #2).
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+
+from openai import AsyncOpenAI, OpenAI, Timeout
+
+from modules import metrics
+
+LLM_BASE_URL = os.environ.get("LLM_BASE_URL") or None
+LLM_TIMEOUT = float(os.environ.get("LLM_TIMEOUT", "30"))
+LLM_CONNECT_TIMEOUT = float(os.environ.get("LLM_CONNECT_TIMEOUT", "5"))
+LLM_MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", "2"))
+LLM_MAX_CONCURRENCY = int(os.environ.get("LLM_MAX_CONCURRENCY", "16"))
+
+# 로컬 서버(Ollama 등)는 키를 검사하지 않지만 SDK는 키 값을 요구한다.
+_LOCAL_API_KEY = "local"
+
+_lock = threading.Lock()
+_clients: dict[str | None, OpenAI] = {}
+# AsyncOpenAI의 연결 풀은 이벤트 루프에 묶이므로 루프별로 보관
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = weakref.WeakKeyDictionary()
+_async_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+_semaphore = threading.BoundedSemaphore(LLM_MAX_CONCURRENCY)
+
+
+def _client_kwargs(base_url: str | None) -> dict:
+    kwargs = {
+        "timeout": Timeout(LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+        "max_retries": LLM_MAX_RETRIES,
+    }
+    if base_url is not None:
+        kwargs["base_url"] = base_url
+        if not os.environ.get("OPENAI_API_KEY"):
+            kwargs["api_key"] = _LOCAL_API_KEY
+    return kwargs
+
+
+def get_client(base_url: str | None = None) -> OpenAI:
+    base_url = base_url or LLM_BASE_URL
+    client = _clients.get(base_url)
+    if client is None:
+        with _lock:
+            client = _clients.get(base_url)
+            if client is None:
+                client = OpenAI(**_client_kwargs(base_url))
+                _clients[base_url] = client
+    return client
+
+
+def get_async_client(base_url: str | None = None) -> AsyncOpenAI:
+    base_url = base_url or LLM_BASE_URL
+    loop = asyncio.get_running_loop()
+    clients = _async_clients.setdefault(loop, {})
+    client = clients.get(base_url)
+    if client is None:
+        client = AsyncOpenAI(**_client_kwargs(base_url))
+        clients[base_url] = client
+    return client
+
+
+@contextmanager
+def llm_slot():
+    with _semaphore:
+        yield
+
+
+@asynccontextmanager
+async def async_llm_slot():
+    loop = asyncio.get_running_loop()
+    semaphore = _async_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _async_semaphores[loop] = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    async with semaphore:
+        yield
+
+
+def record_call(call: str, seconds: float, response=None) -> None:
+    """API 호출 하나를 지표로 기록한다. response가 None이면 실패로 센다."""
+    if not metrics.enabled():
+        return
+    metrics.observe(metrics.LLM_REQUEST_SECONDS, seconds, call=call)
+    metrics.inc(metrics.LLM_REQUESTS, call=call, outcome="error" if response is None else "ok")
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    details = getattr(usage, "prompt_tokens_details", None)
+    for kind, value in (
+        ("prompt", getattr(usage, "prompt_tokens", None)),
+        ("completion", getattr(usage, "completion_tokens", None)),
+        ("cached", getattr(details, "cached_tokens", None)),
+    ):
+        if value:
+            metrics.inc(metrics.LLM_TOKENS, value, call=call, kind=kind)
+
+
+def reset_clients() -> None:
+    """캐시된 동기 클라이언트를 닫고 비운다 (설정 변경/테스트용)."""
+    with _lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
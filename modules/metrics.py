@@ -0,0 +1,303 @@
+"""
+지표 모듈 (Metrics)
+
+견적 파이프라인 단계별 소요 시간(히스토그램)과 호출/토큰/행 수(카운터)를 프로세스 메모리에 모읍니다.
+  - METRICS_ENABLED=1일 때만 기록. 꺼져 있으면 timer()/timed()/observe()/inc()는 플래그 하나만 보고 반환
+  - render_prometheus(): Prometheus text exposition 형식 (api.py의 GET /metrics)
+  - snapshot(): JSON으로 직렬화 가능한 dict. METRICS_DUMP_PATH를 주면 start_dump()가
+    METRICS_DUMP_INTERVAL초마다 파일로 기록 (Streamlit 프로세스처럼 HTTP 엔드포인트가 없을 때)
+  - 값은 프로세스별. uvicorn 워커가 여러 개면 워커마다 따로 집계된다
+
+사용법:
+    with metrics.timer(metrics.STAGE_SECONDS, stage="build_quote_pdf"):
+        elements = build_quote_pdf(data)
+
+    @metrics.timed(metrics.STAGE_SECONDS, stage="calculate_quote")
+    def calculate_quote(...): ...
+"""
+
+import atexit
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+
+METRICS_DUMP_PATH = os.environ.get("METRICS_DUMP_PATH") or None
+METRICS_DUMP_INTERVAL = float(os.environ.get("METRICS_DUMP_INTERVAL", "60"))
+
+# 지표 이름 (Prometheus 관례: 시간은 _seconds, 누적 수는 _total)
+STAGE_SECONDS = "quote_stage_seconds"
+LLM_REQUEST_SECONDS = "quote_llm_request_seconds"
+LLM_REQUESTS = "quote_llm_requests_total"
+LLM_TOKENS = "quote_llm_tokens_total"
+SHEETS_REQUEST_SECONDS = "quote_sheets_request_seconds"
+SHEETS_ROWS = "quote_sheets_rows_total"
+
+HELP = {
+    STAGE_SECONDS: "Duration of quote pipeline stages.",
+    LLM_REQUEST_SECONDS: "Duration of LLM API calls, including waiting for a concurrency slot.",
+    LLM_REQUESTS: "LLM API calls by outcome.",
+    LLM_TOKENS: "Tokens reported by the LLM API.",
+    SHEETS_REQUEST_SECONDS: "Duration of Google Sheets round trips.",
+    SHEETS_ROWS: "Rows handled by the Sheets writer by outcome.",
+}
+
+# 히스토그램 구간 상한(초): 수 µs(견적 계산)부터 수십 초(GPT/Sheets 재시도)까지
+BUCKETS = (
+    0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+_enabled = os.environ.get("METRICS_ENABLED", "0") == "1"
+_lock = threading.Lock()
+_histograms: dict[tuple[str, tuple], list] = {}  # (이름, 라벨) → [구간별 건수..., +Inf 건수, 합계, 최댓값]
+_counters: dict[tuple[str, tuple], float] = {}
+_dumper: threading.Thread | None = None
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(flag: bool) -> None:
+    global _enabled
+    _enabled = flag
+
+
+def reset() -> None:
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+
+# ── 기록 ──
+
+def observe(name: str, seconds: float, **labels: str) -> None:
+    if not _enabled:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    i = bisect.bisect_left(BUCKETS, seconds)
+    with _lock:
+        h = _histograms.get(key)
+        if h is None:
+            h = _histograms[key] = [0] * (len(BUCKETS) + 1) + [0.0, 0.0]
+        h[i] += 1
+        h[-2] += seconds
+        if seconds > h[-1]:
+            h[-1] = seconds
+
+
+def inc(name: str, value: float = 1, **labels: str) -> None:
+    if not _enabled:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+class _Timer:
+    __slots__ = ("name", "labels", "started")
+
+    def __init__(self, name: str, labels: dict):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self.started, **self.labels)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(name: str, **labels: str) -> _Timer | _NullTimer:
+    """with 블록의 소요 시간을 기록한다 (예외로 빠져나가도 기록)."""
+    if not _enabled:
+        return _NULL_TIMER
+    return _Timer(name, labels)
+
+
+def timed(name: str, **labels: str) -> Callable:
+    """함수 호출 소요 시간을 기록하는 데코레이터. 꺼져 있으면 함수를 바로 호출한다."""
+    def decorate(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - started, **labels)
+        return wrapper
+    return decorate
+
+
+class Stopwatch:
+    """여러 구간에 걸친 시간을 합산해 record() 때 한 번 기록한다 (스트리밍 루프의 단계별 시간).
+
+    재는 것은 항상 하고 기록만 enabled()를 따른다. pickle 가능하므로 프로세스 풀 워커에서 재고
+    결과와 함께 돌려보내 부모 프로세스에서 record()할 수 있다 (워커에서 기록한 값은 부모에 남지 않음).
+    """
+
+    __slots__ = ("name", "labels", "elapsed", "_started")
+
+    def __init__(self, name: str, **labels: str):
+        self.name = name
+        self.labels = labels
+        self.elapsed = 0.0
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed += time.perf_counter() - self._started
+
+    def iterate(self, iterable: Iterable) -> Iterator:
+        """iterable이 다음 값을 만드는 데 쓴 시간만 합산한다 (값을 받아 처리하는 시간은 제외)."""
+        iterator = iter(iterable)
+        while True:
+            with self:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def record(self) -> None:
+        observe(self.name, self.elapsed, **self.labels)
+
+
+def timed_iter(iterable: Iterable, name: str, **labels: str) -> Iterator:
+    """iterable이 값을 만드는 데 쓴 시간을 합산해, 소진(또는 중단) 시 한 번 기록한다."""
+    if not _enabled:
+        yield from iterable
+        return
+    watch = Stopwatch(name, **labels)
+    try:
+        yield from watch.iterate(iterable)
+    finally:
+        watch.record()
+
+
+# ── 내보내기 ──
+
+def _copy() -> tuple[dict, dict]:
+    with _lock:
+        return {k: list(v) for k, v in _histograms.items()}, dict(_counters)
+
+
+def snapshot() -> dict:
+    histograms, counters = _copy()
+    out_histograms = []
+    for (name, labels), h in sorted(histograms.items()):
+        count = sum(h[:-2])
+        cumulative, buckets = 0, {}
+        for bound, n in zip(BUCKETS, h):
+            cumulative += n
+            buckets[repr(bound)] = cumulative
+        out_histograms.append({
+            "name": name,
+            "labels": dict(labels),
+            "count": count,
+            "sum": h[-2],
+            "mean": h[-2] / count if count else None,
+            "max": h[-1],
+            "buckets": buckets,
+        })
+    return {
+        "enabled": _enabled,
+        "time": time.time(),
+        "histograms": out_histograms,
+        "counters": [
+            {"name": name, "labels": dict(labels), "value": value}
+            for (name, labels), value in sorted(counters.items())
+        ],
+    }
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: tuple, extra: str = "") -> str:
+    parts = [f'{k}="{_escape(v)}"' for k, v in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def render_prometheus() -> str:
+    histograms, counters = _copy()
+    lines = []
+    seen = set()
+
+    def header(name: str, kind: str) -> None:
+        if name not in seen:
+            seen.add(name)
+            lines.append(f"# HELP {name} {HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} {kind}")
+
+    for (name, labels), h in sorted(histograms.items()):
+        header(name, "histogram")
+        cumulative = 0
+        for bound, n in zip(BUCKETS, h):
+            cumulative += n
+            le = 'le="%r"' % bound
+            lines.append(f"{name}_bucket{_labels(labels, le)} {cumulative}")
+        cumulative += h[len(BUCKETS)]
+        le = 'le="+Inf"'
+        lines.append(f"{name}_bucket{_labels(labels, le)} {cumulative}")
+        lines.append(f"{name}_sum{_labels(labels)} {h[-2]!r}")
+        lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+    for (name, labels), value in sorted(counters.items()):
+        header(name, "counter")
+        lines.append(f"{name}{_labels(labels)} {value!r}")
+    return "\n".join(lines) + "\n"
+
+
+def dump(path: str | Path) -> None:
+    """snapshot()을 JSON 파일로 기록한다 (임시 파일에 쓴 뒤 교체 → 읽는 쪽이 반쯤 쓴 파일을 보지 않음)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(snapshot(), ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def start_dump(path: str | Path | None = METRICS_DUMP_PATH, interval: float = METRICS_DUMP_INTERVAL):
+    """interval초마다(그리고 종료 시) path에 JSON을 기록하는 스레드. 꺼져 있거나 path가 없으면 None."""
+    global _dumper
+    if not _enabled or path is None:
+        return None
+    with _lock:
+        if _dumper is not None:
+            return _dumper
+
+        def run() -> None:
+            while True:
+                time.sleep(interval)
+                dump(path)
+
+        _dumper = threading.Thread(target=run, name="metrics-dump", daemon=True)
+        _dumper.start()
+    atexit.register(dump, path)
+    return _dumper
@@ -0,0 +1,112 @@
+"""
+아웃박스 모듈 (Outbox)
+
+외부 시스템(Google Sheets)에 보낼 레코드를 먼저 로컬 SQLite 파일에 기록해 두는 내구성 큐입니다.
+  - put: 멱등 키와 함께 한 행 INSERT (WAL + synchronous=NORMAL → 수십 µs)
+  - claim: 오래된 순으로 묶음을 임대(lease)하고 시도 횟수를 올림 → 여러 프로세스의 drainer가 같은 행을 동시에 보내지 않음
+  - ack: 전송 확인된 행 삭제 / release: 실패한 행의 임대 해제(오류 기록)
+  - 시도 횟수가 2 이상인 행은 이전 전송 결과를 모르는 행 → 보내기 전에 대상 쪽에 이미 있는지 확인해야 함
+  - stats: 대기 건수(depth)와 가장 오래된 행의 대기 시간(lag)
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from pathlib import Path
+
+LEASE_SECONDS = 120.0
+
+
+class Outbox:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " key TEXT NOT NULL UNIQUE,"
+            " payload TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " leased_until REAL NOT NULL DEFAULT 0,"
+            " last_error TEXT)"
+        )
+
+    def put(self, key: str, payload) -> bool:
+        """이미 같은 키가 대기 중이면 False."""
+        data = json.dumps(payload, ensure_ascii=False)
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO outbox (key, payload, created) VALUES (?, ?, ?)",
+                (key, data, time.time()),
+            )
+        return cursor.rowcount == 1
+
+    def claim(self, limit: int, lease: float = LEASE_SECONDS) -> list[tuple[str, object, int]]:
+        """[(키, payload, 이번 시도 포함 시도 횟수)]를 오래된 순으로 임대한다."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT id, key, payload, attempts FROM outbox"
+                    " WHERE leased_until <= ? ORDER BY id LIMIT ?",
+                    (now, limit),
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE outbox SET attempts = attempts + 1, leased_until = ? WHERE id = ?",
+                    [(now + lease, row[0]) for row in rows],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [(key, json.loads(payload), attempts + 1) for _, key, payload, attempts in rows]
+
+    def ack(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            self._conn.executemany("DELETE FROM outbox WHERE key = ?", [(key,) for key in keys])
+
+    def release(self, keys: Iterable[str], error: str | None = None) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE outbox SET leased_until = 0, last_error = ? WHERE key = ?",
+                [(error, key) for key in keys],
+            )
+
+    def ready(self) -> tuple[int, float | None]:
+        """(지금 임대할 수 있는 건수, 그중 가장 오래된 행의 created)"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*), MIN(created) FROM outbox WHERE leased_until <= ?", (time.time(),)
+            ).fetchone()
+
+    def stats(self) -> dict:
+        now = time.time()
+        with self._lock:
+            depth, oldest, in_flight, retrying = self._conn.execute(
+                "SELECT COUNT(*), MIN(created), COALESCE(SUM(leased_until > ?), 0), COALESCE(SUM(attempts > 0), 0)"
+                " FROM outbox",
+                (now,),
+            ).fetchone()
+            last_error = self._conn.execute(
+                "SELECT last_error FROM outbox WHERE last_error IS NOT NULL ORDER BY id LIMIT 1"
+            ).fetchone()
+        return {
+            "depth": depth,
+            "lag_seconds": round(now - oldest, 3) if oldest is not None else 0.0,
+            "in_flight": in_flight,
+            "retrying": retrying,
+            "last_error": last_error[0] if last_error else None,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
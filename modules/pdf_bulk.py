@@ -0,0 +1,230 @@
+"""
+PDF 일괄 생성 모듈 (PDF Bulk)
+
+월말 재견적처럼 수천 건의 견적서 PDF를 프로세스 풀로 나눠 생성합니다.
+  - 워커마다 폰트 등록/스타일/단가표를 초기화 단계에서 한 번만 준비
+  - 레코드를 RECORDS_PER_TASK건씩 묶어 전달 (IPC 횟수 감소)
+  - 견적 번호가 없는 레코드는 렌더링 전에 번호를 발급해 PDF와 파일명에 같은 번호를 사용
+  - 파일명(견적 번호)이 앞 레코드와 겹치면 덮어쓰지 않고 그 레코드를 오류로 집계
+  - 디렉터리 출력: 워커가 파일을 직접 기록하고 파일명/크기만 반환
+  - zip 출력: 완료된 묶음부터 입력 순서대로 zip에 기록 → 메모리는 처리 중인 묶음만큼만 사용
+  - 처리량(건/초)과 오류 건수를 통계로 반환
+
+입력 레코드 (JSONL 한 줄 = 견적 1건):
+    {"language_pair": "ko-en", "domain": "legal", "volume": 5000, "volume_unit": "chars",
+     "surcharge_keys": ["urgent"], "client_name": "...", "client_email": "...",
+     "deadline": "2026-10-31", "notes": "", "quote_number": "Q-20261031-001"}
+
+사용법:
+    python -m modules.pdf_bulk quotes.jsonl -o out.zip --workers 8
+    python -m modules.pdf_bulk quotes.jsonl -o out_dir/
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import time
+import zipfile
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from pathlib import Path
+
+from modules.pdf_generator import generate_quote_pdf
+from modules.quote_calculator import calculate_quote, get_pricing
+from modules.quote_number import next_quote_number
+
+RECORDS_PER_TASK = 16
+MAX_ERRORS_REPORTED = 100
+
+_UNSAFE_FILENAME = re.compile(r"[^\w.-]+")
+
+
+def _init_worker() -> None:
+    from templates.quote_template import warm_up
+
+    get_pricing()
+    warm_up()
+
+
+def _filename(quote_number: str) -> str:
+    return f"{_UNSAFE_FILENAME.sub('_', quote_number)}.pdf"
+
+
+def render_record(record: dict) -> bytes:
+    result = calculate_quote(
+        language_pair=record["language_pair"],
+        domain=record["domain"],
+        volume=record["volume"],
+        volume_unit=record.get("volume_unit", "chars"),
+        surcharge_keys=record.get("surcharge_keys") or [],
+    )
+    deadline = record["deadline"]
+    if isinstance(deadline, str):
+        deadline = date.fromisoformat(deadline)
+    return generate_quote_pdf(
+        result,
+        client_name=record.get("client_name", ""),
+        client_email=record.get("client_email", ""),
+        deadline=deadline,
+        notes=record.get("notes") or "",
+        quote_number=record.get("quote_number"),
+    )
+
+
+# (순번, 레코드, 파일명, 오류) — 오류가 있는 작업은 렌더링하지 않고 그대로 돌려준다
+Task = tuple[int, dict, str, str | None]
+# (순번, 파일명, PDF 바이트 또는 기록한 크기, 오류)
+Rendered = tuple[int, str, bytes | int | None, str | None]
+
+
+def _tasks(records: Iterable[dict]) -> Iterator[Task]:
+    """견적 번호를 렌더링 전에 정해 파일명으로 쓴다. 파일명이 앞 레코드와 겹치면 그 레코드는 오류."""
+    seen = set()
+    for index, record in enumerate(records):
+        quote_number = record.get("quote_number")
+        if not quote_number:
+            quote_number = next_quote_number()
+            record = {**record, "quote_number": quote_number}
+        name = _filename(str(quote_number))
+        if name in seen:
+            yield index, record, name, f"Duplicate file name: {name}"
+            continue
+        seen.add(name)
+        yield index, record, name, None
+
+
+def _render_batch(batch: list[Task], out_dir: str | None) -> list[Rendered]:
+    """out_dir가 있으면 워커가 직접 파일을 기록하고 크기만 돌려준다."""
+    rendered = []
+    for index, record, name, error in batch:
+        if error is None:
+            try:
+                pdf = render_record(record)
+            except (KeyError, TypeError, ValueError) as e:
+                error = f"{type(e).__name__}: {e}"
+        if error is not None:
+            rendered.append((index, name, None, error))
+            continue
+        if out_dir is not None:
+            Path(out_dir, name).write_bytes(pdf)
+            rendered.append((index, name, len(pdf), None))
+        else:
+            rendered.append((index, name, pdf, None))
+    return rendered
+
+
+def _batches(tasks: Iterable[Task], size: int) -> Iterator[list[Task]]:
+    batch = []
+    for task in tasks:
+        batch.append(task)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _iter_rendered(
+    records: Iterable[dict],
+    out_dir: str | None,
+    workers: int,
+    records_per_task: int,
+) -> Iterator[Rendered]:
+    batches = _batches(_tasks(records), records_per_task)
+    if workers <= 1:
+        _init_worker()
+        for batch in batches:
+            yield from _render_batch(batch, out_dir)
+        return
+
+    # Streamlit 등 멀티스레드 호출자에서도 안전하도록 spawn으로 워커 생성
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+    ) as pool:
+        pending = deque()
+
+        def submit_next() -> None:
+            batch = next(batches, None)
+            if batch is not None:
+                pending.append(pool.submit(_render_batch, batch, out_dir))
+
+        # 워커당 2묶음까지만 미리 제출 → 입력이 커도 메모리 사용량 일정
+        for _ in range(2 * workers):
+            submit_next()
+        try:
+            while pending:
+                rendered = pending.popleft().result()
+                submit_next()
+                yield from rendered
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def render_bulk(
+    records: Iterable[dict],
+    output: str | Path,
+    workers: int | None = None,
+    records_per_task: int = RECORDS_PER_TASK,
+) -> dict:
+    """records를 PDF로 만들어 output(.zip 파일 또는 디렉터리)에 기록하고 처리 통계를 반환한다."""
+    output = Path(output)
+    workers = workers or os.cpu_count() or 1
+    to_zip = output.suffix.lower() == ".zip"
+    if not to_zip:
+        output.mkdir(parents=True, exist_ok=True)
+
+    stats = {"documents": 0, "errors": 0, "bytes": 0, "workers": workers, "error_details": []}
+    started = time.perf_counter()
+
+    zf = zipfile.ZipFile(output, "w", zipfile.ZIP_STORED) if to_zip else None
+    try:
+        rendered = _iter_rendered(records, None if to_zip else str(output), workers, records_per_task)
+        for index, name, pdf, error in rendered:
+            if error is not None:
+                stats["errors"] += 1
+                if len(stats["error_details"]) < MAX_ERRORS_REPORTED:
+                    stats["error_details"].append({"index": index, "error": error})
+                continue
+            if zf is not None:
+                # PDF는 이미 압축된 스트림이라 ZIP_STORED로 기록
+                zf.writestr(name, pdf)
+                pdf = len(pdf)
+            stats["documents"] += 1
+            stats["bytes"] += pdf
+    finally:
+        if zf is not None:
+            zf.close()
+
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    stats["per_second"] = round(stats["documents"] / stats["seconds"], 2) if stats["seconds"] else None
+    return stats
+
+
+def iter_records(path: str | Path) -> Iterator[dict]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="견적서 PDF 일괄 생성")
+    parser.add_argument("records", help="견적 레코드 JSONL")
+    parser.add_argument("-o", "--output", required=True, help="출력 .zip 파일 또는 디렉터리")
+    parser.add_argument("--workers", type=int, default=None, help="워커 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--per-task", type=int, default=RECORDS_PER_TASK, help="작업 하나에 묶을 레코드 수")
+    args = parser.parse_args(argv)
+
+    stats = render_bulk(iter_records(args.records), args.output, workers=args.workers, records_per_task=args.per_task)
+    print(json.dumps(stats, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
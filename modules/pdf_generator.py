@@ -1,31 +1,51 @@
+import functools
+import hashlib
 import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
 from datetime import date, timedelta
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate
 
-from modules.quote_calculator import QuoteResult, load_pricing
-from templates.quote_template import build_quote_pdf
+from reportlab.pdfgen import canvas
 
+from modules import metrics
+from modules.quote_calculator import QuoteResult, get_pricing
+from modules.quote_number import next_quote_number
+from templates.quote_compiled import render_compiled
+from templates.quote_template import TEMPLATE_VERSION, build_quote_pdf, make_doc_template
 
-def generate_quote_pdf(
+# 고정 레이아웃을 미리 배치해 둔 고속 경로(templates/quote_compiled) 사용 여부.
+# 0이면 항상 Platypus(기준) 경로로 렌더링한다.
+FAST_PDF = os.environ.get("QUOTE_PDF_FAST", "1") != "0"
+
+# 같은 견적 내용 → 같은 PDF. Streamlit rerun마다 ReportLab을 다시 돌리지 않도록 프로세스 단위 LRU로 보관
+PDF_CACHE_MAX_ENTRIES = 128
+
+_pdf_cache: OrderedDict[str, bytes] = OrderedDict()
+_pdf_cache_lock = threading.Lock()
+
+
+def quote_pdf_data(
     result: QuoteResult,
     client_name: str,
     client_email: str,
     deadline: date,
     notes: str = "",
     quote_number: str | None = None,
-) -> bytes:
-    pricing = load_pricing()
-    lang_label = pricing["language_pairs"][result.language_pair]
-    domain_label = pricing["domains"][result.domain]
+) -> dict:
+    pricing = get_pricing()
+    lang_label = pricing.language_pair_labels[result.language_pair]
+    domain_label = pricing.domain_labels[result.domain]
 
     if quote_number is None:
-        quote_number = f"Q-{date.today().strftime('%Y%m%d')}-001"
+        quote_number = next_quote_number()
 
     issue_date = date.today().strftime("%Y-%m-%d")
     valid_until = (date.today() + timedelta(days=7)).strftime("%Y-%m-%d")
 
-    data = {
+    return {
         "quote_number": quote_number,
         "issue_date": issue_date,
         "valid_until": valid_until,
@@ -43,15 +63,121 @@ def generate_quote_pdf(
         "notes": notes,
     }
 
+
+class _TimedCanvas(canvas.Canvas):
+    """save()(PDF 객체 직렬화, 압축, 폰트 임베딩)에 걸린 시간을 serializing에 더하는 캔버스."""
+
+    def __init__(self, *args, serializing: metrics.Stopwatch, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.serializing = serializing
+
+    def save(self):
+        with self.serializing:
+            super().save()
+
+
+def _serialize_stopwatch(path: str) -> metrics.Stopwatch:
+    return metrics.Stopwatch(metrics.STAGE_SECONDS, stage="pdf_serialize", path=path)
+
+
+def render_platypus(data: dict) -> bytes:
+    """기준 경로: Platypus 레이아웃 엔진으로 매번 배치한다."""
     buffer = io.BytesIO()
-    doc = SimpleDocTemplate(
-        buffer,
-        pagesize=A4,
-        topMargin=30,
-        bottomMargin=30,
-        leftMargin=40,
-        rightMargin=40,
-    )
-    elements = build_quote_pdf(data)
-    doc.build(elements)
+    doc = make_doc_template(buffer)
+    with metrics.timer(metrics.STAGE_SECONDS, stage="build_quote_pdf"):
+        elements = build_quote_pdf(data)
+    # doc.build는 배치(wrap/split/페이지에 그리기)와 PDF 직렬화(canvas.save)를 한 번에 하므로
+    # save 시간을 따로 재서 빼면 배치 시간이 된다
+    serializing = _serialize_stopwatch("platypus")
+    layout = metrics.Stopwatch(metrics.STAGE_SECONDS, stage="doc_layout")
+    with layout:
+        doc.build(elements, canvasmaker=functools.partial(_TimedCanvas, serializing=serializing))
+    layout.elapsed -= serializing.elapsed
+    layout.record()
+    serializing.record()
     return buffer.getvalue()
+
+
+def render_quote_pdf(data: dict, fast: bool | None = None) -> bytes:
+    if FAST_PDF if fast is None else fast:
+        # render_compiled: 요소 생성과 캔버스에 그리기 (직렬화 제외). 폴백한 경우 포기하기까지의 시간
+        serializing = _serialize_stopwatch("compiled")
+        drawing = metrics.Stopwatch(metrics.STAGE_SECONDS, stage="render_compiled")
+        with drawing:
+            pdf = render_compiled(data, canvasmaker=functools.partial(_TimedCanvas, serializing=serializing))
+        drawing.elapsed -= serializing.elapsed
+        drawing.record()
+        if pdf is not None:
+            serializing.record()
+            return pdf
+    return render_platypus(data)
+
+
+def generate_quote_pdf(
+    result: QuoteResult,
+    client_name: str,
+    client_email: str,
+    deadline: date,
+    notes: str = "",
+    quote_number: str | None = None,
+    fast: bool | None = None,
+) -> bytes:
+    data = quote_pdf_data(result, client_name, client_email, deadline, notes, quote_number)
+    return render_quote_pdf(data, fast)
+
+
+def quote_pdf_key(
+    result: QuoteResult,
+    client_name: str,
+    client_email: str,
+    deadline: date,
+    notes: str = "",
+    quote_number: str | None = None,
+) -> str:
+    """PDF 내용을 결정하는 값(견적, 고객, 발행일, 템플릿·단가표 버전)의 해시."""
+    payload = {
+        "result": asdict(result),
+        "client_name": client_name,
+        "client_email": client_email,
+        "deadline": deadline.isoformat(),
+        "notes": notes,
+        "quote_number": quote_number,
+        "issue_date": date.today().isoformat(),
+        "template": TEMPLATE_VERSION,
+        "pricing": get_pricing().digest,
+    }
+    return hashlib.sha256(
+        json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+def get_quote_pdf(
+    result: QuoteResult,
+    client_name: str,
+    client_email: str,
+    deadline: date,
+    notes: str = "",
+    quote_number: str | None = None,
+) -> tuple[str, bytes]:
+    """(캐시 키, PDF 바이트). 같은 내용이면 다시 렌더링하지 않는다."""
+    if quote_number is None:
+        quote_number = next_quote_number()  # 번호가 없으면 새 견적 → 캐시를 공유하지 않음
+    key = quote_pdf_key(result, client_name, client_email, deadline, notes, quote_number)
+    with _pdf_cache_lock:
+        pdf = _pdf_cache.get(key)
+        if pdf is not None:
+            _pdf_cache.move_to_end(key)
+            return key, pdf
+
+    pdf = generate_quote_pdf(result, client_name, client_email, deadline, notes, quote_number)
+    with _pdf_cache_lock:
+        _pdf_cache[key] = pdf
+        _pdf_cache.move_to_end(key)
+        while len(_pdf_cache) > PDF_CACHE_MAX_ENTRIES:
+            _pdf_cache.popitem(last=False)
+    return key, pdf
+
+
+def clear_pdf_cache() -> None:
+    with _pdf_cache_lock:
+        _pdf_cache.clear()
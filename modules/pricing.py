@@ -0,0 +1,131 @@
+"""
+단가표 모듈 (Pricing Table)
+
+config/pricing.json을 한 번만 읽어 조회용 구조로 컴파일해 두고,
+파일의 mtime/size가 바뀐 경우에만 다시 읽습니다(내용 해시가 같으면 재컴파일 생략).
+→ 견적 산출 시 디스크 I/O·JSON 파싱 없이 메모리 조회만 수행
+→ 단가표를 수정하면 재시작 없이 다음 조회부터 반영
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+
+PRICING_PATH = Path(__file__).parent.parent / "config" / "pricing.json"
+
+# 파일 변경 여부(stat) 확인 최소 간격(초). 이 간격 안에서는 syscall 없이 캐시를 그대로 사용.
+CHECK_INTERVAL = 1.0
+
+
+def load_pricing() -> dict:
+    with open(PRICING_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@dataclass(frozen=True, slots=True)
+class PricingTable:
+    raw: Mapping
+    digest: str
+    language_pairs: tuple[str, ...]
+    domains: tuple[str, ...]
+    unit_prices: Mapping[tuple[str, str], int]
+    surcharge_keys: tuple[str, ...]
+    surcharge_rates: tuple[float, ...]
+    surcharge_labels: tuple[str, ...]
+    surcharge_bits: Mapping[str, int]
+    exclusive_masks: tuple[int, ...]
+    vat_rate: float
+    volume_conversion: Mapping[str, float]
+    language_pair_labels: Mapping[str, str]
+    domain_labels: Mapping[str, str]
+
+    @classmethod
+    def compile(cls, pricing: dict, digest: str = "") -> "PricingTable":
+        unit_prices = {}
+        domains: list[str] = []
+        for pair, prices in pricing["unit_prices"].items():
+            for domain, price in prices.items():
+                unit_prices[(pair, domain)] = price
+                if domain not in domains:
+                    domains.append(domain)
+
+        surcharge_keys = tuple(pricing["surcharges"].keys())
+        surcharge_bits = {key: 1 << i for i, key in enumerate(surcharge_keys)}
+        exclusive_masks = tuple(
+            sum(surcharge_bits.get(key, 0) for key in group)
+            for group in pricing.get("surcharge_exclusive_groups", [])
+        )
+
+        return cls(
+            raw=MappingProxyType(pricing),
+            digest=digest,
+            language_pairs=tuple(pricing["unit_prices"].keys()),
+            domains=tuple(domains),
+            unit_prices=MappingProxyType(unit_prices),
+            surcharge_keys=surcharge_keys,
+            surcharge_rates=tuple(info["rate"] for info in pricing["surcharges"].values()),
+            surcharge_labels=tuple(info["label"] for info in pricing["surcharges"].values()),
+            surcharge_bits=MappingProxyType(surcharge_bits),
+            exclusive_masks=exclusive_masks,
+            vat_rate=pricing["vat_rate"],
+            volume_conversion=MappingProxyType(dict(pricing["volume_conversion"])),
+            language_pair_labels=MappingProxyType(dict(pricing.get("language_pairs", {}))),
+            domain_labels=MappingProxyType(dict(pricing.get("domains", {}))),
+        )
+
+    def pair_domains(self, language_pair: str) -> list[str]:
+        return list(self.raw["unit_prices"][language_pair].keys())
+
+    def surcharge_mask(self, selected: Iterable[str]) -> int:
+        """할증 키 목록을 비트마스크로 변환한다. 배타 그룹 위반/미등록 키는 ValueError."""
+        selected = list(selected)
+        mask = 0
+        for key in selected:
+            mask |= self.surcharge_bits.get(key, 0)
+
+        for group_mask in self.exclusive_masks:
+            if not mask & group_mask:
+                continue
+            found = [s for s in selected if self.surcharge_bits.get(s, 0) & group_mask]
+            if len(found) > 1:
+                raise ValueError(
+                    f"Surcharges {found} are mutually exclusive. Pick one."
+                )
+
+        for s in selected:
+            if s not in self.surcharge_bits:
+                raise ValueError(f"Unknown surcharge: {s}. Use: {set(self.surcharge_keys)}")
+        return mask
+
+
+_lock = threading.Lock()
+_table: PricingTable | None = None
+_stat_key: tuple | None = None
+_checked_at = 0.0
+
+
+def get_pricing(force_check: bool = False) -> PricingTable:
+    """컴파일된 단가표를 반환한다. 파일이 바뀐 경우에만 다시 읽는다."""
+    global _table, _stat_key, _checked_at
+
+    now = time.monotonic()
+    table = _table
+    if table is not None and not force_check and now - _checked_at < CHECK_INTERVAL:
+        return table
+
+    with _lock:
+        st = PRICING_PATH.stat()
+        stat_key = (PRICING_PATH, st.st_mtime_ns, st.st_size)
+        if _table is None or stat_key != _stat_key:
+            data = PRICING_PATH.read_bytes()
+            digest = hashlib.sha256(data).hexdigest()
+            if _table is None or digest != _table.digest:
+                _table = PricingTable.compile(json.loads(data), digest)
+            _stat_key = stat_key
+        _checked_at = now
+        return _table
@@ -1,16 +1,13 @@
-import json
-from pathlib import Path
+from collections.abc import Iterable, Iterator, Sequence
 from dataclasses import dataclass
 
-PRICING_PATH = Path(__file__).parent.parent / "config" / "pricing.json"
+import numpy as np
 
+from modules import metrics
+from modules.pricing import PRICING_PATH, PricingTable, get_pricing, load_pricing
 
-def load_pricing() -> dict:
-    with open(PRICING_PATH, encoding="utf-8") as f:
-        return json.load(f)
 
-
-@dataclass
+@dataclass(frozen=True, slots=True)
 class QuoteResult:
     language_pair: str
     domain: str
@@ -26,17 +23,28 @@ class QuoteResult:
     total: int
 
 
-def convert_volume(value: float, unit: str, pricing: dict | None = None) -> int:
+def convert_volume(value: float, unit: str, pricing: dict | PricingTable | None = None) -> int:
     if pricing is None:
-        pricing = load_pricing()
-    conversion = pricing["volume_conversion"]
+        pricing = get_pricing()
+    if isinstance(pricing, PricingTable):
+        conversion = pricing.volume_conversion
+    else:
+        conversion = pricing["volume_conversion"]
     multiplier = conversion.get(unit)
     if multiplier is None:
         raise ValueError(f"Unknown volume unit: {unit}. Use: {list(conversion.keys())}")
     return int(value * multiplier)
 
 
-def validate_surcharges(selected: list[str], pricing: dict) -> list[str]:
+def validate_surcharges(selected: list[str], pricing: dict | PricingTable) -> list[str]:
+    # 같은 할증을 두 번 넣으면 calculate_quote는 두 번 더하고 비트마스크(일괄 견적)는 한 번만 센다
+    duplicates = sorted({s for s in selected if selected.count(s) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate surcharges: {duplicates}")
+    if isinstance(pricing, PricingTable):
+        pricing.surcharge_mask(selected)
+        return selected
+
     exclusive_groups = pricing.get("surcharge_exclusive_groups", [])
     for group in exclusive_groups:
         found = [s for s in selected if s in group]
@@ -51,6 +59,7 @@ def validate_surcharges(selected: list[str], pricing: dict) -> list[str]:
     return selected
 
 
+@metrics.timed(metrics.STAGE_SECONDS, stage="calculate_quote")
 def calculate_quote(
     language_pair: str,
     domain: str,
@@ -58,42 +67,41 @@ def calculate_quote(
     volume_unit: str = "chars",
     surcharge_keys: list[str] | None = None,
 ) -> QuoteResult:
-    pricing = load_pricing()
+    pricing = get_pricing()
     surcharge_keys = surcharge_keys or []
 
-    if language_pair not in pricing["unit_prices"]:
+    if language_pair not in pricing.language_pairs:
         raise ValueError(
             f"Unknown language pair: {language_pair}. "
-            f"Use: {list(pricing['unit_prices'].keys())}"
+            f"Use: {list(pricing.language_pairs)}"
         )
-    pair_prices = pricing["unit_prices"][language_pair]
 
-    if domain not in pair_prices:
+    unit_price = pricing.unit_prices.get((language_pair, domain))
+    if unit_price is None:
         raise ValueError(
-            f"Unknown domain: {domain}. Use: {list(pair_prices.keys())}"
+            f"Unknown domain: {domain}. Use: {pricing.pair_domains(language_pair)}"
         )
 
     validate_surcharges(surcharge_keys, pricing)
 
-    unit_price = pair_prices[domain]
     converted_chars = convert_volume(volume, volume_unit, pricing)
     base_amount = converted_chars * unit_price
 
     surcharges_detail = []
     surcharge_total = 0
     for key in surcharge_keys:
-        info = pricing["surcharges"][key]
-        rate = info["rate"]
+        i = pricing.surcharge_keys.index(key)
+        rate = pricing.surcharge_rates[i]
         amount = int(base_amount * rate)
         surcharges_detail.append({
             "key": key,
-            "label": info["label"],
+            "label": pricing.surcharge_labels[i],
             "rate": rate,
             "amount": amount,
         })
         surcharge_total += amount
     subtotal = base_amount + surcharge_total
-    vat = int(subtotal * pricing["vat_rate"])
+    vat = int(subtotal * pricing.vat_rate)
     total = subtotal + vat
 
     return QuoteResult(
@@ -110,3 +118,232 @@ def calculate_quote(
         vat=vat,
         total=total,
     )
+
+
+# ── 일괄 견적 (벡터화) ──
+# calculate_quote와 동일한 연산 순서를 배열 단위로 수행한다.
+# 할증은 README Issue #1과 같이 항목별로 int() 절사 후 합산하므로 스칼라 경로와 결과가 비트 단위로 같다.
+# (금액이 2**53 미만인 범위에서 float64 곱셈 결과가 Python float 연산과 동일)
+
+def _encode(values, vocab: Sequence[str]) -> np.ndarray:
+    """문자열 목록을 vocab 인덱스 배열로 변환한다. 미등록 값은 -1. 정수 배열은 코드로 간주."""
+    if isinstance(values, np.ndarray) and np.issubdtype(values.dtype, np.integer):
+        codes = values.astype(np.intp)
+        return np.where((codes >= 0) & (codes < len(vocab)), codes, -1)
+    index = {v: i for i, v in enumerate(vocab)}
+    return np.fromiter((index.get(v, -1) for v in values), dtype=np.intp, count=len(values))
+
+
+def _first_bad(bad: np.ndarray) -> int | None:
+    rows = np.flatnonzero(bad)
+    return int(rows[0]) if rows.size else None
+
+
+@dataclass(frozen=True, slots=True)
+class QuoteBatch:
+    """견적 결과를 열 단위 배열로 보관하는 컨테이너.
+
+    언어쌍/분야/단위는 pricing 단가표의 인덱스, 할증은 비트마스크와 (행 수, 할증 수) 금액 배열로 저장한다.
+    행 단위 QuoteResult는 batch[i] 또는 iter(batch)로 필요할 때만 생성한다.
+    """
+    pricing: PricingTable
+    language_pair: np.ndarray      # uint8, pricing.language_pairs 인덱스
+    domain: np.ndarray             # uint8, pricing.domains 인덱스
+    original_volume: np.ndarray
+    volume_unit: np.ndarray        # uint8, pricing.volume_conversion 키 순서 인덱스
+    surcharge_mask: np.ndarray     # uint32
+    converted_chars: np.ndarray
+    unit_price: np.ndarray         # int32
+    base_amount: np.ndarray
+    surcharge_amounts: np.ndarray  # (행 수, len(pricing.surcharge_keys))
+    surcharge_total: np.ndarray
+    subtotal: np.ndarray
+    vat: np.ndarray
+    total: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.total)
+
+    def __getitem__(self, i: int) -> QuoteResult:
+        pricing = self.pricing
+        mask = int(self.surcharge_mask[i])
+        surcharges = [
+            {
+                "key": key,
+                "label": pricing.surcharge_labels[k],
+                "rate": pricing.surcharge_rates[k],
+                "amount": int(self.surcharge_amounts[i, k]),
+            }
+            for k, key in enumerate(pricing.surcharge_keys)
+            if mask & (1 << k)
+        ]
+        return QuoteResult(
+            language_pair=pricing.language_pairs[self.language_pair[i]],
+            domain=pricing.domains[self.domain[i]],
+            original_volume=self.original_volume[i].item(),
+            volume_unit=tuple(pricing.volume_conversion)[self.volume_unit[i]],
+            converted_chars=int(self.converted_chars[i]),
+            unit_price=int(self.unit_price[i]),
+            base_amount=int(self.base_amount[i]),
+            surcharges=surcharges,
+            surcharge_total=int(self.surcharge_total[i]),
+            subtotal=int(self.subtotal[i]),
+            vat=int(self.vat[i]),
+            total=int(self.total[i]),
+        )
+
+    def __iter__(self) -> Iterator[QuoteResult]:
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            getattr(self, name).nbytes
+            for name in self.__slots__
+            if name != "pricing"
+        )
+
+    @classmethod
+    def from_results(cls, results: Iterable[QuoteResult]) -> "QuoteBatch":
+        results = list(results)
+        pricing = get_pricing()
+        unit_keys = tuple(pricing.volume_conversion)
+        surcharge_amounts = np.zeros((len(results), len(pricing.surcharge_keys)), dtype=np.int64)
+        masks = np.zeros(len(results), dtype=np.uint32)
+        for i, r in enumerate(results):
+            for s in r.surcharges:
+                k = pricing.surcharge_keys.index(s["key"])
+                surcharge_amounts[i, k] = s["amount"]
+                masks[i] |= 1 << k
+
+        def column(name, dtype):
+            return np.fromiter((getattr(r, name) for r in results), dtype=dtype, count=len(results))
+
+        return cls(
+            pricing=pricing,
+            language_pair=np.fromiter(
+                (pricing.language_pairs.index(r.language_pair) for r in results), dtype=np.uint8, count=len(results),
+            ),
+            domain=np.fromiter(
+                (pricing.domains.index(r.domain) for r in results), dtype=np.uint8, count=len(results),
+            ),
+            original_volume=np.array([r.original_volume for r in results]),
+            volume_unit=np.fromiter(
+                (unit_keys.index(r.volume_unit) for r in results), dtype=np.uint8, count=len(results),
+            ),
+            surcharge_mask=masks,
+            converted_chars=column("converted_chars", np.int64),
+            unit_price=column("unit_price", np.int32),
+            base_amount=column("base_amount", np.int64),
+            surcharge_amounts=surcharge_amounts,
+            surcharge_total=column("surcharge_total", np.int64),
+            subtotal=column("subtotal", np.int64),
+            vat=column("vat", np.int64),
+            total=column("total", np.int64),
+        )
+
+
+@metrics.timed(metrics.STAGE_SECONDS, stage="calculate_quotes")
+def calculate_quotes(
+    language_pairs: Sequence[str] | np.ndarray,
+    domains: Sequence[str] | np.ndarray,
+    volumes: Sequence[float] | np.ndarray,
+    volume_units: Sequence[str] | np.ndarray | str = "chars",
+    surcharge_masks: Sequence[int] | np.ndarray | None = None,
+) -> QuoteBatch:
+    """여러 견적 라인을 열(column) 단위로 한 번에 산출한다.
+
+    language_pairs/domains/volume_units는 문자열 목록 또는 단가표 순서의 정수 코드 배열,
+    surcharge_masks는 PricingTable.surcharge_mask() 형식의 비트마스크 배열이다.
+    """
+    pricing = get_pricing()
+    n = len(volumes)
+
+    pair_codes = _encode(language_pairs, pricing.language_pairs)
+    if (row := _first_bad(pair_codes < 0)) is not None:
+        raise ValueError(
+            f"Row {row}: Unknown language pair: {language_pairs[row]}. "
+            f"Use: {list(pricing.language_pairs)}"
+        )
+
+    price_grid = np.full((len(pricing.language_pairs), len(pricing.domains)), -1, dtype=np.int64)
+    for (pair, domain), price in pricing.unit_prices.items():
+        price_grid[pricing.language_pairs.index(pair), pricing.domains.index(domain)] = price
+
+    domain_codes = _encode(domains, pricing.domains)
+    unit_price = np.where(domain_codes >= 0, price_grid[pair_codes, domain_codes], -1)
+    if (row := _first_bad(unit_price < 0)) is not None:
+        pair = pricing.language_pairs[pair_codes[row]]
+        raise ValueError(
+            f"Row {row}: Unknown domain: {domains[row]}. Use: {pricing.pair_domains(pair)}"
+        )
+
+    if surcharge_masks is None:
+        masks = np.zeros(n, dtype=np.int64)
+    else:
+        masks = np.asarray(surcharge_masks, dtype=np.int64)
+    all_bits = sum(pricing.surcharge_bits.values())
+    for group_mask in pricing.exclusive_masks:
+        hit = masks & group_mask
+        if (row := _first_bad(hit & (hit - 1))) is not None:
+            found = [k for k, b in pricing.surcharge_bits.items() if b & hit[row]]
+            raise ValueError(
+                f"Row {row}: Surcharges {found} are mutually exclusive. Pick one."
+            )
+    if (row := _first_bad(masks & ~all_bits)) is not None:
+        raise ValueError(
+            f"Row {row}: Unknown surcharge bits: {int(masks[row] & ~all_bits):#x}. "
+            f"Use: {dict(pricing.surcharge_bits)}"
+        )
+
+    unit_keys = tuple(pricing.volume_conversion.keys())
+    if isinstance(volume_units, str):
+        volume_units = [volume_units] * n
+    unit_codes = _encode(volume_units, unit_keys)
+    if (row := _first_bad(unit_codes < 0)) is not None:
+        raise ValueError(f"Row {row}: Unknown volume unit: {volume_units[row]}. Use: {list(unit_keys)}")
+
+    volume_arr = np.asarray(volumes)
+    integral = np.issubdtype(volume_arr.dtype, np.integer)
+    if not integral and (row := _first_bad(~np.isfinite(volume_arr))) is not None:
+        raise ValueError(f"Row {row}: Invalid volume: {volumes[row]}")
+
+    multipliers = [pricing.volume_conversion[unit] for unit in unit_keys]
+    float_mult = np.array(multipliers, dtype=np.float64)[unit_codes]
+    converted_chars = (volume_arr.astype(np.float64) * float_mult).astype(np.int64)
+    if integral:
+        # 정수 분량 × 정수 배수는 Python과 같이 정확한 정수 곱으로 계산
+        int_unit = np.array([isinstance(m, int) for m in multipliers])[unit_codes]
+        int_mult = np.array([m if isinstance(m, int) else 0 for m in multipliers], dtype=np.int64)[unit_codes]
+        converted_chars = np.where(int_unit, volume_arr * int_mult, converted_chars)
+
+    base_amount = converted_chars * unit_price
+
+    surcharge_amounts = np.zeros((n, len(pricing.surcharge_keys)), dtype=np.int64)
+    base_float = base_amount.astype(np.float64)
+    for k, key in enumerate(pricing.surcharge_keys):
+        applied = (masks & pricing.surcharge_bits[key]) != 0
+        surcharge_amounts[:, k] = np.where(applied, (base_float * pricing.surcharge_rates[k]).astype(np.int64), 0)
+    surcharge_total = surcharge_amounts.sum(axis=1)
+
+    subtotal = base_amount + surcharge_total
+    vat = (subtotal.astype(np.float64) * pricing.vat_rate).astype(np.int64)
+    total = subtotal + vat
+
+    return QuoteBatch(
+        pricing=pricing,
+        language_pair=pair_codes.astype(np.uint8),
+        domain=domain_codes.astype(np.uint8),
+        original_volume=volume_arr,
+        volume_unit=unit_codes.astype(np.uint8),
+        surcharge_mask=masks.astype(np.uint32),
+        converted_chars=converted_chars,
+        unit_price=unit_price.astype(np.int32),
+        base_amount=base_amount,
+        surcharge_amounts=surcharge_amounts,
+        surcharge_total=surcharge_total,
+        subtotal=subtotal,
+        vat=vat,
+        total=total,
+    )
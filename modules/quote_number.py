@@ -0,0 +1,85 @@
+"""
+견적서 번호 모듈 (Quote Number)
+
+견적서 번호 Q-YYYYMMDD-### 의 일자별 일련번호를 발급합니다.
+  - SQLite(WAL) 파일의 일자별 마지막 번호를 UPSERT ... RETURNING 한 문장으로 올림
+    → 여러 스레드·여러 Streamlit 프로세스가 같은 파일을 써도 번호가 겹치지 않음
+  - block_size > 1이면 한 번에 여러 번호를 예약해 메모리에서 나눠 줌 (파일 잠금 횟수 감소)
+    프로세스 안에서는 오름차순이지만 프로세스 간 발급 순서는 섞이고, 재시작 시 쓰지 않은 번호는 건너뜀
+  - 일련번호는 3자리 이상 (999 다음은 1000)
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import date
+from pathlib import Path
+
+QUOTE_NUMBER_DB = Path(
+    os.environ.get("QUOTE_NUMBER_DB", Path(__file__).parent.parent / ".state" / "quote_numbers.sqlite3")
+)
+QUOTE_NUMBER_BLOCK = int(os.environ.get("QUOTE_NUMBER_BLOCK", "1"))
+
+
+def format_quote_number(day: date, seq: int) -> str:
+    return f"Q-{day.strftime('%Y%m%d')}-{seq:03d}"
+
+
+class QuoteNumberAllocator:
+    def __init__(self, path: str | Path, block_size: int = QUOTE_NUMBER_BLOCK):
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1")
+        self.path = Path(path)
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._blocks: dict[str, list[int]] = {}  # 일자 → [다음 번호, 예약한 마지막 번호]
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sequences (day TEXT PRIMARY KEY, last INTEGER NOT NULL)"
+        )
+
+    def _reserve(self, day: str) -> list[int]:
+        (last,) = self._conn.execute(
+            "INSERT INTO sequences (day, last) VALUES (?, ?)"
+            " ON CONFLICT (day) DO UPDATE SET last = last + excluded.last RETURNING last",
+            (day, self.block_size),
+        ).fetchone()
+        return [last - self.block_size + 1, last]
+
+    def allocate(self, day: date | None = None) -> str:
+        day = day or date.today()
+        key = day.isoformat()
+        with self._lock:
+            block = self._blocks.get(key)
+            if block is None or block[0] > block[1]:
+                if block is None:
+                    self._blocks.clear()  # 지난 일자의 남은 번호는 버림
+                block = self._blocks[key] = self._reserve(key)
+            seq = block[0]
+            block[0] += 1
+        return format_quote_number(day, seq)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_allocator: QuoteNumberAllocator | None = None
+_allocator_lock = threading.Lock()
+
+
+def get_allocator() -> QuoteNumberAllocator:
+    global _allocator
+    if _allocator is None:
+        with _allocator_lock:
+            if _allocator is None:
+                _allocator = QuoteNumberAllocator(QUOTE_NUMBER_DB)
+    return _allocator
+
+
+def next_quote_number(day: date | None = None) -> str:
+    return get_allocator().allocate(day)
@@ -1,10 +1,45 @@
+"""
+Google Sheets 기록 모듈 (Sheets Connector)
+
+견적 1건 = 시트 1행. 견적 화면이 Sheets 응답을 기다리지 않도록 행을 로컬 아웃박스(SQLite)에 먼저 기록하고
+바로 반환합니다. Sheets가 느리거나 장애여도 행은 파일에 남아 있다가 나중에 전송됩니다.
+  - SheetWriter(drainer): 프로세스당 하나, gspread 클라이언트/스프레드시트/워크시트 핸들과 헤더 확인을 한 번만 수행
+  - 백그라운드 스레드가 SHEETS_BATCH_SIZE건이 모이거나 가장 오래된 행이 SHEETS_FLUSH_INTERVAL초를
+    넘기면 append_rows 한 번으로 기록
+  - 행마다 멱등 키("기록ID" 열)를 함께 기록 → 결과를 모르는 재시도는 시트에 이미 있는 키를 건너뛰어 중복 없음
+  - 할당량 초과(429)·서버 오류는 같은 연결로, 그 밖의 오류는 다시 연결해 지수 백오프로 재시도 (행은 버리지 않음)
+
+사용법:
+    python -m modules.sheets_connector stats    # 대기 건수(depth), 지연(lag_seconds), 마지막 오류
+    python -m modules.sheets_connector drain    # 아웃박스를 지금 비움
+"""
+
+import argparse
+import atexit
+import json
 import os
-from datetime import date, datetime
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from datetime import date
+from pathlib import Path
 
 import gspread
 from google.oauth2.service_account import Credentials
 
-from modules.quote_calculator import QuoteResult, load_pricing
+from modules import metrics
+from modules.outbox import Outbox
+from modules.quote_calculator import QuoteResult, get_pricing
+from modules.quote_number import next_quote_number
+
+SHEETS_BATCH_SIZE = int(os.environ.get("SHEETS_BATCH_SIZE", "20"))
+SHEETS_FLUSH_INTERVAL = float(os.environ.get("SHEETS_FLUSH_INTERVAL", "5"))
+SHEETS_OUTBOX_PATH = Path(
+    os.environ.get("SHEETS_OUTBOX_PATH", Path(__file__).parent.parent / ".outbox" / "sheets.sqlite3")
+)
+RETRY_DELAY = 1.0
+MAX_RETRY_DELAY = 64.0
 
 SCOPES = [
     "https://www.googleapis.com/auth/spreadsheets",
@@ -15,8 +50,9 @@ HEADER_ROW = [
     "견적서번호", "발행일", "고객명", "이메일",
     "언어쌍", "분야", "분량(원본)", "단위", "환산글자수",
     "글자당단가", "기본금액", "할증내역", "할증합계",
-    "소계", "VAT", "총견적금액", "납기일", "특이사항",
+    "소계", "VAT", "총견적금액", "납기일", "특이사항", "기록ID",
 ]
+KEY_COLUMN = len(HEADER_ROW)  # 멱등 키 열 (1부터 센 번호)
 
 
 def _get_client() -> gspread.Client:
@@ -34,32 +70,32 @@ def _get_or_create_sheet(client: gspread.Client) -> gspread.Worksheet:
         spreadsheet.share("", perm_type="anyone", role="writer")
 
     worksheet = spreadsheet.sheet1
-    if worksheet.row_count == 0 or worksheet.acell("A1").value != HEADER_ROW[0]:
+    if worksheet.row_count == 0 or worksheet.row_values(1) != HEADER_ROW:
         worksheet.update([HEADER_ROW], "A1")
 
     return worksheet
 
 
-def save_quote_to_sheets(
+def quote_row(
     result: QuoteResult,
     client_name: str,
     client_email: str,
     deadline: date,
     notes: str = "",
     quote_number: str | None = None,
-) -> bool:
-    pricing = load_pricing()
-    lang_label = pricing["language_pairs"][result.language_pair]
-    domain_label = pricing["domains"][result.domain]
+) -> list:
+    pricing = get_pricing()
+    lang_label = pricing.language_pair_labels[result.language_pair]
+    domain_label = pricing.domain_labels[result.domain]
 
     if quote_number is None:
-        quote_number = f"Q-{date.today().strftime('%Y%m%d')}-001"
+        quote_number = next_quote_number()
 
     surcharge_labels = ", ".join(
         f"{s['label']}(+{int(s['rate']*100)}%)" for s in result.surcharges
     ) or "-"
 
-    row = [
+    return [
         quote_number,
         date.today().strftime("%Y-%m-%d"),
         client_name,
@@ -80,7 +116,216 @@ def save_quote_to_sheets(
         notes or "-",
     ]
 
-    gc = _get_client()
-    worksheet = _get_or_create_sheet(gc)
-    worksheet.append_row(row, value_input_option="USER_ENTERED")
+
+def _is_transient(error: Exception) -> bool:
+    """할당량 초과(429)나 서버 오류: 같은 연결로 기다렸다가 다시 보내면 된다."""
+    return isinstance(error, gspread.exceptions.APIError) and (error.code == 429 or error.code >= 500)
+
+
+class SheetWriter:
+    """아웃박스에 쌓인 행을 백그라운드 스레드에서 append_rows로 기록한다 (drainer)."""
+
+    def __init__(
+        self,
+        open_worksheet: Callable[[], gspread.Worksheet] | None = None,
+        outbox: Outbox | None = None,
+        batch_size: int = SHEETS_BATCH_SIZE,
+        flush_interval: float = SHEETS_FLUSH_INTERVAL,
+        retry_delay: float = RETRY_DELAY,
+    ):
+        self._open_worksheet = open_worksheet or (lambda: _get_or_create_sheet(_get_client()))
+        self.outbox = outbox or Outbox(SHEETS_OUTBOX_PATH)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_delay = retry_delay
+
+        self._worksheet: gspread.Worksheet | None = None
+        self._flush_requested = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self.stats = {"queued": 0, "written": 0, "skipped": 0, "batches": 0, "retries": 0, "last_error": None}
+
+    def start(self) -> None:
+        """drainer 스레드 시작. 이전 실행에서 남은 행도 이어서 보낸다."""
+        with self._cond:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name="sheet-writer", daemon=True)
+                self._thread.start()
+
+    def enqueue(self, row: list, key: str | None = None) -> str:
+        """행을 아웃박스에 기록하고 멱등 키를 반환한다. 같은 키는 시트에 한 번만 기록된다."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("SheetWriter is closed")
+        key = key or uuid.uuid4().hex
+        if self.outbox.put(key, row):
+            self.stats["queued"] += 1
+        self.start()
+        with self._cond:
+            self._cond.notify_all()
+        return key
+
+    def pending(self) -> int:
+        return self.outbox.stats()["depth"]
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """아웃박스를 바로 비우고 끝날 때까지 기다린다. 시간 안에 비우면 True."""
+        self.start()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            while self.pending():
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining if remaining is not None else self.flush_interval)
+            return True
+
+    def close(self, timeout: float | None = None) -> bool:
+        """남은 행을 한 번 더 보내 보고 스레드를 멈춘다. 보내지 못한 행은 아웃박스에 남는다."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
+
+    # ── 백그라운드 스레드 ──
+
+    def _wait_timeout(self) -> float | None:
+        """보낼 때가 됐으면 None, 아니면 기다릴 시간."""
+        if self._closed or self._flush_requested:
+            return None
+        count, oldest = self.outbox.ready()
+        if count >= self.batch_size:
+            return None
+        if count:
+            remaining = oldest + self.flush_interval - time.time()
+            return remaining if remaining > 0 else None
+        # 다른 프로세스가 넣은 행이나 임대가 만료된 행도 주기적으로 확인
+        return self.flush_interval
+
+    def _run(self) -> None:
+        delay = self.retry_delay
+        while True:
+            with self._cond:
+                timeout = self._wait_timeout()
+                while timeout is not None:
+                    self._cond.wait(timeout)
+                    timeout = self._wait_timeout()
+
+            batch = self.outbox.claim(self.batch_size)
+            if not batch:
+                with self._cond:
+                    self._flush_requested = False
+                    self._cond.notify_all()
+                    if self._closed:
+                        return
+                continue
+
+            ok = self._write(batch)
+            with self._cond:
+                self._cond.notify_all()
+                if ok:
+                    delay = self.retry_delay
+                    continue
+                if self._closed:
+                    return  # 남은 행은 다음 실행에서 보냄
+                self.stats["retries"] += 1
+                self._cond.wait(delay)
+                delay = min(delay * 2, MAX_RETRY_DELAY)
+
+    def _write(self, batch: list[tuple[str, list, int]]) -> bool:
+        keys = [key for key, _, _ in batch]
+        try:
+            if self._worksheet is None:
+                with metrics.timer(metrics.SHEETS_REQUEST_SECONDS, op="open"):
+                    self._worksheet = self._open_worksheet()  # 클라이언트 인증 + 헤더 확인은 여기서 한 번만
+            if any(attempts > 1 for _, _, attempts in batch):
+                # 이전 시도가 시트에 반영됐는지 알 수 없는 묶음 → 이미 기록된 키는 건너뜀
+                with metrics.timer(metrics.SHEETS_REQUEST_SECONDS, op="col_values"):
+                    written = set(self._worksheet.col_values(KEY_COLUMN))
+                skipped = [key for key in keys if key in written]
+                if skipped:
+                    self.outbox.ack(skipped)
+                    self.stats["skipped"] += len(skipped)
+                    metrics.inc(metrics.SHEETS_ROWS, len(skipped), outcome="skipped")
+                batch = [item for item in batch if item[0] not in written]
+            if batch:
+                with metrics.timer(metrics.SHEETS_REQUEST_SECONDS, op="append_rows"):
+                    self._worksheet.append_rows(
+                        [[*row, key] for key, row, _ in batch], value_input_option="USER_ENTERED",
+                    )
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            metrics.inc(metrics.SHEETS_ROWS, len(batch), outcome="retried")
+            self.stats["last_error"] = error
+            if not _is_transient(e):
+                self._worksheet = None  # 인증 만료/연결 끊김 등: 다음 시도에서 다시 연결
+            self.outbox.release([key for key, _, _ in batch], error)
+            return False
+        self.outbox.ack([key for key, _, _ in batch])
+        if batch:
+            metrics.inc(metrics.SHEETS_ROWS, len(batch), outcome="written")
+        self.stats["written"] += len(batch)
+        self.stats["batches"] += 1
+        return True
+
+
+_writer: SheetWriter | None = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> SheetWriter:
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = SheetWriter()
+                _writer.start()
+                # 종료 시 남은 행을 한 번 더 보내 봄 (실패해도 아웃박스에 남음)
+                atexit.register(_writer.close, SHEETS_FLUSH_INTERVAL)
+    return _writer
+
+
+def outbox_stats() -> dict:
+    """아웃박스 대기 건수/지연과 이 프로세스 drainer의 처리 통계."""
+    writer = get_writer()
+    return {**writer.outbox.stats(), "writer": dict(writer.stats)}
+
+
+def save_quote_to_sheets(
+    result: QuoteResult,
+    client_name: str,
+    client_email: str,
+    deadline: date,
+    notes: str = "",
+    quote_number: str | None = None,
+) -> bool:
+    """행을 로컬 아웃박스에 기록하고 바로 반환한다 (Sheets 호출은 SheetWriter 스레드에서)."""
+    row = quote_row(result, client_name, client_email, deadline, notes, quote_number)
+    get_writer().enqueue(row)
     return True
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Google Sheets 아웃박스 확인/전송")
+    parser.add_argument("command", choices=["stats", "drain"])
+    parser.add_argument("--timeout", type=float, default=None, help="drain 최대 대기 시간(초)")
+    args = parser.parse_args(argv)
+
+    if args.command == "drain":
+        writer = get_writer()
+        drained = writer.flush(args.timeout)
+        writer.close(SHEETS_FLUSH_INTERVAL)
+        print(json.dumps({"drained": drained, **writer.outbox.stats(), "writer": writer.stats}, ensure_ascii=False))
+    else:
+        print(json.dumps(Outbox(SHEETS_OUTBOX_PATH).stats(), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+분량 카운터 모듈 (Volume Counter)
+
+텍스트를 조각(페이지/문단) 단위로 받아 한 번의 순회로 다음을 누적합니다.
+  - 글자 수: 공백(" ")과 줄바꿈("\n")을 제외한 문자 수 (기존 count_volume 기준과 동일)
+  - 단어 수: str.split() 기준, 조각 경계에서 이어지는 단어는 한 번만 셈
+  - 문자 체계 비중: 한글 / 가나 / 한자 / 라틴 문자 수
+  - 언어 감지용 앞부분 샘플
+전체 텍스트를 이어 붙이거나 replace()로 복사하지 않습니다.
+"""
+
+import re
+
+# 문자 체계별 연속 구간을 한 번의 finditer로 분류 (그룹 번호 = SCRIPTS 인덱스 + 1)
+SCRIPTS = ("hangul", "kana", "han", "latin")
+_SCRIPT_RUNS = re.compile(
+    "([\u1100-\u11ff\u3130-\u318f\uac00-\ud7a3]+)"  # 한글 자모/호환 자모/음절
+    "|([\u3040-\u30ff\u31f0-\u31ff\uff66-\uff9f]+)"  # 히라가나/가타카나
+    "|([\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+)"  # CJK 한자
+    "|([A-Za-z\u00c0-\u024f]+)"  # 라틴
+)
+
+
+class VolumeCounter:
+    __slots__ = ("char_count", "word_count", "script_counts", "sample", "sample_chars", "has_text", "_in_word")
+
+    def __init__(self, sample_chars: int = 1000):
+        self.char_count = 0
+        self.word_count = 0
+        self.script_counts = [0] * len(SCRIPTS)
+        self.sample = ""
+        self.sample_chars = sample_chars
+        self.has_text = False
+        self._in_word = False
+
+    def feed(self, chunk: str) -> None:
+        if not chunk:
+            return
+
+        self.char_count += len(chunk) - chunk.count(" ") - chunk.count("\n")
+        self.word_count += len(chunk.split())
+        if self._in_word and not chunk[0].isspace():
+            self.word_count -= 1  # 앞 조각의 마지막 단어와 이어짐
+        self._in_word = not chunk[-1].isspace()
+        self.has_text = self.has_text or not chunk.isspace()
+
+        counts = self.script_counts
+        for m in _SCRIPT_RUNS.finditer(chunk):
+            counts[m.lastindex - 1] += m.end() - m.start()
+
+        if len(self.sample) < self.sample_chars:
+            self.sample += chunk[:self.sample_chars - len(self.sample)]
+
+    @property
+    def script_ratios(self) -> dict:
+        """문자 체계별 비중 (분모: 글자 수)."""
+        total = self.char_count or 1
+        return {name: round(count / total, 4) for name, count in zip(SCRIPTS, self.script_counts)}
@@ -0,0 +1,46 @@
+"""
+사전 준비 모듈 (Warm-up)
+
+사이드바/결과 화면에서 처음 쓰는 무거운 모듈을 사용자가 입력하는 동안 백그라운드에서 미리 import합니다.
+서버 프로세스당 한 번만 시작하며, 이후 호출은 플래그 확인만 하므로 Streamlit rerun마다 불러도 된다.
+"""
+
+import importlib
+import threading
+
+# openai, pdfplumber, docx, gspread, reportlab 등을 끌어오는 모듈
+# pandas는 결과 화면의 st.table이 처음 호출될 때 Streamlit이 import한다 (~0.5초)
+WARM_MODULES = (
+    "modules.email_parser",
+    "modules.file_analyzer",
+    "modules.pdf_generator",
+    "modules.sheets_connector",
+    "pandas",
+)
+
+_thread: threading.Thread | None = None
+_lock = threading.Lock()
+
+
+def _run() -> None:
+    for name in WARM_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass  # 미리 못 불러오면 처음 쓰는 화면에서 import (오류도 그때 표시)
+    try:
+        from templates.quote_template import warm_up
+        warm_up()
+    except Exception:
+        pass
+
+
+def start() -> threading.Thread:
+    """준비 스레드를 (처음 한 번만) 시작하고 돌려준다."""
+    global _thread
+    if _thread is None:
+        with _lock:
+            if _thread is None:
+                _thread = threading.Thread(target=_run, name="app-warm-up", daemon=True)
+                _thread.start()
+    return _thread
@@ -0,0 +1,219 @@
+"""
+견적서 고속 렌더링 (Compiled Quote Template)
+
+견적서 레이아웃은 할증 행 수와 특이사항 유무만 정해지면 거의 고정이므로,
+Platypus 배치(build_quote_pdf + doc.build)를 한 번만 실행해 각 요소가 놓인 자리(좌표, 가용 폭/높이)를
+기록해 두고, 문서마다 페이지 템플릿/Frame/분할 판단 없이 캔버스의 같은 자리에 바로 그립니다.
+  - 값이 없는 요소(제목, 구분선, 소제목, 고정 문구) → 배치 때 wrap해 둔 flowable을 그대로 다시 그림
+  - 값이 있는 요소(표, 유효기간/특이사항 문구) → 새로 만든 flowable을 기록된 가용 폭으로 wrap해서 그림
+
+ReportLab 공개 API(Flowable.wrapOn/drawOn/hAlign, Canvas)만 사용합니다.
+무엇이 고정이고 무엇이 값인지는 서로 다른 두 견본 데이터로 배치해 비교해서 정하므로,
+build_quote_pdf를 수정해도 이 모듈은 그대로 따라간다. 값 때문에 요소 높이가 견본과 달라지면
+(줄바꿈이 든 셀 값, 여러 줄로 넘치는 문구 등) 아래 요소가 밀리므로 None을 반환해 호출 측이
+Platypus 경로로 렌더링하게 한다. 마지막 문구만은 페이지 안에 들어가는 한 길어져도 된다.
+"""
+
+import io
+import threading
+
+from reportlab.lib.enums import TA_CENTER, TA_RIGHT
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Paragraph, Spacer, Table
+
+from templates import quote_template
+from templates.quote_template import build_quote_pdf, make_doc_template
+
+_local = threading.local()
+
+# 높이 비교 허용 오차 (pt)
+_FUZZ = 1e-6
+
+
+class _Slot:
+    """요소 하나가 놓인 자리. static이 있으면 그 flowable을 그대로, 없으면 문서별 flowable을 그린다."""
+
+    __slots__ = ("x", "top", "avail_width", "avail_height", "width", "height", "static")
+
+    def __init__(self, x, top, avail_width, avail_height, width, height, static):
+        self.x = x
+        self.top = top
+        self.avail_width = avail_width
+        self.avail_height = avail_height
+        self.width = width
+        self.height = height
+        self.static = static
+
+
+class _Plan:
+    """할증 행 수/특이사항 유무별로 한 번 배치한 결과 (스레드별 보관: 고정 flowable을 그리면서 canv를 바꾸므로)."""
+
+    __slots__ = ("sheet", "slots", "last_text")
+
+    def __init__(self, sheet, slots, last_text):
+        self.sheet = sheet
+        self.slots = slots
+        self.last_text = last_text  # 높이가 달라져도 되는 마지막 문구의 순번 (없으면 None)
+
+
+def _sample(n_surcharges: int, has_notes: bool, variant: int) -> dict:
+    # 두 견본은 값 필드가 모두 서로 다르다 → 같은 내용의 문단은 고정 요소로 판단
+    v = variant + 1
+    return {
+        "quote_number": f"Q-0000000{v}-00{v}",
+        "issue_date": f"2000-01-0{v}",
+        "valid_until": f"2000-01-1{v}",
+        "client_name": f"client {v}",
+        "client_email": f"c{v}@example.com",
+        "deadline": f"2000-02-0{v}",
+        "translation_label": f"label {v}",
+        "converted_chars": v,
+        "unit_price": v,
+        "base_amount": v,
+        "surcharges": [
+            {"key": f"s{i}", "label": f"surcharge {i} {v}", "rate": v / 100, "amount": v}
+            for i in range(n_surcharges)
+        ],
+        "subtotal": v,
+        "vat": v,
+        "total": v,
+        "notes": f"notes {v}" if has_notes else "",
+    }
+
+
+def _is_static(a, b) -> bool:
+    if isinstance(a, Table):
+        return False  # 표에는 항상 값 셀이 있다
+    if isinstance(a, Paragraph):
+        return a.text == b.text
+    return True  # 구분선, 여백
+
+
+def _record_layout(elements: list) -> dict:
+    """Platypus로 한 번 배치하며 요소별 (가용 폭, 가용 높이, 폭, 높이, x, y, 쪽)을 기록한다."""
+    layout = {}
+    for index, element in enumerate(elements):
+        wrap, draw_on = element.wrap, element.drawOn
+
+        def record_wrap(avail_width, avail_height, _index=index, _wrap=wrap):
+            width, height = _wrap(avail_width, avail_height)
+            layout[_index] = [avail_width, avail_height, width, height]  # Frame이 다시 wrap하면 마지막 값
+            return width, height
+
+        def record_draw(canv, x, y, *args, _index=index, _draw_on=draw_on, **kwargs):
+            layout[_index] += [x, y, canv.getPageNumber()]
+            return _draw_on(canv, x, y, *args, **kwargs)
+
+        element.wrap, element.drawOn = record_wrap, record_draw
+    make_doc_template(io.BytesIO()).build(list(elements))  # build()는 목록을 비운다
+    for element in elements:
+        del element.wrap, element.drawOn
+    return layout
+
+
+def _compile(n_surcharges: int, has_notes: bool, sheet) -> _Plan | None:
+    samples = [_sample(n_surcharges, has_notes, variant) for variant in (0, 1)]
+    elements, other = (build_quote_pdf(data) for data in samples)
+    if len(elements) != len(other) or any(type(a) is not type(b) for a, b in zip(elements, other)):
+        return None
+
+    layout = _record_layout(elements)
+    if len(layout) != len(elements) or any(len(v) != 7 or v[6] != 1 for v in layout.values()):
+        return None  # 한 페이지에 들어가지 않는(또는 그려지지 않은 요소가 있는) 배치는 고속 경로 대상이 아님
+
+    slots = []
+    for index, (a, b) in enumerate(zip(elements, other)):
+        avail_width, avail_height, width, height, x, y, _ = layout[index]
+        static = a if _is_static(a, b) else None
+        slots.append(_Slot(x, y + height, avail_width, avail_height, width, height, static))
+
+    # 뒤에 여백만 남은 마지막 값 문단(특이사항/유효기간)은 길어져도 아래로 밀 요소가 없다
+    last_text = None
+    for index in range(len(elements) - 1, -1, -1):
+        if not isinstance(elements[index], Spacer):
+            if isinstance(elements[index], Paragraph) and slots[index].static is None:
+                last_text = index
+            break
+    return _Plan(sheet, slots, last_text)
+
+
+def _get_plan(n_surcharges: int, has_notes: bool) -> _Plan | None:
+    sheet = quote_template._get_stylesheet()
+    plans = getattr(_local, "plans", None)
+    if plans is None or plans.get("sheet") is not sheet:
+        # 폰트가 바뀌면(configure_font) 스타일시트가 새로 만들어지므로 배치도 다시 한다.
+        plans = _local.plans = {"sheet": sheet}
+    key = (quote_template.TEMPLATE_VERSION, n_surcharges, has_notes)
+    if key not in plans:
+        plans[key] = _compile(n_surcharges, has_notes, sheet)
+    return plans[key]
+
+
+def _aligned_x(flowable, x: float, slack: float) -> float:
+    # Frame이 drawOn에 넘기는 남는 폭(aW - w)만큼 hAlign에 따라 옮긴다
+    align = getattr(flowable, "hAlign", "LEFT")
+    if align in ("CENTER", "CENTRE", TA_CENTER):
+        return x + slack / 2
+    if align in ("RIGHT", TA_RIGHT):
+        return x + slack
+    return x
+
+
+def _make_canvas(buffer, canvasmaker) -> canvas.Canvas:
+    """make_doc_template과 같은 페이지 크기/문서 정보의 캔버스."""
+    doc = make_doc_template(buffer)
+    canv = canvasmaker(
+        buffer,
+        pagesize=doc.pagesize,
+        invariant=doc.invariant,
+        pageCompression=doc.pageCompression,
+        initialFontName=doc.initialFontName,
+        initialFontSize=doc.initialFontSize,
+        initialLeading=doc.initialLeading,
+    )
+    canv.setAuthor(doc.author)
+    canv.setTitle(doc.title)
+    canv.setSubject(doc.subject)
+    canv.setCreator(doc.creator)
+    canv.setProducer(doc.producer)
+    canv.setKeywords(doc.keywords)
+    return canv
+
+
+def render_compiled(data: dict, canvasmaker=canvas.Canvas) -> bytes | None:
+    """PDF 바이트. 미리 배치한 레이아웃으로 그릴 수 없는 입력이면 None (Platypus 경로 사용).
+
+    canvasmaker는 doc.build의 같은 이름 인자처럼 canvas.Canvas 대신 쓸 클래스(팩토리)다.
+    """
+    plan = _get_plan(len(data["surcharges"]), bool(data.get("notes")))
+    if plan is None:
+        return None
+
+    elements = build_quote_pdf(data)
+    if len(elements) != len(plan.slots):
+        return None
+
+    buffer = io.BytesIO()
+    canv = _make_canvas(buffer, canvasmaker)
+    placed = []
+    for index, (slot, element) in enumerate(zip(plan.slots, elements)):
+        flowable = slot.static
+        if flowable is None:
+            flowable = element
+            # 폭이 넘치는 표는 Platypus처럼 그대로 그린다 (hAlign 기준 음수 여백으로 정렬)
+            width, height = flowable.wrapOn(canv, slot.avail_width, slot.avail_height)
+            if abs(height - slot.height) > _FUZZ:
+                # 높이가 달라지면 아래 요소가 밀린다. 마지막 문구는 페이지 안에 들어가면 그대로 그림
+                if index != plan.last_text or height > slot.avail_height:
+                    return None
+        else:
+            width, height = slot.width, slot.height
+        placed.append((flowable, slot, width, height))
+
+    for flowable, slot, width, height in placed:
+        x = _aligned_x(flowable, slot.x, slot.avail_width - width)
+        flowable.drawOn(canv, x, slot.top - height)
+
+    canv.showPage()
+    canv.save()
+    return buffer.getvalue()
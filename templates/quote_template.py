@@ -8,17 +8,26 @@ from reportlab.platypus import (
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from pathlib import Path
+from types import MappingProxyType
+import os
 import platform
+import threading
+
+# 레이아웃/스타일을 바꾸면 올린다 (PDF 캐시 키에 포함)
+TEMPLATE_VERSION = "1"
 
 # ── 한글 폰트 등록 ──
-_font_registered = False
+# 폰트 탐색은 프로세스당 한 번만 하고, 실패(Helvetica 대체)도 결과로 기억한다.
+# KOREAN_FONT_PATH 환경 변수 또는 configure_font(path)로 폰트 파일을 지정할 수 있다.
+KOREAN_FONT_PATH = os.environ.get("KOREAN_FONT_PATH") or None
+FALLBACK_FONT = "Helvetica"
 
+_font_lock = threading.Lock()
+_font_name: str | None = None
+_stylesheet = None
 
-def _register_korean_font():
-    global _font_registered
-    if _font_registered:
-        return
 
+def _candidate_font_paths() -> list[str]:
     font_paths = []
     if platform.system() == "Darwin":
         font_paths = [
@@ -34,22 +43,39 @@ def _register_korean_font():
         font_paths = [
             "C:/Windows/Fonts/malgun.ttf",
         ]
+    if KOREAN_FONT_PATH:
+        font_paths.insert(0, KOREAN_FONT_PATH)
+    return font_paths
+
 
-    for fp in font_paths:
+def _register_korean_font() -> str:
+    for fp in _candidate_font_paths():
         if Path(fp).exists():
             try:
                 pdfmetrics.registerFont(TTFont("Korean", fp))
-                _font_registered = True
-                return
+                return "Korean"
             except Exception:
                 continue
-
-    _font_registered = False
+    return FALLBACK_FONT
 
 
 def get_korean_font() -> str:
-    _register_korean_font()
-    return "Korean" if _font_registered else "Helvetica"
+    global _font_name
+    if _font_name is None:
+        with _font_lock:
+            if _font_name is None:
+                _font_name = _register_korean_font()
+    return _font_name
+
+
+def configure_font(path: str | None = None) -> str:
+    """폰트 경로를 바꾸고 다시 탐색한다. 미리 만든 스타일도 새 폰트로 다시 만든다."""
+    global KOREAN_FONT_PATH, _font_name, _stylesheet
+    with _font_lock:
+        KOREAN_FONT_PATH = path
+        _font_name = None
+        _stylesheet = None
+    return get_korean_font()
 
 
 # ── 스타일 ──
@@ -58,22 +84,18 @@ LIGHT_GRAY = colors.HexColor("#f5f5f5")
 DARK_GRAY = colors.HexColor("#333333")
 
 
-def _styles():
-    font = get_korean_font()
-    return {
+def _build_stylesheet(font: str) -> MappingProxyType:
+    paragraph = MappingProxyType({
         "title": ParagraphStyle("title", fontName=font, fontSize=18, textColor=BLUE, spaceAfter=4),
         "subtitle": ParagraphStyle("subtitle", fontName=font, fontSize=9, textColor=colors.gray),
         "heading": ParagraphStyle("heading", fontName=font, fontSize=12, textColor=DARK_GRAY, spaceBefore=12, spaceAfter=6),
         "body": ParagraphStyle("body", fontName=font, fontSize=10, textColor=DARK_GRAY, leading=14),
         "small": ParagraphStyle("small", fontName=font, fontSize=8, textColor=colors.gray),
         "total": ParagraphStyle("total", fontName=font, fontSize=14, textColor=BLUE, alignment=2),
-    }
-
+    })
 
-# ── 테이블 공통 스타일 ──
-def _base_table_style():
-    font = get_korean_font()
-    return TableStyle([
+    # 테이블 공통 스타일
+    base = [
         ("FONTNAME", (0, 0), (-1, -1), font),
         ("FONTSIZE", (0, 0), (-1, -1), 10),
         ("TEXTCOLOR", (0, 0), (-1, -1), DARK_GRAY),
@@ -88,43 +110,84 @@ def _base_table_style():
         # 줄무늬
         ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, LIGHT_GRAY]),
         ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#dddddd")),
-    ])
+    ]
+    info = [
+        ("FONTNAME", (0, 0), (-1, -1), font),
+        ("FONTSIZE", (0, 0), (-1, -1), 9),
+        ("TEXTCOLOR", (0, 0), (-1, -1), DARK_GRAY),
+        ("TEXTCOLOR", (0, 0), (0, -1), BLUE),
+        ("TEXTCOLOR", (2, 0), (2, -1), BLUE),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
+    ]
+    total = [
+        ("FONTNAME", (0, 0), (-1, -1), font),
+        ("FONTSIZE", (0, 0), (-1, -1), 10),
+        ("ALIGN", (1, 0), (1, -1), "RIGHT"),
+        ("TEXTCOLOR", (0, 0), (-1, -1), DARK_GRAY),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
+        ("TOPPADDING", (0, 0), (-1, -1), 8),
+        ("LINEABOVE", (0, -1), (-1, -1), 1.5, BLUE),
+        ("FONTSIZE", (0, -1), (-1, -1), 13),
+        ("TEXTCOLOR", (0, -1), (-1, -1), BLUE),
+    ]
+    # Table.setStyle()은 명령을 복사만 하므로 TableStyle 객체를 문서 간에 공유해도 된다.
+    return MappingProxyType({
+        "font": font,
+        "paragraph": paragraph,
+        "base_table": TableStyle(base),
+        "info_table": TableStyle(info),
+        "detail_table": TableStyle(base + [("ALIGN", (1, 0), (-1, -1), "RIGHT")]),
+        "total_table": TableStyle(total),
+    })
 
 
-def build_quote_pdf(data: dict) -> list:
-    """PDF 요소(flowables) 리스트를 반환한다."""
-    s = _styles()
-    elements = []
+def _get_stylesheet() -> MappingProxyType:
+    global _stylesheet
+    sheet = _stylesheet
+    if sheet is None:
+        font = get_korean_font()
+        with _font_lock:
+            if _stylesheet is None:
+                _stylesheet = _build_stylesheet(font)
+            sheet = _stylesheet
+    return sheet
 
-    # ── 헤더 ──
-    elements.append(Paragraph("견 적 서", s["title"]))
-    elements.append(Paragraph("QUOTATION", s["subtitle"]))
-    elements.append(Spacer(1, 4 * mm))
-    elements.append(HRFlowable(width="100%", thickness=1, color=BLUE))
-    elements.append(Spacer(1, 6 * mm))
 
-    # ── 견적 정보 / 고객 정보 ──
-    font = get_korean_font()
-    info_data = [
+def _styles() -> MappingProxyType:
+    return _get_stylesheet()["paragraph"]
+
+
+def _base_table_style() -> TableStyle:
+    return _get_stylesheet()["base_table"]
+
+
+def warm_up() -> None:
+    """폰트 등록과 스타일 생성을 미리 해 둔다 (첫 PDF 생성 지연 제거)."""
+    _get_stylesheet()
+
+
+# ── 페이지 설정 ──
+def make_doc_template(buffer) -> SimpleDocTemplate:
+    return SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        topMargin=30,
+        bottomMargin=30,
+        leftMargin=40,
+        rightMargin=40,
+    )
+
+
+# ── 데이터 → 표/문단 내용 (Platypus 경로와 quote_compiled 고속 경로가 공유) ──
+def _info_rows(data: dict) -> list:
+    return [
         ["견적서 번호", data["quote_number"], "수신", data["client_name"]],
         ["발행일", data["issue_date"], "이메일", data["client_email"]],
         ["유효기간", data["valid_until"], "납기일", data["deadline"]],
     ]
-    info_table = Table(info_data, colWidths=[70, 130, 50, None])
-    info_table.setStyle(TableStyle([
-        ("FONTNAME", (0, 0), (-1, -1), font),
-        ("FONTSIZE", (0, 0), (-1, -1), 9),
-        ("TEXTCOLOR", (0, 0), (-1, -1), DARK_GRAY),
-        ("TEXTCOLOR", (0, 0), (0, -1), BLUE),
-        ("TEXTCOLOR", (2, 0), (2, -1), BLUE),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
-    ]))
-    elements.append(info_table)
-    elements.append(Spacer(1, 8 * mm))
 
-    # ── 견적 상세 ──
-    elements.append(Paragraph("견적 상세", s["heading"]))
 
+def _detail_rows(data: dict) -> list:
     detail_header = ["항목", "분량", "단가", "할증", "금액"]
     detail_rows = [detail_header]
 
@@ -146,49 +209,71 @@ def build_quote_pdf(data: dict) -> list:
             f'+{int(s_item["rate"] * 100)}%',
             f'{s_item["amount"]:,}원',
         ])
+    return detail_rows
 
-    detail_table = Table(detail_rows, colWidths=[150, 70, 70, 50, None])
-    style = _base_table_style()
-    style.add("ALIGN", (1, 0), (-1, -1), "RIGHT")
-    detail_table.setStyle(style)
-    elements.append(detail_table)
-    elements.append(Spacer(1, 6 * mm))
 
-    # ── 합계 ──
-    elements.append(Paragraph("합계", s["heading"]))
-
-    total_rows = [
+def _total_rows(data: dict) -> list:
+    return [
         ["소계", f'{data["subtotal"]:,}원'],
         ["VAT (10%)", f'{data["vat"]:,}원'],
         ["총 견적금액", f'{data["total"]:,}원'],
     ]
-    total_table = Table(total_rows, colWidths=[None, 150])
-    total_table.setStyle(TableStyle([
-        ("FONTNAME", (0, 0), (-1, -1), font),
-        ("FONTSIZE", (0, 0), (-1, -1), 10),
-        ("ALIGN", (1, 0), (1, -1), "RIGHT"),
-        ("TEXTCOLOR", (0, 0), (-1, -1), DARK_GRAY),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
-        ("TOPPADDING", (0, 0), (-1, -1), 8),
-        ("LINEABOVE", (0, -1), (-1, -1), 1.5, BLUE),
-        ("FONTSIZE", (0, -1), (-1, -1), 13),
-        ("TEXTCOLOR", (0, -1), (-1, -1), BLUE),
-    ]))
-    elements.append(total_table)
-    elements.append(Spacer(1, 8 * mm))
 
-    # ── 부가 정보 ──
-    elements.append(HRFlowable(width="100%", thickness=0.5, color=colors.HexColor("#cccccc")))
-    elements.append(Spacer(1, 4 * mm))
 
+def _footer_lines(data: dict) -> list[str]:
     footer_lines = [
         f"결제조건: 납품 후 30일",
         f"유효기간: {data['issue_date']} ~ {data['valid_until']}",
     ]
     if data.get("notes"):
         footer_lines.append(f"특이사항: {data['notes']}")
+    return footer_lines
+
+
+# 문서에 나오는 순서대로의 표 내용 함수
+TABLE_ROWS = (_info_rows, _detail_rows, _total_rows)
+
+
+def build_quote_pdf(data: dict) -> list:
+    """PDF 요소(flowables) 리스트를 반환한다."""
+    sheet = _get_stylesheet()
+    s = sheet["paragraph"]
+    elements = []
+
+    # ── 헤더 ──
+    elements.append(Paragraph("견 적 서", s["title"]))
+    elements.append(Paragraph("QUOTATION", s["subtitle"]))
+    elements.append(Spacer(1, 4 * mm))
+    elements.append(HRFlowable(width="100%", thickness=1, color=BLUE))
+    elements.append(Spacer(1, 6 * mm))
+
+    # ── 견적 정보 / 고객 정보 ──
+    info_table = Table(_info_rows(data), colWidths=[70, 130, 50, None])
+    info_table.setStyle(sheet["info_table"])
+    elements.append(info_table)
+    elements.append(Spacer(1, 8 * mm))
+
+    # ── 견적 상세 ──
+    elements.append(Paragraph("견적 상세", s["heading"]))
+
+    detail_table = Table(_detail_rows(data), colWidths=[150, 70, 70, 50, None])
+    detail_table.setStyle(sheet["detail_table"])
+    elements.append(detail_table)
+    elements.append(Spacer(1, 6 * mm))
+
+    # ── 합계 ──
+    elements.append(Paragraph("합계", s["heading"]))
+
+    total_table = Table(_total_rows(data), colWidths=[None, 150])
+    total_table.setStyle(sheet["total_table"])
+    elements.append(total_table)
+    elements.append(Spacer(1, 8 * mm))
+
+    # ── 부가 정보 ──
+    elements.append(HRFlowable(width="100%", thickness=0.5, color=colors.HexColor("#cccccc")))
+    elements.append(Spacer(1, 4 * mm))
 
-    for line in footer_lines:
+    for line in _footer_lines(data):
         elements.append(Paragraph(line, s["small"]))
         elements.append(Spacer(1, 1 * mm))
 
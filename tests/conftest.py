@@ -0,0 +1,14 @@
+import pytest
+
+from modules import quote_number
+
+
+@pytest.fixture(autouse=True)
+def quote_numbers(tmp_path, monkeypatch):
+    """견적서 번호는 테스트마다 임시 파일에서 발급 (spawn 워커도 환경 변수로 같은 파일 사용)."""
+    path = tmp_path / "quote_numbers.sqlite3"
+    monkeypatch.setenv("QUOTE_NUMBER_DB", str(path))
+    allocator = quote_number.QuoteNumberAllocator(path)
+    monkeypatch.setattr(quote_number, "_allocator", allocator)
+    yield allocator
+    allocator.close()
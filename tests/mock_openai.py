@@ -0,0 +1,83 @@
+"""로컬 OpenAI 호환 목 서버 (테스트/벤치마크용). /v1/chat/completions만 구현한다."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        server: MockOpenAIServer = self.server.owner
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.requests.append(body)
+            server.connections.add(self.client_address)
+            status = server.fail_statuses.pop(0) if server.fail_statuses else 200
+
+        if server.delay:
+            time.sleep(server.delay)
+
+        if status != 200:
+            payload = {"error": {"message": "mock failure", "type": "server_error"}}
+            headers = {"retry-after-ms": "10"}
+        else:
+            content = server.reply(body)
+            payload = {
+                "id": "chatcmpl-mock",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "mock"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }],
+                "usage": {
+                    "prompt_tokens": sum(len(m["content"]) for m in body["messages"]) // 4,
+                    "completion_tokens": len(content) // 4,
+                    "total_tokens": 0,
+                },
+            }
+            headers = {}
+
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class MockOpenAIServer:
+    def __init__(self, reply=None, delay: float = 0.0):
+        self.reply = reply or (lambda body: json.dumps({"domain": "general", "confidence": 1.0}))
+        self.delay = delay
+        self.requests: list[dict] = []
+        self.connections: set = set()
+        self.fail_statuses: list[int] = []
+        self.lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.owner = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address
+        return f"http://{host}:{port}/v1"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
@@ -0,0 +1,148 @@
+import pytest
+from starlette.testclient import TestClient
+
+import api
+from modules import metrics
+from modules.quote_calculator import calculate_quote
+
+QUOTE = {"language_pair": "ko-en", "domain": "legal", "volume": 5000, "surcharge_keys": ["urgent"]}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(api, "PDF_WORKERS", 0)
+    with TestClient(api.app) as c:
+        yield c
+
+
+class TestQuoteEndpoints:
+    def test_quote_matches_calculator(self, client):
+        response = client.post("/quote", json=QUOTE)
+        assert response.status_code == 200
+        assert response.json()["total"] == calculate_quote(**QUOTE).total
+
+    @pytest.mark.parametrize("body, message", [
+        ({**QUOTE, "surcharge_keys": ["urgent", "semi_urgent"]}, "mutually exclusive"),
+        ({**QUOTE, "surcharge_keys": ["nope"]}, "Unknown surcharge"),
+        ({**QUOTE, "surcharge_keys": ["dtp", "dtp"]}, "Duplicate surcharges"),
+        ({**QUOTE, "language_pair": "xx-yy"}, "Unknown language pair"),
+        ({**QUOTE, "volume": -1}, "Invalid volume"),
+        ({**QUOTE, "volume": "5000"}, "Invalid volume"),
+        ({"domain": "legal", "volume": 1}, "Missing field: language_pair"),
+    ])
+    def test_invalid_quote(self, client, body, message):
+        response = client.post("/quote", json=body)
+        assert response.status_code == 400
+        assert message in response.json()["error"]
+
+    def test_invalid_json(self, client):
+        response = client.post("/quote", content=b"{", headers={"content-type": "application/json"})
+        assert response.status_code == 400
+
+    def test_batch_reports_errors_per_item(self, client):
+        items = [
+            QUOTE,
+            {**QUOTE, "surcharge_keys": ["nope"]},
+            {"language_pair": "en-ko", "domain": "medical", "volume": 3, "volume_unit": "pages"},
+            {**QUOTE, "volume_unit": "lines"},
+            {**QUOTE, "domain": "cooking"},
+        ]
+        response = client.post("/quotes/batch", json={"quotes": items})
+        assert response.status_code == 200
+        body = response.json()
+        assert (body["count"], body["errors"]) == (5, 3)
+        quotes = body["quotes"]
+        assert quotes[0]["total"] == calculate_quote(**QUOTE).total
+        assert quotes[2]["total"] == calculate_quote("en-ko", "medical", 3, "pages").total
+        assert "Unknown surcharge" in quotes[1]["error"]
+        assert "Unknown volume unit" in quotes[3]["error"]
+        assert "Unknown domain" in quotes[4]["error"]
+
+    def test_batch_matches_single_quotes(self, client):
+        items = [
+            {**QUOTE, "surcharge_keys": ["dtp", "urgent"]},
+            {**QUOTE, "surcharge_keys": ["urgent", "dtp"]},
+            {**QUOTE, "surcharge_keys": ["dtp", "dtp"]},
+            {"language_pair": "en-ko", "domain": "medical", "volume": 3, "volume_unit": "pages"},
+        ]
+        batch = client.post("/quotes/batch", json={"quotes": items}).json()["quotes"]
+        assert batch == [client.post("/quote", json=item).json() for item in items]
+        assert "Duplicate surcharges" in batch[2]["error"]
+
+    def test_batch_size_limit(self, client, monkeypatch):
+        monkeypatch.setattr(api, "MAX_BATCH_SIZE", 2)
+        assert client.post("/quotes/batch", json={"quotes": [QUOTE] * 3}).status_code == 400
+        assert client.post("/quotes/batch", json={"quotes": []}).status_code == 400
+
+
+class TestPdfEndpoint:
+    def test_pdf(self, client):
+        body = {**QUOTE, "client_name": "홍길동", "client_email": "a@b.c", "deadline": "2026-10-30"}
+        first = client.post("/quote/pdf", json=body)
+        second = client.post("/quote/pdf", json=body)
+        assert first.status_code == 200
+        assert first.headers["content-type"] == "application/pdf"
+        assert first.content.startswith(b"%PDF")
+        assert first.headers["x-quote-number"] != second.headers["x-quote-number"]
+
+        given = client.post("/quote/pdf", json={**body, "quote_number": "Q-20261030-777"})
+        assert given.headers["x-quote-number"] == "Q-20261030-777"
+
+    def test_pdf_validation(self, client):
+        body = {**QUOTE, "client_name": "홍길동", "deadline": "30/10/2026"}
+        assert client.post("/quote/pdf", json=body).status_code == 400
+
+
+class TestAnalysisEndpoints:
+    def test_parse_email_rule_path(self, client):
+        response = client.post("/parse-email", json={
+            "sender": "kim@example.com",
+            "subject": "번역 견적 요청",
+            "body": "안녕하세요. 계약서 한영 번역 부탁드립니다. 분량은 약 5,000자이고 급하게 필요합니다.",
+        })
+        assert response.status_code == 200
+        parsed = response.json()
+        assert parsed["parsed_by"] == "rules"
+        assert parsed["volume"] == {"value": 5000, "unit": "chars"}
+
+    def test_analyze_upload(self, client, monkeypatch):
+        seen = []
+
+        async def fake_analyze_files(files):
+            seen.extend(files)
+            # 끝나는 순서(역순)로 내보내도 응답은 업로드 순서
+            for index, (name, data) in reversed(list(enumerate(files))):
+                yield {"type": "file", "index": index, "filename": name, "result": {"size": len(data)}}
+            yield {"type": "summary", "summary": {"files": len(files)}}
+
+        monkeypatch.setattr("modules.file_analyzer.analyze_files", fake_analyze_files)
+        response = client.post("/analyze", files=[
+            ("file", ("a.txt", "가나다".encode(), "text/plain")),
+            ("file", ("b.txt", b"hello world", "text/plain")),
+            ("file", ("a.txt", b"other folder", "text/plain")),  # 같은 파일명
+        ])
+        assert response.status_code == 200
+        assert response.json() == {
+            "files": [
+                {"filename": "a.txt", "result": {"size": 9}},
+                {"filename": "b.txt", "result": {"size": 11}},
+                {"filename": "a.txt", "result": {"size": 12}},
+            ],
+            "summary": {"files": 3},
+        }
+        assert client.post("/analyze", data={"x": "1"}).status_code == 400
+
+
+class TestMetricsEndpoint:
+    def test_metrics(self, client, monkeypatch):
+        metrics.reset()
+        monkeypatch.setattr(metrics, "_enabled", True)
+        client.post("/quote", json=QUOTE)
+
+        text = client.get("/metrics")
+        assert text.headers["content-type"].startswith("text/plain")
+        assert f'{metrics.STAGE_SECONDS}_count{{stage="calculate_quote"}} 1' in text.text.splitlines()
+        data = client.get("/metrics", params={"format": "json"}).json()
+        assert data["enabled"] is True
+        assert [h["labels"] for h in data["histograms"]] == [{"stage": "calculate_quote"}]
+        metrics.reset()
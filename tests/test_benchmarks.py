@@ -0,0 +1,35 @@
+from benchmarks import fixtures
+from benchmarks.suite import compare
+from modules.email_rules import extract_fields, unresolved_fields
+from modules.file_analyzer import count_volume, extract_text
+
+
+def _report(**medians):
+    return {"results": {name: {"median_s": value} for name, value in medians.items()}}
+
+
+class TestCompare:
+    def test_flags_only_items_past_threshold(self):
+        baseline = _report(a=1.0, b=1.0, c=1.0, gone=1.0)
+        current = _report(a=1.19, b=1.5, c=0.5, new=9.0)
+
+        regressions = compare(current, baseline, threshold=0.2)
+        assert [r["name"] for r in regressions] == ["b"]
+        assert regressions[0]["ratio"] == 1.5
+
+
+class TestFixtures:
+    def test_documents_are_deterministic_and_extractable(self, tmp_path):
+        first = fixtures.ensure_fixtures(tmp_path / "a", page_counts=(1,))
+        second = fixtures.ensure_fixtures(tmp_path / "b", page_counts=(1,))
+
+        for fmt in fixtures.FORMATS:
+            name = fixtures.document_name(fmt, 1, "ko")
+            data = (first / name).read_bytes()
+            assert data == (second / name).read_bytes(), fmt
+            assert count_volume(extract_text(data, name))["value"] > 500, fmt
+
+    def test_formulaic_emails_resolve_by_rules(self):
+        emails = fixtures.make_emails(20)
+        resolved = [not unresolved_fields(extract_fields(e["subject"], e["body"])[1]) for e in emails]
+        assert resolved == [i % 2 == 0 for i in range(20)]
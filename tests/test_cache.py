@@ -0,0 +1,45 @@
+import time
+
+from modules.cache import DiskCache
+
+
+class TestDiskCache:
+    def test_roundtrip_and_counters(self, tmp_path):
+        cache = DiskCache(tmp_path / "c.sqlite3")
+        assert cache.get("a") is None
+        cache.set("a", {"value": 4500, "unit": "chars"})
+        assert cache.get("a") == {"value": 4500, "unit": "chars"}
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+
+    def test_ttl_expiry(self, tmp_path):
+        cache = DiskCache(tmp_path / "c.sqlite3", ttl=0.01)
+        cache.set("a", 1)
+        time.sleep(0.02)
+        assert cache.get("a") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_lru_eviction_by_count(self, tmp_path):
+        cache = DiskCache(tmp_path / "c.sqlite3", max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        time.sleep(0.001)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_eviction_by_bytes(self, tmp_path):
+        cache = DiskCache(tmp_path / "c.sqlite3", max_bytes=20)
+        cache.set("a", "x" * 10)
+        time.sleep(0.001)
+        cache.set("b", "y" * 10)
+        assert cache.get("a") is None
+        assert cache.get("b") == "y" * 10
+
+    def test_shared_between_instances(self, tmp_path):
+        DiskCache(tmp_path / "c.sqlite3").set("a", [1, 2])
+        assert DiskCache(tmp_path / "c.sqlite3").get("a") == [1, 2]
@@ -0,0 +1,155 @@
+import asyncio
+import json
+
+import pytest
+
+from modules import email_ingest
+
+PARSED = {
+    "client_name": "ABC무역 김민수",
+    "source_lang": "ko",
+    "target_lang": "en",
+    "language_pair": "ko-en",
+    "volume": {"value": 4500, "unit": "chars"},
+    "domain": "general",
+    "urgency": "normal",
+    "dtp_required": True,
+}
+
+MBOX = b"""From kim@abctrade.co.kr Mon Feb  2 10:00:00 2026
+From: Kim <kim@abctrade.co.kr>
+Subject: =?utf-8?b?7Lm07YOI66Gc6re4IOuyiOyXrQ==?=
+Message-ID: <m1@abctrade.co.kr>
+Content-Type: text/plain; charset=utf-8
+
+first body
+
+From lee@lawfirm.co.kr Mon Feb  2 11:00:00 2026
+From: lee@lawfirm.co.kr
+Subject: urgent
+Content-Type: text/plain; charset=utf-8
+
+From the desk of Lee
+second body
+"""
+
+
+def _write_jsonl(path, n):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n):
+            f.write(json.dumps({"request_id": f"r-{i}", "title": f"요청 {i}", "body": "본문"}) + "\n")
+
+
+class TestReaders:
+    def test_mbox_stream(self, tmp_path):
+        path = tmp_path / "inbox.mbox"
+        path.write_bytes(MBOX)
+        messages = list(email_ingest.iter_mbox(path))
+        assert [m["sender"] for m in messages] == ["kim@abctrade.co.kr", "lee@lawfirm.co.kr"]
+        assert messages[0]["id"] == "<m1@abctrade.co.kr>"
+        assert messages[0]["subject"] == "카탈로그 번역"
+        assert "second body" in messages[1]["body"]
+
+    def test_jsonl_fields(self, tmp_path):
+        path = tmp_path / "requests.jsonl"
+        _write_jsonl(path, 2)
+        first = next(email_ingest.iter_messages(path))
+        assert first == {"id": "r-0", "sender": "", "subject": "요청 0", "body": "본문"}
+
+    def test_unknown_charset_decoded_per_message(self, tmp_path):
+        mbox = MBOX.replace(b"charset=utf-8\n\nfirst", b"charset=x-unknown-8\n\nfirst", 1)
+        path = tmp_path / "inbox.mbox"
+        path.write_bytes(mbox)
+        messages = list(email_ingest.iter_mbox(path))
+        assert "first body" in messages[0]["body"]
+        assert "second body" in messages[1]["body"]
+
+
+class TestQuoteFromParsed:
+    @pytest.mark.parametrize("volume", [
+        {"value": None, "unit": "chars"},
+        {"value": "많음", "unit": "chars"},
+        {"value": 0, "unit": "chars"},
+        {"unit": "chars"},
+        {"value": 4500},
+        "4500자",
+    ])
+    def test_incomplete_volume_not_quoted(self, volume):
+        assert email_ingest.quote_from_parsed({**PARSED, "volume": volume}) is None
+
+    @pytest.mark.parametrize("field, value", [
+        ("language_pair", ["ko-en"]),
+        ("language_pair", {"source": "ko", "target": "en"}),
+        ("domain", ["legal", "general"]),
+        ("domain", {"name": "legal"}),
+    ])
+    def test_non_string_field_not_quoted(self, field, value):
+        assert email_ingest.quote_from_parsed({**PARSED, field: value}) is None
+
+    def test_bad_reply_does_not_abort_ingest(self, tmp_path, monkeypatch):
+        replies = iter([
+            {**PARSED, "volume": {"value": None}},
+            {**PARSED, "domain": ["legal"]},
+            {**PARSED, "domain": "cooking"},
+            dict(PARSED),
+        ])
+        monkeypatch.setattr(email_ingest, "parse_email", lambda *args: next(replies))
+        source = tmp_path / "in.jsonl"
+        _write_jsonl(source, 4)
+        out = tmp_path / "out.jsonl"
+
+        stats = asyncio.run(email_ingest.ingest(source, out, max_concurrency=1))
+
+        records = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+        assert [r["quote"] is None for r in records] == [True, True, True, False]
+        assert "Unknown domain" in records[2]["quote_error"]
+        assert (stats["processed"], stats["quoted"]) == (4, 1)
+
+
+class TestIngest:
+    def test_quotes_written_in_order(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(email_ingest, "parse_email", lambda *args: dict(PARSED))
+        source = tmp_path / "in.jsonl"
+        _write_jsonl(source, 30)
+        out = tmp_path / "out.jsonl"
+
+        stats = asyncio.run(email_ingest.ingest(source, out, max_concurrency=4))
+
+        records = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+        assert [r["id"] for r in records] == [f"r-{i}" for i in range(30)]
+        assert records[0]["quote"]["total"] == 712_800  # 4,500자 + DTP
+        assert stats["processed"] == stats["quoted"] == 30
+
+    def test_resume_after_crash(self, tmp_path, monkeypatch):
+        source = tmp_path / "in.jsonl"
+        _write_jsonl(source, 50)
+        out = tmp_path / "out.jsonl"
+        calls = []
+
+        def flaky_parse(sender, subject, body):
+            calls.append(subject)
+            if len(calls) == 35:
+                raise RuntimeError("crash")
+            return dict(PARSED)
+
+        monkeypatch.setattr(email_ingest, "parse_email", flaky_parse)
+        monkeypatch.setattr(email_ingest, "CHECKPOINT_EVERY", 10)
+        with pytest.raises(RuntimeError):
+            asyncio.run(email_ingest.ingest(source, out, max_concurrency=2))
+
+        monkeypatch.setattr(email_ingest, "parse_email", lambda *args: dict(PARSED))
+        stats = asyncio.run(email_ingest.ingest(source, out, max_concurrency=2))
+
+        ids = [json.loads(line)["id"] for line in out.read_text(encoding="utf-8").splitlines()]
+        assert ids == [f"r-{i}" for i in range(50)]
+        assert stats["resumed_from"] > 0
+
+    def test_rate_limited_retry(self, tmp_path, monkeypatch):
+        responses = [{"error": "Error code: 429 - rate limit"}, dict(PARSED)]
+        monkeypatch.setattr(email_ingest, "parse_email", lambda *args: responses.pop(0))
+        monkeypatch.setattr(email_ingest.RateLimiter, "backoff", lambda self, seconds: None)
+        source = tmp_path / "in.jsonl"
+        _write_jsonl(source, 1)
+        out = tmp_path / "out.jsonl"
+        asyncio.run(email_ingest.ingest(source, out))
+        assert json.loads(out.read_text(encoding="utf-8"))["quote"] is not None
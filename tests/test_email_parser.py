@@ -0,0 +1,135 @@
+import json
+from datetime import date
+
+import pytest
+
+from modules import email_parser, llm_client
+from modules.cache import DiskCache
+from tests.mock_openai import MockOpenAIServer
+
+PARSED = {
+    "client_name": "이 변호사",
+    "source_lang": "ko",
+    "target_lang": "en",
+    "volume": {"value": 8, "unit": "pages"},
+    "domain": "legal",
+    "urgency": "urgent",
+    "deadline": None,
+    "dtp_required": None,
+    "notes": None,
+}
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setattr(email_parser, "_cache", DiskCache(tmp_path / "email.sqlite3"))
+    with MockOpenAIServer(reply=lambda body: json.dumps(PARSED)) as srv:
+        monkeypatch.setattr(email_parser, "_get_client", lambda: llm_client.get_client(srv.base_url))
+        yield srv
+    llm_client.reset_clients()
+
+
+class TestParseEmailCache:
+    def test_duplicate_email_skips_api(self, server):
+        first = email_parser.parse_email("Lee@LawFirm.co.kr", "급한 번역", "내일까지\n  8페이지 부탁드립니다.")
+        second = email_parser.parse_email("lee@lawfirm.co.kr ", "급한 번역", "내일까지 8페이지 부탁드립니다.")
+        assert first == second
+        assert first["language_pair"] == "ko-en"
+        assert len(server.requests) == 1
+        stats = email_parser.cache_stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    def test_key_includes_date_and_content(self):
+        base = email_parser.cache_key("a@b.c", "s", "본문", "2026-01-01")
+        assert email_parser.cache_key("a@b.c", "s", "본문", "2026-01-02") != base
+        assert email_parser.cache_key("a@b.c", "s", "다른 본문", "2026-01-01") != base
+        assert email_parser.cache_key("A@B.C", "s", " 본문\n", "2026-01-01") == base
+
+    def test_errors_not_cached(self, server):
+        server.fail_statuses = [400]
+        assert "error" in email_parser.parse_email("a@b.c", "s", "본문")
+        assert email_parser.parse_email("a@b.c", "s", "본문")["domain"] == "legal"
+        assert len(server.requests) == 2
+
+
+class TestPromptPrefix:
+    def test_prefix_identical_across_calls(self, server):
+        email_parser.parse_email("a@b.c", "첫 요청", "계약서 번역 부탁드립니다.", use_cache=False)
+        email_parser.parse_email("x@y.z", "두번째 요청", "매뉴얼 번역 부탁드립니다.", use_cache=False)
+        first, second = (req["messages"] for req in server.requests)
+        assert first[:-1] == second[:-1]
+        assert "{today}" not in first[0]["content"]
+        assert "Today: " in first[-1]["content"]
+        # few-shot 예시도 실제 user 메시지와 같은 형식(Today 줄 포함)
+        examples = [m["content"] for m in first[1:-1] if m["role"] == "user"]
+        assert examples and all("\nToday: " in content for content in examples)
+
+    def test_quoted_reply_not_sent(self, server):
+        body = "계약서 8페이지 번역 부탁드립니다.\n\n-----Original Message-----\n" + "이전 메일 " * 2000
+        email_parser.parse_email("a@b.c", "s", body, use_cache=False)
+        sent = server.requests[0]["messages"][-1]["content"]
+        assert "계약서 8페이지" in sent
+        assert "이전 메일" not in sent
+
+    def test_call_stats_recorded(self, server):
+        before = email_parser.call_stats()["calls"]
+        email_parser.parse_email("a@b.c", "s", "본문", use_cache=False)
+        stats = email_parser.call_stats()
+        assert stats["calls"] == before + 1
+        last = stats["recent"][-1]
+        assert last["prompt_tokens"] > 0
+        assert last["estimated_prompt_tokens"] > email_parser.PREFIX_TOKENS
+        assert last["latency_ms"] >= 0
+        assert last["sent_body_chars"] <= last["body_chars"]
+
+
+class TestRuleFastPath:
+    def test_formulaic_email_skips_api(self, server):
+        result = email_parser.parse_email(
+            "kim@abctrade.co.kr",
+            "영문 카탈로그 번역 요청",
+            "당사 제품 매뉴얼 한글본을 영문으로 번역 부탁드립니다. 분량은 약 5,000자이고 다음 주까지 필요합니다.",
+        )
+        assert server.requests == []
+        assert result["parsed_by"] == "rules"
+        assert result["language_pair"] == "ko-en"
+        assert result["volume"] == {"value": 5000, "unit": "chars"}
+        assert result["confidence"]["domain"] >= 0.7
+
+    def test_unresolved_fields_filled_by_llm(self, server):
+        result = email_parser.parse_email("a@b.c", "번역 문의", "매뉴얼 한글본을 영문으로 번역 부탁드립니다.")
+        assert len(server.requests) == 1
+        assert result["parsed_by"] == "rules+llm"
+        assert result["domain"] == "technical"  # 규칙 결과 유지
+        assert result["volume"] == PARSED["volume"]  # LLM이 채움
+        assert result["confidence"]["volume"] is None
+
+    def test_llm_urgency_wins_over_default(self, server):
+        server.reply = lambda body: json.dumps({**PARSED, "urgency": "urgent", "deadline": "2026-10-18T18:00"})
+        result = email_parser.parse_email(
+            "a@b.c", "번역 문의", "계약서 한영 번역 부탁드립니다. 분량은 5,000자이고 오후 6시까지 받아볼 수 있을까요?",
+        )
+        assert len(server.requests) == 1
+        assert result["parsed_by"] == "rules+llm"
+        assert result["urgency"] == "urgent"
+        assert result["confidence"]["urgency"] is None
+
+    def test_urgency_raised_to_match_deadline(self, server, monkeypatch):
+        class Today(date):
+            @classmethod
+            def today(cls):
+                return cls(2026, 10, 18)
+
+        monkeypatch.setattr(email_parser, "date", Today)
+        server.reply = lambda body: json.dumps({**PARSED, "urgency": "normal", "deadline": "2026-10-18T18:00"})
+        result = email_parser.parse_email("a@b.c", "번역 문의", "계약서 한영 번역 부탁드립니다. 분량은 5,000자입니다.")
+        assert result["urgency"] == "urgent"
+
+    def test_rules_disabled(self, server):
+        result = email_parser.parse_email(
+            "a@b.c", "s", "매뉴얼 한글본을 영문으로 번역 부탁드립니다. 5,000자입니다.", use_rules=False,
+        )
+        assert len(server.requests) == 1
+        assert result["parsed_by"] == "llm"
+        assert result["domain"] == "legal"
@@ -0,0 +1,103 @@
+from modules.email_preprocess import (
+    TRUNCATION_MARK,
+    estimate_tokens,
+    preprocess_body,
+    strip_quoted_and_signature,
+    truncate_to_tokens,
+)
+
+
+class TestStripQuoted:
+    def test_reply_chain_removed(self):
+        body = (
+            "안녕하세요, 계약서 8페이지 영문 번역 부탁드립니다.\n"
+            "감사합니다. 김민수 드림\n\n"
+            "On Mon, Oct 5, 2026 at 10:00 AM Kim <kim@example.com> wrote:\n"
+            "> 지난번 견적 보내드립니다.\n"
+            "> 확인 부탁드립니다.\n"
+        )
+        result = strip_quoted_and_signature(body)
+        assert "8페이지" in result
+        assert "김민수 드림" in result
+        assert "wrote:" not in result and "견적 보내드립니다" not in result
+
+    def test_outlook_header_removed(self):
+        body = (
+            "Please translate the attached file.\n\n"
+            "From: Sales <sales@example.com>\n"
+            "Sent: Monday, October 5, 2026\n"
+            "To: Client\n"
+            "Old message text\n"
+        )
+        assert strip_quoted_and_signature(body) == "Please translate the attached file."
+
+    def test_from_line_in_body_kept(self):
+        body = "From: 법무팀 요청입니다.\n계약서 번역 부탁드립니다."
+        assert strip_quoted_and_signature(body) == body
+
+    def test_signature_and_disclaimer_removed(self):
+        body = (
+            "특허 명세서 3000단어 일본어 번역 요청드립니다.\n\n"
+            "본 메일은 기밀 정보를 포함하고 있으며 무단 배포를 금합니다.\n\n"
+            "-- \n"
+            "Patent Team | +82-2-000-0000\n"
+        )
+        assert strip_quoted_and_signature(body) == "특허 명세서 3000단어 일본어 번역 요청드립니다."
+
+    def test_forwarded_request_kept(self):
+        body = (
+            "FYI 아래 건 견적 부탁드립니다.\n"
+            "-- \n"
+            "홍길동 | 구매팀\n\n"
+            "---------- Forwarded message ---------\n"
+            "From: Kim <kim@example.com>\n"
+            "Date: Mon, Oct 5, 2026 at 10:00 AM\n"
+            "Subject: 번역 요청\n"
+            "To: <purchase@example.com>\n\n"
+            "계약서 한영 번역 5,000자 급하게 부탁드립니다.\n\n"
+            "On Sun, Oct 4, 2026 at 9:00 AM Lee <lee@example.com> wrote:\n"
+            "이전 메일 본문\n"
+        )
+        result = strip_quoted_and_signature(body)
+        assert result.startswith("FYI 아래 건 견적 부탁드립니다.")
+        assert "계약서 한영 번역 5,000자 급하게" in result
+        assert "홍길동" not in result  # 전달한 사람의 서명은 제거
+        assert "이전 메일 본문" not in result  # 전달된 메일 안의 답장 인용은 제거
+
+    def test_outlook_forward_kept(self):
+        body = (
+            "From: 김민수 <kim@example.com>\n"
+            "Sent: Monday, October 5, 2026\n"
+            "To: 견적팀\n"
+            "Subject: FW: 매뉴얼 번역\n\n"
+            "매뉴얼 3,000단어 영한 번역 부탁드립니다.\n"
+        )
+        assert "3,000단어" in strip_quoted_and_signature(body)
+
+    def test_disclaimer_only_removed_at_end(self):
+        body = (
+            "본 메일은 기밀 자료인 계약서 번역 건입니다. 무단 배포 없이 10페이지 영문 번역 부탁드립니다.\n\n"
+            "감사합니다. 김민수 드림"
+        )
+        assert strip_quoted_and_signature(body) == body
+
+
+class TestTokenBudget:
+    def test_estimate_counts_cjk_per_char(self):
+        assert estimate_tokens("번역요청") == 4
+        assert estimate_tokens("abcdefgh") == 2
+
+    def test_short_text_untouched(self):
+        assert truncate_to_tokens("짧은 본문", budget=100) == "짧은 본문"
+
+    def test_long_text_truncated_within_budget(self):
+        body = "\n".join(f"{i}번째 줄입니다. 번역 관련 설명이 이어집니다." for i in range(500))
+        result = preprocess_body(body, budget=200)
+        assert result.endswith(TRUNCATION_MARK)
+        assert result.startswith("0번째 줄")
+        assert estimate_tokens(result) <= 200
+
+    def test_single_long_line_cut(self):
+        result = truncate_to_tokens("가" * 1000, budget=50)
+        assert result.endswith(TRUNCATION_MARK)
+        assert estimate_tokens(result) <= 50
@@ -0,0 +1,99 @@
+from datetime import date
+
+import pytest
+
+from modules.email_rules import RESOLVED_CONFIDENCE, extract_fields, unresolved_fields
+
+TODAY = date(2026, 10, 18)
+
+
+class TestExtractFields:
+    def test_catalog_example(self):
+        result, confidence = extract_fields(
+            "영문 카탈로그 번역 요청",
+            "안녕하세요, ABC무역 김민수입니다.\n"
+            "당사 제품 카탈로그 한글본을 영문으로 번역 부탁드립니다.\n"
+            "분량은 약 5,000자이고, 다음 주 금요일까지 부탁드립니다.\n"
+            "제품 기술 용어가 많으니 참고 부탁드립니다.",
+            TODAY,
+        )
+        assert (result["source_lang"], result["target_lang"]) == ("ko", "en")
+        assert result["volume"] == {"value": 5000, "unit": "chars"}
+        assert result["domain"] == "technical"
+        assert result["urgency"] == "normal"
+        assert result["client_name"] == "ABC무역 김민수"
+        assert unresolved_fields(confidence) == []
+
+    def test_urgent_legal_example(self):
+        result, confidence = extract_fields(
+            "급한 번역 부탁드립니다",
+            "이 변호사입니다. 내일 오전까지 급하게 필요한 게 있어서요.\n"
+            "첨부 계약서 영문번역 부탁드립니다. 분량은 8페이지 정도요.",
+            TODAY,
+        )
+        assert result["volume"] == {"value": 8, "unit": "pages"}
+        assert result["domain"] == "legal"
+        assert result["urgency"] == "urgent"
+        assert result["deadline"] == "2026-10-19"
+        assert unresolved_fields(confidence) == []
+
+    def test_english_email(self):
+        result, confidence = extract_fields(
+            "Translation request",
+            "We need our clinical trial protocol (3,000 words) translated from English into Korean by 2026-10-25.",
+            TODAY,
+        )
+        assert (result["source_lang"], result["target_lang"]) == ("en", "ko")
+        assert result["volume"] == {"value": 3000, "unit": "words"}
+        assert result["domain"] == "medical"
+        assert result["urgency"] == "normal"
+        assert unresolved_fields(confidence) == []
+
+    def test_korean_multiplier_shorthand_and_dtp(self):
+        result, _ = extract_fields("문의", "제품 매뉴얼 1.5만자 한영 번역, 모레까지 DTP 포함", TODAY)
+        assert result["volume"] == {"value": 15000, "unit": "chars"}
+        assert (result["source_lang"], result["target_lang"]) == ("ko", "en")
+        assert result["urgency"] == "semi_urgent"
+        assert result["dtp_required"] is True
+
+    def test_third_party_not_volume(self):
+        result, confidence = extract_fields("문의", "제3자 제공 동의서 번역 부탁드립니다.", TODAY)
+        assert result["volume"] is None
+        assert "volume" in unresolved_fields(confidence)
+
+    def test_ambiguous_fields_unresolved(self):
+        result, confidence = extract_fields("문의", "파일 두 개입니다. 각각 3페이지, 5페이지입니다.", TODAY)
+        assert confidence["volume"] < RESOLVED_CONFIDENCE
+        assert confidence["domain"] == 0.0
+        assert {"volume", "domain", "source_lang", "target_lang"} <= set(unresolved_fields(confidence))
+
+    def test_unpriced_pair_left_to_llm(self):
+        result, confidence = extract_fields("견적 문의", "계약서 en→ja 번역 부탁드립니다. 분량은 5,000자입니다.", TODAY)
+        assert (result["source_lang"], result["target_lang"]) == ("en", "ja")
+        assert {"source_lang", "target_lang"} <= set(unresolved_fields(confidence))
+
+    def test_same_language_pair_left_to_llm(self):
+        result, confidence = extract_fields("견적 문의", "계약서 ko→ko 번역 부탁드립니다. 분량은 5,000자입니다.", TODAY)
+        assert (result["source_lang"], result["target_lang"]) == ("ko", "ko")
+        assert {"source_lang", "target_lang"} <= set(unresolved_fields(confidence))
+
+    @pytest.mark.parametrize("phrase, urgency", [
+        ("within 12 hours", "urgent"),
+        ("12시간 안에 필요합니다", "urgent"),
+        ("by end of day", "urgent"),
+        ("36시간 이내로 부탁드립니다", "semi_urgent"),
+        ("급하지 않습니다", "normal"),
+    ])
+    def test_urgency_phrases(self, phrase, urgency):
+        result, confidence = extract_fields("견적 문의", f"계약서 한영 번역 5,000자, {phrase}.", TODAY)
+        assert result["urgency"] == urgency
+        assert unresolved_fields(confidence) == []
+
+    def test_no_urgency_evidence_left_to_llm(self):
+        result, confidence = extract_fields("견적 문의", "계약서 한영 번역 부탁드립니다. 분량은 5,000자입니다.", TODAY)
+        assert result["urgency"] == "normal"
+        assert unresolved_fields(confidence) == ["urgency"]
+
+    def test_priced_shorthand_resolved(self):
+        _, confidence = extract_fields("견적 문의", "계약서 ko→en 번역 부탁드립니다. 분량은 5,000자, 다음 주까지입니다.", TODAY)
+        assert unresolved_fields(confidence) == []
@@ -0,0 +1,180 @@
+import pytest
+
+from modules import file_analyzer
+from modules.cache import DiskCache
+
+
+@pytest.fixture
+def domain_calls(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_request(text):
+        calls.append(text)
+        return {"domain": "legal", "source_lang": "ko", "confidence": 0.9, "reasoning": "계약서"}
+
+    monkeypatch.setattr(file_analyzer, "_cache", DiskCache(tmp_path / "fa.sqlite3"))
+    monkeypatch.setattr(file_analyzer, "_request_domain", fake_request)
+    return calls
+
+
+class TestAnalyzeFileCache:
+    def test_repeat_upload_hits_cache(self, domain_calls):
+        data = "본 계약은 갑과 을 사이에 체결된다.".encode("utf-8")
+        first = file_analyzer.analyze_file(data, "contract.txt")
+        second = file_analyzer.analyze_file(data, "contract.txt")
+        assert first == second
+        assert len(domain_calls) == 1
+
+    def test_different_content_misses(self, domain_calls):
+        file_analyzer.analyze_file("첫 번째 문서".encode("utf-8"), "a.txt")
+        file_analyzer.analyze_file("두 번째 문서".encode("utf-8"), "a.txt")
+        assert len(domain_calls) == 2
+
+    def test_old_analyzer_version_not_reused(self, domain_calls, monkeypatch):
+        data = "본 계약은 갑과 을 사이에 체결된다.".encode("utf-8")
+        with monkeypatch.context() as m:
+            m.setattr(file_analyzer, "ANALYZER_VERSION", "2")
+            file_analyzer._get_cache().set(file_analyzer.cache_key(data, "contract.txt"), {"stale": True})
+
+        result = file_analyzer.analyze_file(data, "contract.txt")
+        assert "stale" not in result and "script_ratios" in result
+        assert len(domain_calls) == 1
+
+    def test_api_failure_not_cached(self, tmp_path, monkeypatch):
+        def failing_request(text):
+            raise RuntimeError("timeout")
+
+        monkeypatch.setattr(file_analyzer, "_cache", DiskCache(tmp_path / "fa.sqlite3"))
+        monkeypatch.setattr(file_analyzer, "_request_domain", failing_request)
+        result = file_analyzer.analyze_file("문서".encode("utf-8"), "a.txt")
+        assert result["domain_analysis"]["confidence"] == 0.0
+        assert file_analyzer._cache.stats()["entries"] == 0
+
+
+def _make_pdf(pages: int) -> bytes:
+    import io
+    from reportlab.pdfgen import canvas
+
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf)
+    for i in range(pages):
+        c.drawString(40, 800, f"page {i} the quick brown fox")
+        c.drawString(40, 780, "jumps over the lazy dog")
+        c.showPage()
+    c.save()
+    return buf.getvalue()
+
+
+class TestStreamingExtraction:
+    def test_docx_chunks_join_to_text(self):
+        import io
+        from docx import Document
+
+        doc = Document()
+        for text in ["첫 문단", "", "second paragraph"]:
+            doc.add_paragraph(text)
+        buf = io.BytesIO()
+        doc.save(buf)
+        chunks = list(file_analyzer.iter_text(buf.getvalue(), "a.docx"))
+        assert "".join(chunks) == "첫 문단\n\nsecond paragraph"
+
+    def test_parallel_pdf_matches_sequential(self, monkeypatch):
+        data = _make_pdf(5)
+        sequential = file_analyzer.extract_text(data, "a.pdf")
+        monkeypatch.setattr(file_analyzer, "PARALLEL_MIN_PAGES", 2)
+        monkeypatch.setattr(file_analyzer, "PAGES_PER_TASK", 2)
+        assert file_analyzer.extract_text(data, "a.pdf") == sequential
+        assert sequential.count("page ") == 5
+
+    def test_streamed_counts_match_full_text(self, domain_calls):
+        data = _make_pdf(3)
+        text = file_analyzer.extract_text(data, "a.pdf")
+        result = file_analyzer.analyze_file(data, "a.pdf", use_cache=False)
+        assert result["char_count"] == len(text.replace(" ", "").replace("\n", ""))
+        assert result["word_count"] == len(text.split())
+
+
+class TestAnalyzeFiles:
+    def test_streams_results_then_summary(self, tmp_path, monkeypatch):
+        import asyncio
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+
+        async def fake_request(text):
+            await asyncio.sleep(0.2)
+            return {"domain": "legal" if "계약" in text else "technical", "confidence": 0.9}
+
+        monkeypatch.setattr(file_analyzer, "_cache", DiskCache(tmp_path / "fa.sqlite3"))
+        monkeypatch.setattr(file_analyzer, "_request_domain_async", fake_request)
+        files = [
+            ("contract.txt", "본 계약은 갑과 을 사이에 체결된다.".encode("utf-8")),
+            ("manual.txt", "API 서버 설정 방법을 설명합니다.".encode("utf-8")),
+            ("spec.txt", "The server exposes the API on port 8080 and it is the default.".encode("utf-8")),
+            ("empty.txt", b"   "),
+        ]
+
+        async def collect():
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                return [event async for event in file_analyzer.analyze_files(files, executor=pool)]
+
+        start = time.perf_counter()
+        events = asyncio.run(collect())
+        elapsed = time.perf_counter() - start
+
+        assert [e["type"] for e in events] == ["file"] * 4 + ["summary"]
+        assert {e["index"]: e["filename"] for e in events[:-1]} == dict(enumerate(name for name, _ in files))
+        assert elapsed < 0.5  # 0.2초 GPT 호출 3건이 겹쳐서 진행
+        summary = events[-1]["summary"]
+        assert summary["file_count"] == 4
+        assert summary["failed"] == ["empty.txt"]
+        assert summary["volume_by_unit"]["words"] == 13
+        assert summary["domain_char_counts"].keys() == {"legal", "technical"}
+
+    def test_batch_collects_results_in_input_order(self, tmp_path, monkeypatch):
+        from concurrent.futures import ThreadPoolExecutor
+
+        async def fake_request(text):
+            return {"domain": "legal", "confidence": 0.9}
+
+        monkeypatch.setattr(file_analyzer, "_cache", DiskCache(tmp_path / "fa.sqlite3"))
+        monkeypatch.setattr(file_analyzer, "_request_domain_async", fake_request)
+        files = [(f"f{i}.txt", f"계약서 {i}번 문서입니다.".encode("utf-8")) for i in range(4)] + [("empty.txt", b" ")]
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            batch = file_analyzer.analyze_batch(files, executor=pool)
+
+        assert [item["filename"] for item in batch["files"]] == [name for name, _ in files]
+        assert batch["files"][-1]["result"]["error"]
+        assert batch["summary"]["file_count"] == 5
+        assert batch["summary"]["failed"] == ["empty.txt"]
+
+
+def _analysis(value, unit, domain, lang, chars):
+    return {
+        "volume": {"value": value, "unit": unit},
+        "domain_analysis": {"domain": domain},
+        "detected_lang": lang,
+        "char_count": chars,
+    }
+
+
+class TestSummarizeAnalyses:
+    def test_total_volume_same_unit(self):
+        summary = file_analyzer.summarize_analyses([
+            ("a.docx", _analysis(3000, "chars", "legal", "ko", 3000)),
+            ("b.pdf", _analysis(5000, "chars", "legal", "ko", 5000)),
+            ("c.pdf", {"error": "추출 실패"}),
+        ])
+        assert summary["total_volume"] == {"value": 8000, "unit": "chars"}
+        assert (summary["domain"], summary["language"], summary["failed"]) == ("legal", "ko", ["c.pdf"])
+
+    def test_mixed_units_converted_to_chars(self):
+        summary = file_analyzer.summarize_analyses([
+            ("ko.docx", _analysis(3000, "chars", "technical", "ko", 3000)),
+            ("en.docx", _analysis(1000, "words", "legal", "en", 6000)),
+        ])
+        assert summary["total_volume"] == {"value": 3000 + 2500, "unit": "chars"}  # 1단어 = 2.5자
+        assert summary["domain"] == "legal"  # 글자 수 가중
+
+    def test_no_successful_files(self):
+        assert file_analyzer.summarize_analyses([("x.pdf", {"error": "실패"})])["total_volume"] is None
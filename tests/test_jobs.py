@@ -0,0 +1,98 @@
+import threading
+
+import pytest
+
+from modules.jobs import CANCELLED, DONE, FAILED, QUEUED, RUNNING, JobLimitError, JobManager
+
+
+def _wait(manager: JobManager, job_id: str):
+    job = manager.get(job_id)
+    job.future.result(timeout=5)
+    return job
+
+
+@pytest.fixture
+def manager():
+    m = JobManager(max_workers=2, limit_per_owner=2)
+    yield m
+    m.shutdown(wait=True)
+
+
+class TestJobManager:
+    def test_result_and_failure(self, manager):
+        ok = manager.submit("a", "email", lambda x: {"value": x * 2}, 21, label="메일", meta={"sender": "s"})
+        bad = manager.submit("a", "file", lambda: 1 / 0)
+
+        job = _wait(manager, ok)
+        assert (job.status, job.result, job.label, job.meta) == (DONE, {"value": 42}, "메일", {"sender": "s"})
+        assert job.started is not None and job.finished >= job.started
+        job = _wait(manager, bad)
+        assert job.status == FAILED
+        assert "division by zero" in job.error
+        assert [j.id for j in manager.jobs("a")] == [ok, bad]
+        assert manager.jobs("b") == []
+
+    def test_limit_per_owner(self, manager):
+        release = threading.Event()
+        first = manager.submit("a", "file", release.wait)
+        manager.submit("a", "file", release.wait)
+        with pytest.raises(JobLimitError):
+            manager.submit("a", "file", release.wait)
+        manager.submit("b", "file", lambda: None)  # 다른 사용자는 영향 없음
+
+        release.set()
+        _wait(manager, first)
+        manager.submit("a", "file", lambda: None)
+
+    def test_cancel_queued_job_never_runs(self):
+        manager = JobManager(max_workers=1, limit_per_owner=5)
+        release = threading.Event()
+        ran = []
+        blocker = manager.submit("a", "file", release.wait)
+        queued = manager.submit("a", "file", ran.append, 1)
+        assert manager.get(queued).status == QUEUED
+
+        assert manager.cancel(queued)
+        release.set()
+        _wait(manager, blocker)
+        manager.shutdown(wait=True)
+        assert manager.get(queued).status == CANCELLED
+        assert ran == []
+
+    def test_cancel_running_job_discards_result(self, manager):
+        started, release = threading.Event(), threading.Event()
+
+        def work():
+            started.set()
+            release.wait()
+            return {"volume": 1}
+
+        job_id = manager.submit("a", "file", work)
+        started.wait(5)
+        assert manager.get(job_id).status == RUNNING
+        assert manager.cancel(job_id)
+        # 취소됐어도 스레드가 끝날 때까지는 동시 작업 수에 포함
+        manager.submit("a", "file", lambda: None)
+        with pytest.raises(JobLimitError):
+            manager.submit("a", "file", lambda: None)
+
+        release.set()
+        job = _wait(manager, job_id)
+        assert (job.status, job.result) == (CANCELLED, None)
+        assert not manager.cancel(job_id)
+
+    def test_forget_and_expiry(self, manager):
+        release = threading.Event()
+        running = manager.submit("a", "file", release.wait)
+        done = manager.submit("a", "email", lambda: None)
+        _wait(manager, done)
+
+        manager.forget(running)  # 실행 중인 작업은 지우지 않음
+        manager.forget(done)
+        assert [j.id for j in manager.jobs("a")] == [running]
+        release.set()
+        _wait(manager, running)
+
+        manager.ttl = 0
+        manager.submit("b", "file", lambda: None)  # 제출 시 만료된 작업 정리
+        assert manager.get(running) is None
@@ -0,0 +1,46 @@
+import pytest
+
+from modules import lang_detector
+from modules.lang_detector import detect_language, normalize_lang
+
+
+@pytest.fixture
+def langdetect_calls(monkeypatch):
+    calls = []
+
+    def fake_langdetect(sample):
+        calls.append(sample)
+        return "fr"
+
+    monkeypatch.setattr(lang_detector, "_langdetect", fake_langdetect)
+    return calls
+
+
+class TestDetectLanguage:
+    @pytest.mark.parametrize("text, expected", [
+        ("본 계약은 갑과 을 사이에 체결된다.", "ko"),
+        ("API 서버 설정: 환경 변수 API_KEY를 설정하고 docker compose up 명령으로 시작합니다.", "ko"),
+        ("本契約は甲と乙の間で締結される。", "ja"),
+        ("本合同由甲乙双方签订。", "zh"),
+        ("This Agreement is entered into by and between the parties.", "en"),
+    ])
+    def test_script_families(self, text, expected, langdetect_calls):
+        lang, confidence = detect_language(text)
+        assert lang == expected
+        assert confidence >= lang_detector.CONFIDENCE_THRESHOLD
+        assert langdetect_calls == []
+
+    def test_low_confidence_falls_back(self, langdetect_calls):
+        lang, confidence = detect_language("Le présent contrat est conclu entre les parties.")
+        assert lang == "fr"
+        assert confidence < lang_detector.CONFIDENCE_THRESHOLD
+        assert len(langdetect_calls) == 1
+
+    def test_empty_text(self, langdetect_calls):
+        assert detect_language("") == ("ko", 0.0)
+        assert langdetect_calls == []
+
+    def test_normalize_lang(self):
+        assert normalize_lang("zh-cn") == "zh"
+        assert normalize_lang("ja") == "ja"
+        assert normalize_lang("fr") == "ko"
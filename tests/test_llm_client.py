@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from modules import llm_client
+from tests.mock_openai import MockOpenAIServer
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    with MockOpenAIServer(reply=lambda body: json.dumps({"ok": True})) as srv:
+        yield srv
+    llm_client.reset_clients()
+
+
+def _chat(client):
+    response = client.chat.completions.create(
+        model="mock", messages=[{"role": "user", "content": "hi"}],
+    )
+    return json.loads(response.choices[0].message.content)
+
+
+class TestLLMClient:
+    def test_import_without_api_key(self, monkeypatch):
+        import subprocess
+        import sys
+
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        subprocess.run(
+            [sys.executable, "-c", "import modules.file_analyzer, modules.email_parser"],
+            check=True,
+        )
+
+    def test_one_client_per_base_url(self, server):
+        client = llm_client.get_client(server.base_url)
+        assert llm_client.get_client(server.base_url) is client
+        assert llm_client.get_client("http://127.0.0.1:1/v1") is not client
+
+    def test_keep_alive_reuses_connection(self, server):
+        client = llm_client.get_client(server.base_url)
+        for _ in range(3):
+            assert _chat(client) == {"ok": True}
+        assert len(server.requests) == 3
+        assert len(server.connections) == 1
+
+    def test_retries_transient_errors(self, server):
+        server.fail_statuses = [429, 500]
+        assert _chat(llm_client.get_client(server.base_url)) == {"ok": True}
+        assert len(server.requests) == 3
+
+    def test_async_client(self, server):
+        import asyncio
+
+        async def run():
+            async with llm_client.async_llm_slot():
+                client = llm_client.get_async_client(server.base_url)
+                assert llm_client.get_async_client(server.base_url) is client
+                response = await client.chat.completions.create(
+                    model="mock", messages=[{"role": "user", "content": "hi"}],
+                )
+                return json.loads(response.choices[0].message.content)
+
+        assert asyncio.run(run()) == {"ok": True}
@@ -0,0 +1,138 @@
+import json
+import pickle
+import time
+from datetime import date
+
+import pytest
+
+from modules import file_analyzer, llm_client, metrics
+from modules.cache import DiskCache
+from modules.pdf_generator import generate_quote_pdf
+from modules.quote_calculator import calculate_quote
+from tests.mock_openai import MockOpenAIServer
+
+
+@pytest.fixture
+def recording():
+    metrics.reset()
+    metrics.set_enabled(True)
+    yield
+    metrics.set_enabled(False)
+    metrics.reset()
+
+
+def _histogram(name, **labels):
+    for h in metrics.snapshot()["histograms"]:
+        if h["name"] == name and h["labels"] == labels:
+            return h
+    return None
+
+
+def _counter(name, **labels):
+    for c in metrics.snapshot()["counters"]:
+        if c["name"] == name and c["labels"] == labels:
+            return c["value"]
+    return None
+
+
+class TestRegistry:
+    def test_histogram_and_counter(self, recording):
+        for seconds in (0.0002, 0.003, 0.003, 100.0):
+            metrics.observe("t_seconds", seconds, stage="a")
+        metrics.inc("t_total", kind="x")
+        metrics.inc("t_total", 4, kind="x")
+
+        h = _histogram("t_seconds", stage="a")
+        assert (h["count"], h["max"]) == (4, 100.0)
+        assert h["sum"] == pytest.approx(100.0062)
+        assert h["buckets"]["0.0005"] == 1
+        assert h["buckets"]["0.005"] == 3
+        assert h["buckets"]["60.0"] == 3  # 100초는 +Inf 구간에만
+        assert _counter("t_total", kind="x") == 5
+
+    def test_prometheus_text(self, recording):
+        metrics.observe(metrics.STAGE_SECONDS, 0.002, stage="doc_build")
+        metrics.observe(metrics.STAGE_SECONDS, 0.2, stage="extract_text", format="pdf")
+        metrics.inc(metrics.LLM_TOKENS, 12, call="parse_email", kind="prompt")
+        metrics.inc("odd_total", path='a"b\\c')
+        text = metrics.render_prometheus()
+        lines = text.splitlines()
+
+        assert lines.count(f"# TYPE {metrics.STAGE_SECONDS} histogram") == 1
+        assert f'{metrics.STAGE_SECONDS}_bucket{{stage="doc_build",le="0.0025"}} 1' in lines
+        assert f'{metrics.STAGE_SECONDS}_bucket{{stage="doc_build",le="0.001"}} 0' in lines
+        assert f'{metrics.STAGE_SECONDS}_bucket{{format="pdf",stage="extract_text",le="+Inf"}} 1' in lines
+        assert f'{metrics.STAGE_SECONDS}_count{{stage="doc_build"}} 1' in lines
+        assert f'{metrics.LLM_TOKENS}{{call="parse_email",kind="prompt"}} 12' in lines
+        assert 'odd_total{path="a\\"b\\\\c"} 1' in lines
+
+    def test_disabled_records_nothing(self):
+        metrics.reset()
+        assert not metrics.enabled()
+
+        @metrics.timed("t_seconds")
+        def work(x):
+            return x + 1
+
+        assert work(1) == 2
+        with metrics.timer("t_seconds"):
+            pass
+        metrics.inc("t_total")
+        assert list(metrics.timed_iter(iter([1, 2]), "t_seconds")) == [1, 2]
+        assert metrics.snapshot()["histograms"] == metrics.snapshot()["counters"] == []
+        assert metrics.start_dump("unused.json") is None
+
+    def test_timed_iter_excludes_consumer_time(self, recording):
+        def produce():
+            for _ in range(3):
+                time.sleep(0.01)
+                yield 1
+
+        for _ in metrics.timed_iter(produce(), "t_seconds", stage="produce"):
+            time.sleep(0.03)
+        h = _histogram("t_seconds", stage="produce")
+        assert h["count"] == 1
+        assert 0.03 <= h["sum"] < 0.09
+
+    def test_stopwatch_recorded_by_parent(self, recording):
+        watch = metrics.Stopwatch("t_seconds", stage="worker")
+        with watch:
+            time.sleep(0.005)
+        copy = pickle.loads(pickle.dumps(watch))  # 프로세스 풀 워커에서 돌아온 것처럼
+        copy.record()
+        assert _histogram("t_seconds", stage="worker")["sum"] == pytest.approx(watch.elapsed)
+
+    def test_dump(self, recording, tmp_path):
+        metrics.inc("t_total")
+        path = tmp_path / "m" / "metrics.json"
+        metrics.dump(path)
+        data = json.loads(path.read_text(encoding="utf-8"))
+        assert data["enabled"] is True
+        assert data["counters"] == [{"name": "t_total", "labels": {}, "value": 1}]
+
+
+class TestPipelineInstrumentation:
+    def test_quote_and_pdf_stages(self, recording):
+        result = calculate_quote("ko-en", "legal", 5000)
+        args = (result, "홍길동", "a@b.c", date(2026, 10, 30))
+        generate_quote_pdf(*args)
+        generate_quote_pdf(*args, fast=False)
+
+        for stage in ("calculate_quote", "render_compiled", "build_quote_pdf", "doc_layout"):
+            assert _histogram(metrics.STAGE_SECONDS, stage=stage)["count"] >= 1, stage
+        for path in ("compiled", "platypus"):
+            assert _histogram(metrics.STAGE_SECONDS, stage="pdf_serialize", path=path)["count"] == 1, path
+
+    def test_file_analysis_stages_and_tokens(self, recording, tmp_path, monkeypatch):
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        monkeypatch.setattr(file_analyzer, "_cache", DiskCache(tmp_path / "fa.sqlite3"))
+        with MockOpenAIServer() as server:
+            monkeypatch.setattr(file_analyzer, "_get_client", lambda: llm_client.get_client(server.base_url))
+            file_analyzer.analyze_file("본 계약은 갑과 을 사이에 체결된다.".encode(), "contract.txt")
+        llm_client.reset_clients()
+
+        assert _histogram(metrics.STAGE_SECONDS, stage="extract_text", format="txt")["count"] == 1
+        assert _histogram(metrics.STAGE_SECONDS, stage="count_volume")["count"] == 1
+        assert _histogram(metrics.LLM_REQUEST_SECONDS, call="analyze_domain")["count"] == 1
+        assert _counter(metrics.LLM_REQUESTS, call="analyze_domain", outcome="ok") == 1
+        assert _counter(metrics.LLM_TOKENS, call="analyze_domain", kind="prompt") > 0
@@ -0,0 +1,72 @@
+import zipfile
+
+from modules.pdf_bulk import render_bulk
+
+
+def _records(n: int) -> list[dict]:
+    return [
+        {
+            "language_pair": "ko-en",
+            "domain": "legal",
+            "volume": 1000 + i,
+            "surcharge_keys": ["urgent"] if i % 2 else [],
+            "client_name": f"고객{i}",
+            "client_email": "a@b.c",
+            "deadline": "2026-10-31",
+            "quote_number": f"Q-20261031-{i:03d}",
+        }
+        for i in range(n)
+    ]
+
+
+class TestRenderBulk:
+    def test_directory_output_inline(self, tmp_path):
+        stats = render_bulk(_records(5), tmp_path / "out", workers=1, records_per_task=2)
+        files = sorted((tmp_path / "out").glob("*.pdf"))
+        assert [f.name for f in files] == [f"Q-20261031-{i:03d}.pdf" for i in range(5)]
+        assert all(f.read_bytes().startswith(b"%PDF") for f in files)
+        assert stats["documents"] == 5 and stats["errors"] == 0
+        assert stats["bytes"] == sum(f.stat().st_size for f in files)
+
+    def test_zip_output_with_process_pool(self, tmp_path):
+        records = _records(6)
+        records[3]["language_pair"] = "xx-yy"
+        stats = render_bulk(iter(records), tmp_path / "out.zip", workers=2, records_per_task=2)
+        with zipfile.ZipFile(tmp_path / "out.zip") as zf:
+            names = zf.namelist()
+            assert all(zf.read(name).startswith(b"%PDF") for name in names)
+        assert names == [f"Q-20261031-{i:03d}.pdf" for i in (0, 1, 2, 4, 5)]
+        assert stats["documents"] == 5
+        assert stats["errors"] == 1
+        assert stats["error_details"][0]["index"] == 3
+        assert stats["per_second"] > 0
+
+    def test_missing_quote_number_allocated_before_rendering(self, tmp_path):
+        import pdfplumber
+
+        records = _records(2)
+        for record in records:
+            del record["quote_number"]
+        render_bulk(records, tmp_path / "out", workers=1)
+        for path in sorted((tmp_path / "out").glob("*.pdf")):
+            with pdfplumber.open(path) as pdf:
+                assert path.stem in pdf.pages[0].extract_text()
+        assert len(list((tmp_path / "out").glob("Q-*.pdf"))) == 2
+
+    def test_duplicate_names_rejected(self, tmp_path):
+        import pdfplumber
+
+        records = _records(3)
+        records[2]["quote_number"] = records[0]["quote_number"]
+        records[0]["client_name"], records[2]["client_name"] = "first", "second"
+
+        stats = render_bulk(records, tmp_path / "out.zip", workers=1)
+        with zipfile.ZipFile(tmp_path / "out.zip") as zf:
+            assert zf.namelist() == ["Q-20261031-000.pdf", "Q-20261031-001.pdf"]
+        assert (stats["documents"], stats["errors"]) == (2, 1)
+        assert stats["error_details"] == [{"index": 2, "error": "Duplicate file name: Q-20261031-000.pdf"}]
+
+        stats = render_bulk(records, tmp_path / "out", workers=1)
+        assert stats["errors"] == 1
+        with pdfplumber.open(tmp_path / "out" / "Q-20261031-000.pdf") as pdf:
+            assert "first" in pdf.pages[0].extract_text()
@@ -0,0 +1,68 @@
+from datetime import date
+
+import pytest
+
+from modules import pdf_generator
+from modules.quote_calculator import calculate_quote
+
+ARGS = dict(client_name="홍길동", client_email="a@b.c", deadline=date(2026, 1, 31), notes="", quote_number="Q-20260131-001")
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    pdf_generator.clear_pdf_cache()
+    calls = []
+    original = pdf_generator.generate_quote_pdf
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(pdf_generator, "generate_quote_pdf", counting)
+    yield calls
+    pdf_generator.clear_pdf_cache()
+
+
+class TestQuotePdfCache:
+    def test_same_quote_rendered_once(self, renders):
+        result = calculate_quote("ko-en", "legal", 1000)
+        key1, pdf1 = pdf_generator.get_quote_pdf(result, **ARGS)
+        key2, pdf2 = pdf_generator.get_quote_pdf(calculate_quote("ko-en", "legal", 1000), **ARGS)
+        assert (key1, pdf1) == (key2, pdf2)
+        assert pdf1.startswith(b"%PDF")
+        assert len(renders) == 1
+
+    def test_content_change_renders_again(self, renders):
+        result = calculate_quote("ko-en", "legal", 1000)
+        key1, _ = pdf_generator.get_quote_pdf(result, **ARGS)
+        key2, _ = pdf_generator.get_quote_pdf(result, **{**ARGS, "notes": "DTP 포함"})
+        key3, _ = pdf_generator.get_quote_pdf(calculate_quote("ko-en", "legal", 1001), **ARGS)
+        assert len({key1, key2, key3}) == 3
+        assert len(renders) == 3
+
+    def test_template_version_in_key(self, monkeypatch):
+        result = calculate_quote("ko-en", "legal", 1000)
+        before = pdf_generator.quote_pdf_key(result, **ARGS)
+        monkeypatch.setattr(pdf_generator, "TEMPLATE_VERSION", "test")
+        assert pdf_generator.quote_pdf_key(result, **ARGS) != before
+
+    def test_lru_eviction(self, renders, monkeypatch):
+        monkeypatch.setattr(pdf_generator, "PDF_CACHE_MAX_ENTRIES", 2)
+        results = [calculate_quote("ko-en", "general", v) for v in (100, 200, 300)]
+        for result in results:
+            pdf_generator.get_quote_pdf(result, **ARGS)
+        assert len(pdf_generator._pdf_cache) == 2
+        pdf_generator.get_quote_pdf(results[0], **ARGS)
+        assert len(renders) == 4
+
+    def test_missing_quote_number_is_allocated(self, renders):
+        result = calculate_quote("ko-en", "legal", 1000)
+        args = {**ARGS, "quote_number": None}
+        key1, _ = pdf_generator.get_quote_pdf(result, **args)
+        key2, _ = pdf_generator.get_quote_pdf(result, **args)
+        assert key1 != key2  # 번호가 없으면 매번 새 견적
+        assert len(renders) == 2
+        assert [call[-1] for call in renders] == [
+            f"Q-{date.today().strftime('%Y%m%d')}-001",
+            f"Q-{date.today().strftime('%Y%m%d')}-002",
+        ]
@@ -1,5 +1,13 @@
+import itertools
+import json
+import os
+
+import numpy as np
 import pytest
-from modules.quote_calculator import calculate_quote, convert_volume, validate_surcharges, load_pricing
+from modules import pricing as pricing_module
+from modules.quote_calculator import (
+    QuoteBatch, calculate_quote, calculate_quotes, convert_volume, validate_surcharges, load_pricing, get_pricing,
+)
 
 
 class TestVolumeConversion:
@@ -28,6 +36,10 @@ class TestSurchargeValidation:
         with pytest.raises(ValueError, match="Unknown surcharge"):
             validate_surcharges(["unknown"], pricing)
 
+    def test_duplicate_surcharge(self):
+        with pytest.raises(ValueError, match="Duplicate surcharges"):
+            calculate_quote("ko-en", "legal", 5000, surcharge_keys=["dtp", "dtp"])
+
     def test_valid_combination(self):
         pricing = load_pricing()
         result = validate_surcharges(["urgent", "dtp"], pricing)
@@ -109,3 +121,117 @@ class TestCalculateQuote:
     def test_exclusive_surcharge_error(self):
         with pytest.raises(ValueError, match="mutually exclusive"):
             calculate_quote("ko-en", "general", 1000, surcharge_keys=["urgent", "semi_urgent"])
+
+
+class TestPricingTable:
+    def test_compiled_lookup(self):
+        table = get_pricing()
+        assert table.unit_prices[("ko-en", "legal")] == 180
+        assert table.language_pair_labels["ko-ja"] == "한국어 → 일본어"
+        assert table.surcharge_mask(["urgent", "dtp"]) == (
+            table.surcharge_bits["urgent"] | table.surcharge_bits["dtp"]
+        )
+
+    def test_cached_between_calls(self):
+        assert get_pricing() is get_pricing()
+
+    def test_table_validation_matches_dict(self):
+        table = get_pricing()
+        with pytest.raises(ValueError, match="mutually exclusive"):
+            validate_surcharges(["urgent", "semi_urgent"], table)
+        with pytest.raises(ValueError, match="Unknown surcharge"):
+            validate_surcharges(["unknown"], table)
+        assert validate_surcharges(["urgent", "dtp"], table) == ["urgent", "dtp"]
+
+    def test_reload_on_file_change(self, tmp_path, monkeypatch):
+        data = load_pricing()
+        path = tmp_path / "pricing.json"
+        path.write_text(json.dumps(data), encoding="utf-8")
+        monkeypatch.setattr(pricing_module, "PRICING_PATH", path)
+
+        assert get_pricing(force_check=True).unit_prices[("ko-en", "general")] == 120
+
+        data["unit_prices"]["ko-en"]["general"] = 125
+        path.write_text(json.dumps(data), encoding="utf-8")
+        os.utime(path, ns=(0, 1))
+        assert get_pricing(force_check=True).unit_prices[("ko-en", "general")] == 125
+
+        monkeypatch.undo()
+        assert get_pricing(force_check=True).unit_prices[("ko-en", "general")] == 120
+
+
+class TestCalculateQuotesBatch:
+    SURCHARGE_COMBOS = [[], ["urgent"], ["semi_urgent", "dtp"], ["urgent", "dtp", "night"]]
+    VOLUMES = [1, 7, 4500, 123_456, 0.7, 3.3, 99_999.99]
+
+    def test_matches_scalar_path(self):
+        """스칼라 calculate_quote와 모든 조합에서 결과가 동일해야 한다 (README Issue #1 절사 포함)"""
+        table = get_pricing()
+        rows = list(itertools.product(
+            table.language_pairs, table.domains, table.volume_conversion, self.SURCHARGE_COMBOS, self.VOLUMES,
+        ))
+        batch = calculate_quotes(
+            [r[0] for r in rows],
+            [r[1] for r in rows],
+            [r[4] for r in rows],
+            [r[2] for r in rows],
+            [table.surcharge_mask(r[3]) for r in rows],
+        )
+        for i, (pair, domain, unit, keys, volume) in enumerate(rows):
+            q = calculate_quote(pair, domain, volume, unit, keys)
+            assert batch.converted_chars[i] == q.converted_chars
+            assert batch.base_amount[i] == q.base_amount
+            assert batch.surcharge_total[i] == q.surcharge_total
+            assert batch.vat[i] == q.vat
+            assert batch.total[i] == q.total
+            for s in q.surcharges:
+                assert batch.surcharge_amounts[i, table.surcharge_keys.index(s["key"])] == s["amount"]
+
+    def test_integer_codes(self):
+        table = get_pricing()
+        batch = calculate_quotes(
+            np.array([table.language_pairs.index("ko-ja")]),
+            np.array([table.domains.index("technical")]),
+            np.array([1000]),
+            "chars",
+            np.array([table.surcharge_mask(["urgent", "dtp"])]),
+        )
+        assert batch.surcharge_total[0] == 126_000
+        assert batch.total[0] == 336_600
+
+    def test_errors_report_row(self):
+        with pytest.raises(ValueError, match="Row 1: Unknown language pair"):
+            calculate_quotes(["ko-en", "ko-fr"], ["general", "general"], [1, 1])
+        with pytest.raises(ValueError, match="Row 0: Unknown domain"):
+            calculate_quotes(["ko-en"], ["finance"], [1])
+        with pytest.raises(ValueError, match="mutually exclusive"):
+            table = get_pricing()
+            calculate_quotes(["ko-en"], ["general"], [1], "chars", [table.surcharge_mask(["urgent"]) | table.surcharge_bits["semi_urgent"]])
+        with pytest.raises(ValueError, match="Unknown volume unit"):
+            calculate_quotes(["ko-en"], ["general"], [1], "lines")
+
+
+class TestQuoteBatch:
+    def test_row_view_equals_scalar(self):
+        table = get_pricing()
+        batch = calculate_quotes(
+            ["ko-en", "ko-ja"], ["general", "technical"], [4500, 1000], "chars",
+            [table.surcharge_mask(["dtp"]), table.surcharge_mask(["urgent", "dtp"])],
+        )
+        assert len(batch) == 2
+        assert batch[0] == calculate_quote("ko-en", "general", 4500, "chars", ["dtp"])
+        assert batch[1] == calculate_quote("ko-ja", "technical", 1000, "chars", ["urgent", "dtp"])
+
+    def test_from_results_roundtrip(self):
+        results = [
+            calculate_quote("ko-en", "legal", 8, "pages", ["urgent"]),
+            calculate_quote("en-ko", "general", 120.5, "words"),
+        ]
+        batch = QuoteBatch.from_results(results)
+        assert list(batch) == results
+        assert batch.nbytes < 200 * len(batch)
+
+    def test_quote_result_is_frozen(self):
+        result = calculate_quote("ko-en", "general", 1000)
+        with pytest.raises(AttributeError):
+            result.total = 0
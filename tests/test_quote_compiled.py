@@ -0,0 +1,100 @@
+import io
+from datetime import date
+
+import pdfplumber
+import pytest
+
+from modules.pdf_generator import generate_quote_pdf, quote_pdf_data, render_platypus
+from modules.quote_calculator import calculate_quote
+from templates import quote_compiled
+from templates.quote_compiled import render_compiled
+
+
+def _page(pdf: bytes):
+    with pdfplumber.open(io.BytesIO(pdf)) as doc:
+        assert len(doc.pages) == 1
+        page = doc.pages[0]
+        r = lambda v: round(v, 2)  # noqa: E731
+        chars = sorted(
+            (c["text"], r(c["x0"]), r(c["top"]), r(c["size"]), c["fontname"], str(c["non_stroking_color"]))
+            for c in page.chars
+        )
+        rects = sorted(
+            (r(o["x0"]), r(o["top"]), r(o["x1"]), r(o["bottom"]), str(o["non_stroking_color"]), o["fill"])
+            for o in page.rects
+        )
+        lines = sorted((r(o["x0"]), r(o["top"]), r(o["x1"]), r(o["bottom"]), r(o["linewidth"])) for o in page.lines)
+        return chars, rects, lines
+
+
+def _text_lines(pdf: bytes) -> list[str]:
+    with pdfplumber.open(io.BytesIO(pdf)) as doc:
+        return doc.pages[0].extract_text().splitlines()
+
+
+def _data(surcharges=(), notes="", client_name="홍길동", client_email="a@b.c", volume=5000):
+    result = calculate_quote("ko-en", "legal", volume, surcharge_keys=list(surcharges))
+    return quote_pdf_data(result, client_name, client_email, date(2026, 10, 30), notes, "Q-20261030-001")
+
+
+class TestCompiledRender:
+    @pytest.mark.parametrize("kwargs", [
+        {},
+        {"surcharges": ["urgent", "dtp"], "notes": "DTP 포함"},
+        {"surcharges": ["semi_urgent", "dtp", "night"], "notes": "긴 특이사항 " * 40},
+        {"client_name": "A very long client name Co., Ltd.", "client_email": "x" * 40 + "@example.com",
+         "volume": 123456789},
+    ])
+    def test_matches_platypus_layout(self, kwargs):
+        data = _data(**kwargs)
+        compiled = render_compiled(data)
+        assert compiled is not None
+        assert _page(compiled) == _page(render_platypus(data))
+
+    @pytest.mark.parametrize("kwargs", [
+        {"surcharges": ["urgent", "dtp"], "notes": "DTP included"},
+        {"client_email": "x" * 40 + "@example.com", "volume": 123456789},
+    ])
+    def test_text_matches_platypus_field_by_field(self, kwargs):
+        data = _data(**kwargs)
+        compiled, platypus = _text_lines(render_compiled(data)), _text_lines(render_platypus(data))
+        assert compiled == platypus
+
+        values = [data[key] for key in ("quote_number", "issue_date", "valid_until", "client_email", "deadline")]
+        values += [f"{data[key]:,}" for key in ("converted_chars", "unit_price", "base_amount", "subtotal", "vat", "total")]
+        values += [f'{s["amount"]:,}' for s in data["surcharges"]] + [data["notes"]]
+        for value in values:
+            lines = [line for line in platypus if value in line]
+            assert lines, value
+            assert [line for line in compiled if value in line] == lines, value
+
+    def test_unsupported_input_falls_back(self):
+        assert render_compiled(_data(client_name="홍길동\n김철수")) is None
+        assert render_compiled(_data(notes="넘치는 특이사항 " * 2000)) is None
+
+        pdf = generate_quote_pdf(
+            calculate_quote("ko-en", "legal", 5000), "홍길동\n김철수", "a@b.c", date(2026, 10, 30),
+        )
+        assert pdf.startswith(b"%PDF")
+
+    def test_fast_flag(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(
+            "modules.pdf_generator.render_compiled",
+            lambda data, **kwargs: calls.append(data) or render_compiled(data, **kwargs),
+        )
+        result = calculate_quote("ko-en", "legal", 5000)
+        generate_quote_pdf(result, "홍길동", "a@b.c", date(2026, 10, 30), fast=False)
+        assert calls == []
+        generate_quote_pdf(result, "홍길동", "a@b.c", date(2026, 10, 30), fast=True)
+        assert len(calls) == 1
+
+    def test_layout_compiled_once_per_shape(self, monkeypatch):
+        monkeypatch.setattr(quote_compiled, "_local", type(quote_compiled._local)())
+        compiles = []
+        original = quote_compiled._compile
+        monkeypatch.setattr(quote_compiled, "_compile", lambda *a: compiles.append(a[:2]) or original(*a))
+        for name in ("a", "b", "c"):
+            render_compiled(_data(client_name=name))
+        render_compiled(_data(["urgent"]))
+        assert compiles == [(0, False), (1, False)]
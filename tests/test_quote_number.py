@@ -0,0 +1,83 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+import pytest
+
+from modules import quote_number
+from modules.quote_number import QuoteNumberAllocator
+
+DAY = date(2026, 10, 18)
+
+
+def _allocate_many(path: str, block_size: int, count: int) -> list[str]:
+    allocator = QuoteNumberAllocator(path, block_size=block_size)
+    try:
+        return [allocator.allocate(DAY) for _ in range(count)]
+    finally:
+        allocator.close()
+
+
+class TestQuoteNumberAllocator:
+    def test_sequence_per_day(self, tmp_path):
+        allocator = QuoteNumberAllocator(tmp_path / "q.sqlite3")
+        assert [allocator.allocate(DAY) for _ in range(3)] == [
+            "Q-20261018-001", "Q-20261018-002", "Q-20261018-003",
+        ]
+        assert allocator.allocate(date(2026, 10, 19)) == "Q-20261019-001"
+        allocator.close()
+
+        # 재시작해도 이어서 발급
+        allocator = QuoteNumberAllocator(tmp_path / "q.sqlite3")
+        assert allocator.allocate(DAY) == "Q-20261018-004"
+        allocator.close()
+
+    def test_sequence_widens_past_999(self, tmp_path):
+        allocator = QuoteNumberAllocator(tmp_path / "q.sqlite3", block_size=999)
+        numbers = [allocator.allocate(DAY) for _ in range(1000)]
+        assert numbers[998:] == ["Q-20261018-999", "Q-20261018-1000"]
+        allocator.close()
+
+    def test_block_preallocation(self, tmp_path):
+        path = tmp_path / "q.sqlite3"
+        a = QuoteNumberAllocator(path, block_size=10)
+        b = QuoteNumberAllocator(path, block_size=10)
+        assert a.allocate(DAY) == "Q-20261018-001"
+        assert b.allocate(DAY) == "Q-20261018-011"
+        assert a.allocate(DAY) == "Q-20261018-002"
+        a.close()
+        b.close()
+        with pytest.raises(ValueError):
+            QuoteNumberAllocator(path, block_size=0)
+
+    def test_unique_across_threads(self, tmp_path):
+        allocator = QuoteNumberAllocator(tmp_path / "q.sqlite3", block_size=4)
+        numbers = []
+
+        def worker():
+            numbers.extend(allocator.allocate(DAY) for _ in range(50))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(set(numbers)) == 400
+        allocator.close()
+
+    @pytest.mark.parametrize("block_size", [1, 8])
+    def test_unique_across_processes(self, tmp_path, block_size):
+        path = str(tmp_path / "q.sqlite3")
+        with ProcessPoolExecutor(3, mp_context=multiprocessing.get_context("spawn")) as pool:
+            batches = list(pool.map(_allocate_many, [path] * 3, [block_size] * 3, [40] * 3))
+        numbers = [n for batch in batches for n in batch]
+        assert len(set(numbers)) == 120
+        for batch in batches:
+            assert batch == sorted(batch, key=lambda n: int(n.rsplit("-", 1)[1]))
+        if block_size == 1:
+            assert sorted(int(n.rsplit("-", 1)[1]) for n in numbers) == list(range(1, 121))
+
+    def test_module_helper_uses_shared_allocator(self, quote_numbers):
+        assert quote_number.next_quote_number(DAY) == "Q-20261018-001"
+        assert quote_numbers.allocate(DAY) == "Q-20261018-002"
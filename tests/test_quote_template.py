@@ -0,0 +1,59 @@
+from pathlib import Path
+
+import reportlab
+import pytest
+
+from templates import quote_template
+
+VERA = str(Path(reportlab.__file__).parent / "fonts" / "Vera.ttf")
+
+
+@pytest.fixture
+def fresh_font(monkeypatch):
+    monkeypatch.setattr(quote_template, "_font_name", None)
+    monkeypatch.setattr(quote_template, "_stylesheet", None)
+    yield
+    quote_template.configure_font(None)
+
+
+class TestFontDiscovery:
+    def test_discovery_runs_once_even_on_failure(self, fresh_font, monkeypatch):
+        calls = []
+
+        def probe():
+            calls.append(1)
+            return quote_template.FALLBACK_FONT
+
+        monkeypatch.setattr(quote_template, "_register_korean_font", probe)
+        for _ in range(3):
+            assert quote_template.get_korean_font() == "Helvetica"
+        quote_template.warm_up()
+        assert len(calls) == 1
+
+    def test_configured_path(self, fresh_font, monkeypatch):
+        monkeypatch.setattr(quote_template.platform, "system", lambda: "Other")
+        assert quote_template.configure_font(VERA) == "Korean"
+        assert quote_template._styles()["title"].fontName == "Korean"
+        assert quote_template.configure_font("/nonexistent/font.ttf") == "Helvetica"
+        assert quote_template._styles()["title"].fontName == "Helvetica"
+
+
+class TestPrebuiltStyles:
+    def test_styles_shared_and_read_only(self, fresh_font):
+        assert quote_template._styles() is quote_template._styles()
+        assert quote_template._base_table_style() is quote_template._base_table_style()
+        with pytest.raises(TypeError):
+            quote_template._styles()["title"] = None
+
+    def test_render_does_not_mutate_table_styles(self, fresh_font):
+        from datetime import date
+
+        from modules.pdf_generator import generate_quote_pdf
+        from modules.quote_calculator import calculate_quote
+
+        sheet = quote_template._get_stylesheet()
+        sizes = {name: len(sheet[name].getCommands()) for name in ("base_table", "detail_table")}
+        result = calculate_quote("ko-en", "legal", 1000, surcharge_keys=["urgent"])
+        for _ in range(2):
+            assert generate_quote_pdf(result, "홍길동", "a@b.c", date(2026, 1, 1)).startswith(b"%PDF")
+        assert {name: len(sheet[name].getCommands()) for name in sizes} == sizes
@@ -0,0 +1,227 @@
+import threading
+from datetime import date
+
+import gspread
+import pytest
+import requests
+
+from modules import metrics, sheets_connector
+from modules.outbox import Outbox
+from modules.quote_calculator import calculate_quote
+from modules.sheets_connector import HEADER_ROW, KEY_COLUMN, SheetWriter
+
+
+class FakeWorksheet:
+    """gspread.Worksheet 대용: append_rows로 받은 묶음을 기록 (멱등 키 열은 떼어 둠)."""
+
+    def __init__(self, fail=(), lost_responses=0):
+        self.batches = []
+        self.keys = []
+        self.fail = list(fail)  # append_rows 호출마다 차례로 던질 예외
+        self.lost_responses = lost_responses  # 기록은 됐는데 응답이 끊긴 것처럼 예외를 낼 횟수
+        self.called = threading.Event()
+
+    def append_rows(self, rows, value_input_option="RAW"):
+        self.called.set()
+        if self.fail:
+            raise self.fail.pop(0)
+        self.batches.append([list(row[:-1]) for row in rows])
+        self.keys.extend(row[-1] for row in rows)
+        if self.lost_responses:
+            self.lost_responses -= 1
+            raise requests.ConnectionError("read timed out")
+
+    def col_values(self, col):
+        assert col == KEY_COLUMN
+        return [HEADER_ROW[-1], *self.keys]
+
+    @property
+    def rows(self):
+        return [row for batch in self.batches for row in batch]
+
+
+def _api_error(code):
+    response = requests.Response()
+    response.status_code = code
+    response._content = f'{{"error": {{"code": {code}, "message": "quota", "status": "X"}}}}'.encode()
+    return gspread.exceptions.APIError(response)
+
+
+@pytest.fixture
+def sheet():
+    return FakeWorksheet()
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    box = Outbox(tmp_path / "outbox.sqlite3")
+    yield box
+    box.close()
+
+
+@pytest.fixture
+def make_writer(outbox):
+    writers = []
+
+    def make(sheet, opens=None, **kwargs):
+        def open_worksheet():
+            if opens is not None:
+                opens.append(1)
+            return sheet
+
+        kwargs.setdefault("outbox", outbox)
+        kwargs.setdefault("flush_interval", 60)
+        kwargs.setdefault("retry_delay", 0)
+        writer = SheetWriter(open_worksheet, **kwargs)
+        writers.append(writer)
+        return writer
+
+    yield make
+    for writer in writers:
+        writer.close(timeout=5)
+
+
+class TestSheetWriter:
+    def test_batches_by_size(self, sheet, make_writer):
+        opens = []
+        writer = make_writer(sheet, opens, batch_size=3)
+        for i in range(7):
+            writer.enqueue([i])
+        assert writer.flush(timeout=5)
+        assert sheet.batches == [[[0], [1], [2]], [[3], [4], [5]], [[6]]]
+        assert len(opens) == 1
+        assert writer.stats["written"] == 7
+
+    def test_flushes_after_interval(self, sheet, make_writer):
+        writer = make_writer(sheet, batch_size=100, flush_interval=0.05)
+        writer.enqueue(["a"])
+        assert sheet.called.wait(5)
+        assert writer.flush(timeout=5)
+        assert sheet.batches == [[["a"]]]
+
+    def test_enqueue_does_not_wait_for_sheets(self, sheet, outbox):
+        release = threading.Event()
+
+        def slow_open():
+            release.wait(5)
+            return sheet
+
+        writer = SheetWriter(slow_open, outbox=outbox, batch_size=1, retry_delay=0)
+        for i in range(5):
+            writer.enqueue([i])  # 첫 행 기록이 연결 단계에서 막혀 있어도 바로 반환
+        assert writer.pending() == 5
+        release.set()
+        assert writer.flush(timeout=5)
+        assert sheet.rows == [[i] for i in range(5)]
+        writer.close(timeout=5)
+
+    def test_retries_quota_errors_without_reconnecting(self, make_writer):
+        sheet = FakeWorksheet(fail=[_api_error(429), _api_error(429), _api_error(503)])
+        opens = []
+        writer = make_writer(sheet, opens)
+        writer.enqueue(["a"])
+        assert writer.flush(timeout=5)
+        assert sheet.batches == [[["a"]]]
+        assert writer.stats["retries"] == 3
+        assert len(opens) == 1
+
+    def test_reconnects_and_keeps_rows(self, outbox, make_writer):
+        sheet = FakeWorksheet(fail=[ConnectionError("reset"), _api_error(400)])
+        opens = []
+        writer = make_writer(sheet, opens, batch_size=100, retry_delay=0.01)
+        writer.enqueue(["a"])
+        writer.enqueue(["b"])
+        assert writer.flush(timeout=5)
+        assert sheet.batches == [[["a"], ["b"]]]
+        assert writer.stats["last_error"].startswith("APIError")
+        assert len(opens) == 3  # 오류마다 핸들을 버리고 다시 연결
+        assert outbox.stats()["depth"] == 0
+
+    def test_lost_response_does_not_duplicate(self, outbox, make_writer):
+        sheet = FakeWorksheet(lost_responses=1)
+        writer = make_writer(sheet, batch_size=100, retry_delay=0.01)
+        writer.enqueue(["a"], key="k1")
+        writer.enqueue(["b"], key="k2")
+        assert writer.flush(timeout=5)
+        assert sheet.rows == [["a"], ["b"]]
+        assert writer.stats["skipped"] == 2
+
+    def test_round_trips_recorded_in_metrics(self, make_writer, monkeypatch):
+        metrics.reset()
+        monkeypatch.setattr(metrics, "_enabled", True)
+        sheet = FakeWorksheet(lost_responses=1)
+        writer = make_writer(sheet, batch_size=100, retry_delay=0.01)
+        writer.enqueue(["a"], key="k1")
+        assert writer.flush(timeout=5)
+
+        counts = {(h["labels"]["op"]): h["count"] for h in metrics.snapshot()["histograms"]
+                  if h["name"] == metrics.SHEETS_REQUEST_SECONDS}
+        assert counts == {"open": 2, "append_rows": 1, "col_values": 1}  # 연결 오류 → 다시 연결
+        rows = {c["labels"]["outcome"]: c["value"] for c in metrics.snapshot()["counters"]}
+        assert rows == {"retried": 1, "skipped": 1}
+        metrics.reset()
+
+    def test_same_key_queued_once(self, sheet, make_writer):
+        writer = make_writer(sheet)
+        assert writer.enqueue(["a"], key="k1") == "k1"
+        writer.enqueue(["a"], key="k1")
+        assert writer.flush(timeout=5)
+        assert sheet.keys == ["k1"]
+
+    def test_rows_survive_restart(self, tmp_path, make_writer):
+        path = tmp_path / "restart.sqlite3"
+        down = FakeWorksheet(fail=[_api_error(503)] * 1000)
+        writer = make_writer(down, outbox=Outbox(path), retry_delay=0.01)
+        writer.enqueue(["a"])
+        writer.enqueue(["b"])
+        assert not writer.flush(timeout=0.2)
+        assert writer.close(timeout=5)
+
+        box = Outbox(path)
+        stats = box.stats()
+        assert stats["depth"] == 2
+        assert stats["retrying"] == 2
+        assert stats["lag_seconds"] > 0
+        assert stats["last_error"].startswith("APIError")
+
+        sheet = FakeWorksheet()
+        writer = make_writer(sheet, outbox=box)
+        writer.start()
+        assert writer.flush(timeout=5)
+        assert sheet.rows == [["a"], ["b"]]
+
+    def test_close_writes_remaining_rows(self, sheet, make_writer):
+        writer = make_writer(sheet, batch_size=100)
+        writer.enqueue(["a"])
+        assert writer.close(timeout=5)
+        assert sheet.batches == [[["a"]]]
+        with pytest.raises(RuntimeError):
+            writer.enqueue(["b"])
+
+
+class TestOutbox:
+    def test_claim_leases_rows(self, outbox):
+        for i in range(3):
+            outbox.put(f"k{i}", [i])
+        first = outbox.claim(2)
+        assert [(key, row, attempts) for key, row, attempts in first] == [("k0", [0], 1), ("k1", [1], 1)]
+        assert [key for key, _, _ in outbox.claim(10)] == ["k2"]  # 임대 중인 행은 다시 나오지 않음
+        assert outbox.stats()["in_flight"] == 3
+
+        outbox.release(["k0"], "boom")
+        outbox.ack(["k1", "k2"])
+        assert outbox.claim(10) == [("k0", [0], 2)]
+        assert outbox.stats()["depth"] == 1
+
+
+class TestSaveQuote:
+    def test_row_is_queued(self, sheet, make_writer, monkeypatch):
+        writer = make_writer(sheet)
+        monkeypatch.setattr(sheets_connector, "_writer", writer)
+        result = calculate_quote("ko-en", "legal", 1000, surcharge_keys=["urgent"])
+        assert sheets_connector.save_quote_to_sheets(result, "홍길동", "a@b.c", date(2026, 1, 31), "", "Q-1")
+        assert writer.flush(timeout=5)
+        (row,) = sheet.rows
+        assert len(row) + 1 == len(HEADER_ROW)
+        assert row[0] == "Q-1" and row[2] == "홍길동" and row[-1] == "-"
+        assert sheets_connector.outbox_stats()["depth"] == 0
@@ -0,0 +1,38 @@
+from modules.volume_counter import VolumeCounter
+
+TEXT = "본 계약은 갑과 을 사이에\n체결된다. The API returns JSON.\n\t漢字 ひらがな カタカナ"
+
+
+class TestVolumeCounter:
+    def test_matches_full_text_counts(self):
+        counter = VolumeCounter()
+        counter.feed(TEXT)
+        assert counter.char_count == len(TEXT.replace(" ", "").replace("\n", ""))
+        assert counter.word_count == len(TEXT.split())
+
+    def test_chunk_boundaries(self):
+        """단어 중간에서 잘린 조각을 넣어도 결과가 같아야 한다"""
+        whole = VolumeCounter()
+        whole.feed(TEXT)
+        for size in (1, 3, 7):
+            counter = VolumeCounter()
+            for i in range(0, len(TEXT), size):
+                counter.feed(TEXT[i:i + size])
+            assert counter.char_count == whole.char_count
+            assert counter.word_count == whole.word_count
+            assert counter.script_counts == whole.script_counts
+
+    def test_script_mix(self):
+        counter = VolumeCounter()
+        counter.feed("안녕하세요 hello 漢字 ひらがな")
+        hangul, kana, han, latin = counter.script_counts
+        assert (hangul, kana, han, latin) == (5, 4, 2, 5)
+        assert counter.script_ratios["hangul"] == round(5 / 16, 4)
+
+    def test_sample_and_has_text(self):
+        counter = VolumeCounter(sample_chars=4)
+        counter.feed("  \n")
+        assert not counter.has_text
+        counter.feed("abcdef")
+        assert counter.has_text
+        assert counter.sample == "  \na"